@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import timeit
+
+from lib.arp import ArpPacket, ArpReplyTemplate, ArpProxy, ARP_REQUEST, \
+    ZERO_MAC, mac_to_bytes, ip_to_bytes
+from lib.hosts import HostTable
+
+HOSTS = 10000
+REQUESTS = 20000
+REPEAT = 3
+
+
+def host_address(i):
+    return ('00:00:00:00:' + format(i >> 8 & 0xff, '02x') + ':' +
+            format(i & 0xff, '02x'), '10.0.' + str(i >> 8 & 0xff) + '.' +
+            str(i & 0xff))
+
+
+def create_proxy():
+    host_table = HostTable(65536, 300.0)
+    for i in range(HOSTS):
+        mac_address, ip_address = host_address(i)
+        host_table.learn(ip_address, mac_address, i % 64 + 1, i % 48 + 1)
+    return ArpProxy(host_table, 10.0, 0.5, 1.0, 20.0, 150.0, 65536)
+
+
+def request(src, dst_ip):
+    mac_address, ip_address = host_address(src)
+    return ArpPacket(ARP_REQUEST, mac_to_bytes(mac_address),
+                     ip_to_bytes(ip_address), ZERO_MAC, ip_to_bytes(dst_ip))
+
+
+def frames(packets):
+    return [pkt.to_bytes() for pkt in packets]
+
+
+def handle_all(proxy, frames):
+    for frame in frames:
+        proxy.handle(ArpPacket.from_bytes(frame), 1, 1)
+
+
+def bench(name, frames):
+    seconds = min(
+        timeit.timeit(lambda: handle_all(proxy, frames), number=1)
+        for proxy in (create_proxy() for i in range(REPEAT)))
+    print('{0:<32} {1:12.0f} requests/sec'.format(name, REQUESTS / seconds))
+
+
+def main():
+    known = frames(
+        request(i % HOSTS, host_address((i + 1) % HOSTS)[1])
+        for i in range(REQUESTS))
+    duplicates = frames(request(1, host_address(2)[1])
+                        for i in range(REQUESTS))
+    unknown = frames(
+        request(i % HOSTS, '10.1.' + str(i >> 8 & 0xff) + '.' +
+                str(i & 0xff)) for i in range(REQUESTS))
+
+    bench('known targets', known)
+    bench('duplicate requests', duplicates)
+    bench('unknown targets', unknown)
+
+    template = ArpReplyTemplate(*host_address(2))
+    src_mac, src_ip = mac_to_bytes(host_address(1)[0]), ip_to_bytes(
+        host_address(1)[1])
+    seconds = min(
+        timeit.repeat(lambda: template.render(src_mac, src_ip),
+                      number=REQUESTS,
+                      repeat=REPEAT))
+    print('{0:<32} {1:12.3f} us/reply'.format('reply template render',
+                                              seconds / REQUESTS * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import itertools
+import timeit
+
+from lib.links_view import LinkViewModel, LinksViewCache, KEY_PORT
+from lib.measurement_repositories import LinkBandwidth, PortRates, \
+    PortSpeedRepository
+from lib.topology import LinkRepository
+
+LINK_COUNTS = (1000, 10000)
+REPEAT = 5
+
+
+def create_fabric(link_count):
+    link_repository = LinkRepository()
+    speed_repository = PortSpeedRepository()
+    for i in range(link_count):
+        src_dpid, dst_dpid = i + 1, i + 2
+        link_repository.register_link(src_dpid, 1, dst_dpid, 2)
+        link_repository.register_link(dst_dpid, 2, src_dpid, 1)
+        speed_repository.set_speed(src_dpid, 1, 10000000)
+    return link_repository, speed_repository
+
+
+def create_cache(link_repository, speed_repository):
+    def create_link_view(link):
+        return LinkViewModel(
+            link.src_dpid, link.dst_dpid, 1.5, 96.0, 0.0,
+            link_bandwidth=LinkBandwidth(
+                PortRates(100.0, 900.0), PortRates(1100.0, 300.0),
+                speed_repository.get_link_capacity(link))).__dict__
+
+    return LinksViewCache(link_repository, [(speed_repository, KEY_PORT)],
+                          create_link_view)
+
+
+def change_speeds(link_repository, speed_repository, speed_kbps):
+    for link in link_repository.find_bidirectional_links():
+        speed_repository.set_speed(link.src_dpid, link.src_port_no,
+                                   speed_kbps)
+
+
+def bench(name, link_count, func, setup=None):
+    seconds = min(
+        timeit.repeat(func, setup=setup or (lambda: None), number=1,
+                      repeat=REPEAT))
+    print('{0:<28} {1:>6} links {2:10.3f} ms'.format(name, link_count,
+                                                     seconds * 1000))
+
+
+def main():
+    for link_count in LINK_COUNTS:
+        link_repository, speed_repository = create_fabric(link_count)
+        cache = create_cache(link_repository, speed_repository)
+        cache.get_snapshot()
+        speeds = itertools.cycle((1000000, 10000000))
+
+        bench('snapshot, unchanged', link_count, cache.get_snapshot)
+        bench('snapshot, one link touched', link_count, cache.get_snapshot,
+              lambda: speed_repository.generations.touch((1, 1)))
+        bench('snapshot, one link changed', link_count, cache.get_snapshot,
+              lambda: speed_repository.set_speed(1, 1, next(speeds)))
+        bench('snapshot, all links changed', link_count, cache.get_snapshot,
+              lambda: change_speeds(link_repository, speed_repository,
+                                    next(speeds)))
+        bench('max utilization', link_count, lambda: max(
+            view['forward_utilization_percents']
+            for view in cache.get_snapshot().views))
+
+
+if __name__ == '__main__':
+    main()
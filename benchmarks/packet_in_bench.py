@@ -0,0 +1,147 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import struct
+import timeit
+
+from lib.arp import ArpPacket
+from lib.flows import ETH_TYPE_ARP
+from lib.packet_in import PacketInDispatcher
+from lib.packets import TestPacket, ETHERNET_HEADER_SIZE, PROBE_SIZE
+
+EVENTS = 20000
+REPEAT = 3
+
+PROBE_SRC_MAC = '00:00:00:00:00:00'
+PROBE_DST_MAC = 'ff:ff:ff:ff:ff:ff'
+HOST_MAC = b'\x00\x00\x00\x00\x00\x01'
+BROADCAST_MAC = b'\xff' * 6
+
+
+class FakeMsg:
+    def __init__(self, data):
+        self.data = data
+
+
+def ethernet_header(dst, src, eth_type):
+    return dst + src + struct.pack('!H', eth_type)
+
+
+def probe_frame():
+    frame = ethernet_header(BROADCAST_MAC, b'\x00' * 6, 0x0815) + \
+        TestPacket(1, 1, 1).to_bytes()
+    return frame[:PROBE_SIZE]
+
+
+def arp_frame():
+    return ethernet_header(BROADCAST_MAC, HOST_MAC, ETH_TYPE_ARP) + \
+        struct.pack('!HHBBH6s4s6s4s', 1, 0x0800, 6, 4, 1, HOST_MAC,
+                    b'\x0a\x00\x00\x01', b'\x00' * 6, b'\x0a\x00\x00\x02')
+
+
+def ipv4_frame():
+    tcp_header = struct.pack('!HHIIBBHHH', 40000, 80, 1, 0, 5 << 4, 0x10,
+                             65535, 0, 0)
+    ipv4_header = struct.pack('!BBHHHBBH4s4s', 0x45, 0,
+                              20 + len(tcp_header) + 1400, 0, 0, 64, 6, 0,
+                              b'\x0a\x00\x00\x01', b'\x0a\x00\x00\x02')
+    return ethernet_header(HOST_MAC, HOST_MAC, 0x0800) + ipv4_header + \
+        tcp_header + b'\x00' * 1400
+
+
+def create_before():
+    try:
+        from ryu.lib.packet import packet, ethernet, arp, icmp
+    except ImportError:
+        return None
+
+    def link_monitor_before(msg):
+        pkt = packet.Packet(msg.data)
+        eth_pkt = pkt.get_protocol(ethernet.ethernet)
+        if eth_pkt.src == PROBE_SRC_MAC and eth_pkt.dst == PROBE_DST_MAC:
+            TestPacket.from_bytes(memoryview(msg.data), ETHERNET_HEADER_SIZE)
+
+    def mac_detector_before(msg):
+        pkt = packet.Packet(msg.data)
+        pkt.get_protocol(ethernet.ethernet)
+        pkt.get_protocol(icmp.icmp)
+        pkt.get_protocol(arp.arp)
+
+    def before(msgs):
+        for msg in msgs:
+            link_monitor_before(msg)
+            mac_detector_before(msg)
+
+    return before
+
+
+def test_packet_handler(msg):
+    TestPacket.from_bytes(memoryview(msg.data), ETHERNET_HEADER_SIZE)
+
+
+def arp_handler(msg):
+    ArpPacket.from_bytes(msg.data)
+
+
+def create_dispatcher():
+    dispatcher = PacketInDispatcher()
+    dispatcher.register(test_packet_handler, 0x0815)
+    dispatcher.register(arp_handler, ETH_TYPE_ARP)
+    return dispatcher
+
+
+def after(msgs, dispatcher):
+    for msg in msgs:
+        dispatcher.dispatch(msg)
+
+
+def bench(name, mix, func):
+    seconds = min(timeit.repeat(func, number=1, repeat=REPEAT))
+    print('{0:<10} {1:<22} {2:12.0f} events/sec'.format(
+        name, mix, EVENTS / seconds))
+
+
+def main():
+    frames = {
+        'probes': probe_frame(),
+        'arp': arp_frame(),
+        'ipv4': ipv4_frame()
+    }
+    mixes = {
+        'probes only': ['probes'],
+        'probes, arp, ipv4': ['probes', 'arp', 'ipv4'],
+        'ipv4 only': ['ipv4']
+    }
+    before = create_before()
+    if before is None:
+        print('ryu is not installed, skipping the "before" cases')
+    dispatcher = create_dispatcher()
+    for mix, names in mixes.items():
+        msgs = [
+            FakeMsg(frames[names[i % len(names)]]) for i in range(EVENTS)
+        ]
+        if before is not None:
+            bench('before', mix, lambda: before(msgs))
+        bench('after', mix, lambda: after(msgs, dispatcher))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import time
+import timeit
+
+from lib.packets import TestPacket, ETHERNET_HEADER_SIZE
+from lib.time_units import TimeStamp
+
+ITERATIONS = 100000
+
+ETHERNET_HEADER = b'\xff' * 6 + b'\x00' * 6 + b'\x08\x15'
+# switches pad frames up to the minimal ethernet frame size
+PADDING = b'\x00' * 21
+
+
+def encode_string_payload(src_port):
+    return (str(TimeStamp(time.time())) + ':' + str(src_port)).encode()
+
+
+def decode_string_payload(frame):
+    payload = frame[ETHERNET_HEADER_SIZE:].decode().replace('\x00', '')
+    ts_string, src_port_string = payload.split(':', 2)
+    return TimeStamp(ts_string), int(src_port_string)
+
+
+def encode_binary_payload(src_port):
+    return TestPacket(src_port, 1, 1).to_bytes()
+
+
+def decode_binary_payload(frame):
+    return TestPacket.from_bytes(memoryview(frame), ETHERNET_HEADER_SIZE)
+
+
+def bench(name, func, arg):
+    seconds = min(timeit.repeat(lambda: func(arg), number=ITERATIONS,
+                                repeat=3))
+    print('{0:<16} {1:8.3f} us/packet'.format(name,
+                                              seconds / ITERATIONS * 1e6))
+
+
+def main():
+    string_frame = ETHERNET_HEADER + encode_string_payload(12) + PADDING
+    binary_frame = ETHERNET_HEADER + encode_binary_payload(12) + PADDING
+
+    bench('string encode', encode_string_payload, 12)
+    bench('binary encode', encode_binary_payload, 12)
+    bench('string decode', decode_string_payload, string_frame)
+    bench('binary decode', decode_binary_payload, binary_frame)
+
+
+if __name__ == '__main__':
+    main()
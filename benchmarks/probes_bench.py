@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import itertools
+import logging
+import time
+
+from lib.packets import TestPacket, ProbeTemplateCache
+
+PORTS = 48
+CYCLES = 200
+
+
+class FakeDatapath:
+    def __init__(self, dpid, ofproto, ofproto_parser):
+        self.id = dpid
+        self.ofproto = ofproto
+        self.ofproto_parser = ofproto_parser
+        self._xids = itertools.count(1)
+        self.sent_bytes = 0
+
+    def set_xid(self, msg):
+        msg.set_xid(next(self._xids))
+
+    def send(self, buf):
+        self.sent_bytes += len(buf)
+
+    def send_msg(self, msg):
+        if msg.xid is None:
+            self.set_xid(msg)
+        msg.serialize()
+        self.send(msg.buf)
+
+
+def create_link_monitor(link_monitor_cls):
+    # bypass RyuApp.__init__ so that no monitoring thread is spawned
+    link_monitor = link_monitor_cls.__new__(link_monitor_cls)
+    link_monitor.logger = logging.getLogger('probes_bench')
+    link_monitor.probe_templates = ProbeTemplateCache()
+    return link_monitor
+
+
+def send_without_cache(link_monitor, datapath, port):
+    datapath.send_msg(
+        link_monitor.build_test_packet_out(datapath,
+                                           TestPacket(port, datapath.id),
+                                           port))
+
+
+def send_with_cache(link_monitor, datapath, port):
+    link_monitor.send_test_packet(datapath, TestPacket(port, datapath.id),
+                                  port)
+
+
+def bench(name, send, link_monitor_cls, ofproto, ofproto_parser):
+    link_monitor = create_link_monitor(link_monitor_cls)
+    datapath = FakeDatapath(1, ofproto, ofproto_parser)
+    start = time.perf_counter()
+    for _ in range(CYCLES):
+        for port in range(1, PORTS + 1):
+            send(link_monitor, datapath, port)
+    seconds = time.perf_counter() - start
+    print('{0:<16} {1:10.0f} probes/sec'.format(name,
+                                                CYCLES * PORTS / seconds))
+
+
+def main():
+    try:
+        from ryu.ofproto import ofproto_v1_3, ofproto_v1_3_parser
+        from link_monitor import LinkMonitor
+    except ImportError:
+        print('ryu is not installed, skipping the probe benchmarks')
+        return
+    for name, send in (('without cache', send_without_cache),
+                       ('with cache', send_with_cache)):
+        bench(name, send, LinkMonitor, ofproto_v1_3, ofproto_v1_3_parser)
+
+
+if __name__ == '__main__':
+    main()
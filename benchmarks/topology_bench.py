@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import timeit
+
+from lib.topology import BidirectionalLinkSet, LinkRepository
+
+LINK_COUNTS = (1000, 10000, 100000)
+REPEAT = 5
+
+
+def create_fabric(link_count):
+    link_repository = LinkRepository()
+    for i in range(link_count):
+        src_dpid, dst_dpid = i + 1, i + 2
+        link_repository.register_link(src_dpid, 1, dst_dpid, 2)
+        link_repository.register_link(dst_dpid, 2, src_dpid, 1)
+    return link_repository
+
+
+def rebuild(link_repository):
+    s = BidirectionalLinkSet()
+    for link in link_repository.find_directed_links():
+        s.add(link)
+    return s.get_all()
+
+
+def flap(link_repository):
+    link_repository.unregister_link(1, 1, 2, 2)
+    link_repository.register_link(1, 1, 2, 2)
+
+
+def bench(name, link_count, func, setup=None):
+    seconds = min(
+        timeit.repeat(func, setup=setup or (lambda: None), number=1,
+                      repeat=REPEAT))
+    print('{0:<28} {1:>6} links {2:10.3f} ms'.format(name, link_count,
+                                                     seconds * 1000))
+
+
+def main():
+    for link_count in LINK_COUNTS:
+        link_repository = create_fabric(link_count)
+        link_repository.find_bidirectional_links()
+
+        bench('rebuild per call', link_count,
+              lambda: rebuild(link_repository))
+        bench('cached index', link_count,
+              link_repository.find_bidirectional_links)
+        bench('cached index, link flap', link_count,
+              link_repository.find_bidirectional_links,
+              lambda: flap(link_repository))
+        bench('link flap', link_count, lambda: flap(link_repository))
+
+
+if __name__ == '__main__':
+    main()
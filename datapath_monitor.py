@@ -21,30 +21,69 @@
 #
 from ryu.base import app_manager
 from ryu.app import simple_switch_13
+from ryu.controller import event
 from ryu.controller import ofp_event
 from ryu.controller.handler import MAIN_DISPATCHER, DEAD_DISPATCHER
 from ryu.controller.handler import set_ev_cls
 from ryu.ofproto import ofproto_v1_3
-from ryu.lib import hub
 from ryu.lib.packet import packet
 from ryu.lib.packet import ethernet
 
-from operator import attrgetter
+import time
 
+import options
 from lib.measurement_repositories import DatapathResponseTimeRepository, \
-    BandwidthPortMeasurementData, PlrPortMeasurementData, PortStatsRepository
+    BandwidthPortMeasurementData, PlrPortMeasurementData, \
+    PortStatsRepository, PortRates, PortSpeedRepository
+from lib.packets import EchoPayload
+from lib.flow_stats import FlowKey, FlowStatsRepository
+from lib.stats_poller import StatsPoller
+
+
+class EventPortCounterReset(event.EventBase):
+    def __init__(self, reset):
+        super(EventPortCounterReset, self).__init__()
+        self.reset = reset
 
 
 class DatapathMonitor(app_manager.RyuApp):
     OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
+    _EVENTS = [EventPortCounterReset]
 
     def __init__(self, *args, **kwargs):
         super(DatapathMonitor, self).__init__(*args, **kwargs)
         self.datapaths = {}
-        self.datapath_timing_repository = DatapathResponseTimeRepository()
-        self.bandwidth_port_stats_repository = PortStatsRepository()
-        self.plr_port_stats_repository = PortStatsRepository()
-        self.monitor_thread = hub.spawn(self._monitor)
+        self.echo_timing_repository = DatapathResponseTimeRepository()
+        self.stats_timing_repository = DatapathResponseTimeRepository(
+            self.CONF.max_in_flight_requests, self.CONF.request_timeout)
+        self.port_speed_repository = PortSpeedRepository()
+        self.bandwidth_port_stats_repository = PortStatsRepository(
+            self.CONF.history_depth, PortRates(), self.port_speed_repository)
+        self.plr_port_stats_repository = PortStatsRepository(
+            self.CONF.history_depth)
+        self.flow_stats_repository = FlowStatsRepository(
+            self.CONF.top_flows_capacity)
+        self.stats_poller = StatsPoller(self.CONF.stats_interval,
+                                        self.CONF.request_timeout,
+                                        self.CONF.stats_max_backoff)
+        self.edge_stats_poller = StatsPoller(
+            self.CONF.edge_port_stats_interval, self.CONF.request_timeout,
+            self.CONF.stats_max_backoff)
+        self._edge_stats_xids = {}
+        self.link_repository = None
+
+    def start(self):
+        super(DatapathMonitor, self).start()
+        if self.CONF.link_port_stats:
+            self.link_repository = app_manager.lookup_service_brick(
+                'TopologyService').link_repository
+        scheduler = app_manager.lookup_service_brick('PeriodicScheduler')
+        scheduler.add_job('port_stats', self.CONF.stats_poll_tick,
+                          self._request_stats)
+        scheduler.add_job('echo', self.CONF.echo_interval, self._request_echo)
+        if self.CONF.flow_stats:
+            scheduler.add_job('flow_stats', self.CONF.flow_stats_interval,
+                              self._request_flow_stats)
 
     @set_ev_cls(ofp_event.EventOFPStateChange,
                 [MAIN_DISPATCHER, DEAD_DISPATCHER])
@@ -54,46 +93,185 @@ class DatapathMonitor(app_manager.RyuApp):
             if datapath.id not in self.datapaths:
                 self.logger.debug('register datapath: %016x', datapath.id)
                 self.datapaths[datapath.id] = datapath
+                self._request_port_desc(datapath)
+                self.stats_poller.add(datapath.id)
+                if self.CONF.link_port_stats:
+                    self.edge_stats_poller.add(datapath.id)
         elif ev.state == DEAD_DISPATCHER:
             if datapath.id in self.datapaths:
                 self.logger.debug('unregister datapath: %016x', datapath.id)
                 del self.datapaths[datapath.id]
+                self.stats_poller.remove(datapath.id)
+                self.edge_stats_poller.remove(datapath.id)
+                self._edge_stats_xids.pop(datapath.id, None)
+                self._remove_datapath_measurements(datapath.id)
+
+    def _remove_datapath_measurements(self, dpid):
+        for repository in (self.echo_timing_repository,
+                           self.stats_timing_repository,
+                           self.bandwidth_port_stats_repository,
+                           self.plr_port_stats_repository,
+                           self.port_speed_repository,
+                           self.flow_stats_repository):
+            repository.remove_datapath(dpid)
 
     @set_ev_cls(ofp_event.EventOFPPortStatsReply, MAIN_DISPATCHER)
     def _port_stats_reply_handler(self, ev):
-        dpid = ev.msg.datapath.id
-        self.logger.debug('stats request received: %016x', dpid)
-        self._update_switch_response_time(ev)
-        body = ev.msg.body
-        for stat in sorted(body, key=attrgetter('port_no')):
-            self.bandwidth_port_stats_repository.add_stats(
+        msg = ev.msg
+        dpid = msg.datapath.id
+        self.logger.debug('stats reply received: %016x', dpid)
+        add_bandwidth_stats = self.bandwidth_port_stats_repository.add_stats
+        add_plr_stats = self.plr_port_stats_repository.add_stats
+        for stat in msg.body:
+            reset = add_bandwidth_stats(
                 dpid, stat.port_no,
                 BandwidthPortMeasurementData(stat.duration_sec,
                                              stat.duration_nsec, stat.rx_bytes,
                                              stat.tx_bytes))
-            self.plr_port_stats_repository.add_stats(
+            if reset is not None:
+                self._report_counter_reset(reset)
+            add_plr_stats(
                 dpid, stat.port_no,
                 PlrPortMeasurementData(stat.rx_packets, stat.tx_packets,
                                        stat.rx_errors, stat.tx_errors))
+        if not msg.flags & msg.datapath.ofproto.OFPMPF_REPLY_MORE:
+            self._update_switch_response_time(ev)
+            if self._edge_stats_xids.get(dpid) == msg.xid:
+                del self._edge_stats_xids[dpid]
+                self.edge_stats_poller.complete(dpid)
+            else:
+                self.stats_poller.complete(dpid)
+
+    @set_ev_cls(ofp_event.EventOFPPortDescStatsReply, MAIN_DISPATCHER)
+    def _port_desc_stats_reply_handler(self, ev):
+        dpid = ev.msg.datapath.id
+        for port in ev.msg.body:
+            self.port_speed_repository.set_speed(dpid, port.port_no,
+                                                 port.curr_speed)
+
+    @set_ev_cls(ofp_event.EventOFPPortStatus, MAIN_DISPATCHER)
+    def _port_status_handler(self, ev):
+        msg = ev.msg
+        dpid = msg.datapath.id
+        if msg.reason == msg.datapath.ofproto.OFPPR_DELETE:
+            self.port_speed_repository.remove_port(dpid, msg.desc.port_no)
+        else:
+            self.port_speed_repository.set_speed(dpid, msg.desc.port_no,
+                                                 msg.desc.curr_speed)
+
+    def _request_port_desc(self, datapath):
+        parser = datapath.ofproto_parser
+        datapath.send_msg(parser.OFPPortDescStatsRequest(datapath, 0))
 
-    def _monitor(self):
-        while True:
-            hub.sleep(1)
-            for dp in self.datapaths.values():
+    def _report_counter_reset(self, reset):
+        self.logger.warning(
+            'datapath %016x port %d counters reset (%s), re-baselining',
+            reset.dpid, reset.port_no, reset.reason)
+        self.send_event_to_observers(EventPortCounterReset(reset))
+
+    @set_ev_cls(ofp_event.EventOFPFlowStatsReply, MAIN_DISPATCHER)
+    def _flow_stats_reply_handler(self, ev):
+        msg = ev.msg
+        dpid = msg.datapath.id
+        parser = msg.datapath.ofproto_parser
+        for stat in msg.body:
+            out_ports = self._get_output_ports(parser, stat.instructions)
+            if not out_ports:
+                continue
+            flow_key = FlowKey(stat.table_id, stat.priority, stat.cookie,
+                               stat.match.items())
+            duration = stat.duration_sec + stat.duration_nsec * 1e-9
+            for port_no in out_ports:
+                self.flow_stats_repository.add_stats(dpid, port_no, flow_key,
+                                                     stat.byte_count,
+                                                     stat.packet_count,
+                                                     duration)
+        if not msg.flags & msg.datapath.ofproto.OFPMPF_REPLY_MORE:
+            self.flow_stats_repository.finish_poll(dpid)
+
+    @staticmethod
+    def _get_output_ports(parser, instructions):
+        return [
+            action.port for inst in instructions
+            if isinstance(inst, parser.OFPInstructionActions)
+            for action in inst.actions
+            if isinstance(action, parser.OFPActionOutput)
+        ]
+
+    def _request_flow_stats(self):
+        for dp in self.datapaths.values():
+            self.logger.debug('send flow stats request: %016x', dp.id)
+            self.flow_stats_repository.start_poll(dp.id)
+            dp.send_msg(dp.ofproto_parser.OFPFlowStatsRequest(dp))
+
+    @set_ev_cls(ofp_event.EventOFPEchoReply, MAIN_DISPATCHER)
+    def _echo_reply_handler(self, ev):
+        receive_ts_ns = time.monotonic_ns()
+        try:
+            payload = EchoPayload.from_bytes(ev.msg.data)
+        except ValueError:
+            return
+        dpid = ev.msg.datapath.id
+        self.echo_timing_repository.add_response_time(
+            dpid, (receive_ts_ns - payload.send_ts_ns) / 1e9)
+        self.logger.debug(
+            'datapath %016x echo rtt: %s ms', dpid,
+            self.echo_timing_repository.get_response_time(
+                dpid).milliseconds())
+
+    def _request_echo(self):
+        for dp in self.datapaths.values():
+            parser = dp.ofproto_parser
+            payload = EchoPayload(time.monotonic_ns())
+            dp.send_msg(parser.OFPEchoRequest(dp, data=payload.to_bytes()))
+
+    def _request_stats(self):
+        for dpid in self.stats_poller.pop_due():
+            dp = self.datapaths.get(dpid)
+            if dp is None:
+                continue
+            ports = self._find_monitored_ports(dpid)
+            if ports is None:
                 self._request_port_stats(dp)
+                continue
+            self.stats_poller.expect_replies(dpid, len(ports))
+            for port_no in ports:
+                self._request_port_stats(dp, port_no)
+        for dpid in self.edge_stats_poller.pop_due():
+            dp = self.datapaths.get(dpid)
+            if dp is None:
+                continue
+            if self._find_monitored_ports(dpid) is None:
+                # every port is already polled at the stats interval
+                self.edge_stats_poller.expect_replies(dpid, 0)
+                continue
+            self._edge_stats_xids[dpid] = self._request_port_stats(dp)
+
+    def _find_monitored_ports(self, dpid):
+        if self.link_repository is None:
+            return None
+        ports = self.link_repository.get_ports(dpid)
+        if len(ports) > self.CONF.max_port_stats_requests:
+            return None
+        return ports
 
-    def _request_port_stats(self, datapath):
+    def _request_port_stats(self, datapath, port_no=None):
         self.logger.debug('send stats request: %016x', datapath.id)
         ofproto = datapath.ofproto
         parser = datapath.ofproto_parser
-        req = parser.OFPPortStatsRequest(datapath, 0, ofproto.OFPP_ANY)
-        self.datapath_timing_repository.write_send_time(datapath.id)
+        if port_no is None:
+            port_no = ofproto.OFPP_ANY
+        req = parser.OFPPortStatsRequest(datapath, 0, port_no)
+        datapath.set_xid(req)
+        self.stats_timing_repository.write_send_time(datapath.id, req.xid)
         datapath.send_msg(req)
+        return req.xid
 
     def _update_switch_response_time(self, eventOFPPortStatsReply):
         dpid = eventOFPPortStatsReply.msg.datapath.id
-        self.datapath_timing_repository.write_receive_time(dpid)
+        self.stats_timing_repository.write_receive_time(
+            dpid, eventOFPPortStatsReply.msg.xid)
         self.logger.debug(
-            'datapath %016x response time: %s ms', dpid,
-            self.datapath_timing_repository.get_response_time(
+            'datapath %016x stats latency: %s ms', dpid,
+            self.stats_timing_repository.get_response_time(
                 dpid).milliseconds())
@@ -0,0 +1,281 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import collections
+import socket
+import struct
+import time
+
+from lib.flows import ETH_TYPE_ARP
+from lib.packets import ETHERNET_HEADER_SIZE
+
+ETH_TYPE_IPV4 = 0x0800
+
+ARP_REQUEST = 1
+ARP_REPLY = 2
+
+# ethernet destination, source and type
+ETHERNET_HEADER = struct.Struct('!6s6sH')
+# hardware type, protocol type, hardware and protocol address lengths,
+# opcode, sender mac and ip, target mac and ip
+ARP_HEADER = struct.Struct('!HHBBH6s4s6s4s')
+ARP_SIZE = ETHERNET_HEADER_SIZE + ARP_HEADER.size
+ARP_TARGET_OFFSET = ETHERNET_HEADER_SIZE + 18
+
+BROADCAST_MAC = b'\xff' * 6
+ZERO_MAC = b'\x00' * 6
+ZERO_IP = b'\x00' * 4
+
+
+def mac_to_bytes(mac_address):
+    return bytes.fromhex(mac_address.replace(':', ''))
+
+
+def bytes_to_mac(data):
+    return ':'.join(format(b, '02x') for b in data)
+
+
+def ip_to_bytes(ip_address):
+    return socket.inet_aton(ip_address)
+
+
+def bytes_to_ip(data):
+    return socket.inet_ntoa(data)
+
+
+class ArpPacket:
+    __slots__ = ('opcode', 'src_mac', 'src_ip', 'dst_mac', 'dst_ip')
+
+    def __init__(self, opcode, src_mac, src_ip, dst_mac, dst_ip):
+        self.opcode = opcode
+        self.src_mac = src_mac
+        self.src_ip = src_ip
+        self.dst_mac = dst_mac
+        self.dst_ip = dst_ip
+
+    @classmethod
+    def from_bytes(cls, data, offset=ETHERNET_HEADER_SIZE):
+        if len(data) < offset + ARP_HEADER.size:
+            raise ValueError('truncated ARP packet')
+        hw_type, proto_type, hw_len, proto_len, opcode, src_mac, src_ip, \
+            dst_mac, dst_ip = ARP_HEADER.unpack_from(data, offset)
+        if hw_type != 1 or proto_type != ETH_TYPE_IPV4 or hw_len != 6 or \
+                proto_len != 4:
+            raise ValueError('unsupported ARP packet')
+        return cls(opcode, src_mac, src_ip, dst_mac, dst_ip)
+
+    def to_bytes(self, eth_dst=BROADCAST_MAC):
+        return ETHERNET_HEADER.pack(eth_dst, self.src_mac, ETH_TYPE_ARP) + \
+            ARP_HEADER.pack(1, ETH_TYPE_IPV4, 6, 4, self.opcode,
+                            self.src_mac, self.src_ip, self.dst_mac,
+                            self.dst_ip)
+
+
+class ArpReplyTemplate:
+    def __init__(self, mac_address, ip_address):
+        self.mac_address = mac_address
+        self.ip_address = ip_address
+        self._buf = bytearray(
+            ArpPacket(ARP_REPLY, mac_to_bytes(mac_address),
+                      ip_to_bytes(ip_address), ZERO_MAC,
+                      ZERO_IP).to_bytes(ZERO_MAC))
+
+    def render(self, dst_mac, dst_ip):
+        self._buf[0:6] = dst_mac
+        self._buf[ARP_TARGET_OFFSET:ARP_TARGET_OFFSET + 6] = dst_mac
+        self._buf[ARP_TARGET_OFFSET + 6:ARP_SIZE] = dst_ip
+        return bytes(self._buf)
+
+
+class ArpReply:
+    __slots__ = ('data', )
+
+    def __init__(self, data):
+        self.data = data
+
+
+class ArpFlood:
+    __slots__ = ('data', )
+
+    def __init__(self, data):
+        self.data = data
+
+
+class ArpUnicast:
+    __slots__ = ('host', 'data')
+
+    def __init__(self, host, data):
+        self.host = host
+        self.data = data
+
+
+class ArpProxy:
+    def __init__(self,
+                 host_table,
+                 source_rate,
+                 coalesce_window,
+                 flood_interval,
+                 max_floods_per_sec,
+                 refresh_age,
+                 capacity,
+                 clock=time.monotonic):
+        self._host_table = host_table
+        self._refresh_age = refresh_age
+        self._capacity = capacity
+        self._clock = clock
+        self._source_buckets = _TokenBuckets(source_rate, capacity)
+        self._flood_bucket = _TokenBuckets(max_floods_per_sec, 1)
+        self._recent_requests = _RecentKeys(coalesce_window, capacity)
+        self._recent_floods = _RecentKeys(flood_interval, capacity)
+        self._recent_refreshes = _RecentKeys(refresh_age, capacity)
+        self._reply_templates = collections.OrderedDict()
+        self.replies = 0
+        self.floods = 0
+        self.unicasts = 0
+        self.rate_limited = 0
+        self.coalesced = 0
+        self.suppressed_floods = 0
+
+    def __len__(self):
+        return len(self._reply_templates) + len(self._source_buckets) + \
+            len(self._recent_requests) + len(self._recent_floods) + \
+            len(self._recent_refreshes)
+
+    def handle(self, arp_pkt, dpid, port_no, edge=True):
+        if edge and arp_pkt.src_ip != ZERO_IP:
+            self._host_table.learn(bytes_to_ip(arp_pkt.src_ip),
+                                   bytes_to_mac(arp_pkt.src_mac), dpid,
+                                   port_no)
+        if arp_pkt.src_ip == arp_pkt.dst_ip:
+            return []
+        if arp_pkt.opcode == ARP_REPLY:
+            return self._handle_reply(arp_pkt)
+        if arp_pkt.opcode == ARP_REQUEST and arp_pkt.src_ip != ZERO_IP:
+            return self._handle_request(arp_pkt)
+        return []
+
+    def _handle_request(self, arp_pkt):
+        now = self._clock()
+        if not self._recent_requests.add((arp_pkt.src_ip, arp_pkt.dst_ip),
+                                         now):
+            self.coalesced += 1
+            return []
+        if not self._source_buckets.take(arp_pkt.src_mac, now):
+            self.rate_limited += 1
+            return []
+
+        host = self._host_table.get(bytes_to_ip(arp_pkt.dst_ip))
+        if host is None:
+            return self._flood(arp_pkt, now)
+        self.replies += 1
+        actions = [
+            ArpReply(
+                self._get_reply_template(host).render(
+                    arp_pkt.src_mac, arp_pkt.src_ip))
+        ]
+        if self._host_table.get_age(host) >= self._refresh_age and \
+                self._recent_refreshes.add(arp_pkt.dst_ip, now):
+            self.unicasts += 1
+            actions.append(
+                ArpUnicast(host,
+                           arp_pkt.to_bytes(mac_to_bytes(host.mac_address))))
+        return actions
+
+    def _handle_reply(self, arp_pkt):
+        host = self._host_table.get(bytes_to_ip(arp_pkt.dst_ip))
+        if host is None or mac_to_bytes(host.mac_address) != arp_pkt.dst_mac:
+            return []
+        if not self._source_buckets.take(arp_pkt.src_mac, self._clock()):
+            self.rate_limited += 1
+            return []
+        self.unicasts += 1
+        return [ArpUnicast(host, arp_pkt.to_bytes(arp_pkt.dst_mac))]
+
+    def _flood(self, arp_pkt, now):
+        if not self._recent_floods.add(arp_pkt.dst_ip, now) or \
+                not self._flood_bucket.take(None, now):
+            self.suppressed_floods += 1
+            return []
+        self.floods += 1
+        return [ArpFlood(arp_pkt.to_bytes())]
+
+    def _get_reply_template(self, host):
+        template = self._reply_templates.get(host.ip_address)
+        if template is None or template.mac_address != host.mac_address:
+            template = ArpReplyTemplate(host.mac_address, host.ip_address)
+            self._reply_templates[host.ip_address] = template
+            if len(self._reply_templates) > self._capacity:
+                self._reply_templates.popitem(last=False)
+        else:
+            self._reply_templates.move_to_end(host.ip_address)
+        return template
+
+
+class _TokenBuckets:
+    def __init__(self, rate, capacity):
+        self._rate = rate
+        self._max_tokens = max(1.0, rate)
+        self._capacity = capacity
+        # least recently used buckets first
+        self._buckets = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, key, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self._max_tokens, now]
+            if len(self._buckets) > self._capacity:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self._max_tokens,
+                            bucket[0] + (now - bucket[1]) * self._rate)
+            bucket[1] = now
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+
+class _RecentKeys:
+    def __init__(self, window, capacity):
+        self._window = window
+        self._capacity = capacity
+        # oldest keys first
+        self._keys = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key, now):
+        while self._keys:
+            oldest_key, ts = next(iter(self._keys.items()))
+            if now - ts < self._window:
+                break
+            del self._keys[oldest_key]
+        if key in self._keys:
+            return False
+        self._keys[key] = now
+        if len(self._keys) > self._capacity:
+            self._keys.popitem(last=False)
+        return True
@@ -0,0 +1,293 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.arp import ArpPacket, ArpReplyTemplate, ArpProxy, ArpReply, \
+    ArpFlood, ArpUnicast, ARP_REQUEST, ARP_REPLY, ARP_SIZE, ZERO_MAC, \
+    ZERO_IP, mac_to_bytes, bytes_to_mac, ip_to_bytes, bytes_to_ip
+from lib.hosts import HostTable
+from lib.testing import ClockTestCase
+
+MAC1 = '00:00:00:00:00:01'
+MAC2 = '00:00:00:00:00:02'
+MAC3 = '00:00:00:00:00:03'
+IP1 = '10.0.0.1'
+IP2 = '10.0.0.2'
+IP3 = '10.0.0.3'
+
+
+def request(src_mac, src_ip, dst_ip):
+    return ArpPacket(ARP_REQUEST, mac_to_bytes(src_mac), ip_to_bytes(src_ip),
+                     ZERO_MAC, ip_to_bytes(dst_ip))
+
+
+def reply(src_mac, src_ip, dst_mac, dst_ip):
+    return ArpPacket(ARP_REPLY, mac_to_bytes(src_mac), ip_to_bytes(src_ip),
+                     mac_to_bytes(dst_mac), ip_to_bytes(dst_ip))
+
+
+class TestAddresses(unittest.TestCase):
+    def test_mac(self):
+        self.assertEqual(mac_to_bytes('00:11:22:aa:bb:cc'),
+                         b'\x00\x11\x22\xaa\xbb\xcc')
+        self.assertEqual(bytes_to_mac(b'\x00\x11\x22\xaa\xbb\xcc'),
+                         '00:11:22:aa:bb:cc')
+
+    def test_ip(self):
+        self.assertEqual(ip_to_bytes('10.0.0.1'), b'\x0a\x00\x00\x01')
+        self.assertEqual(bytes_to_ip(b'\x0a\x00\x00\x01'), '10.0.0.1')
+
+
+class TestArpPacket(unittest.TestCase):
+    def test_from_bytes(self):
+        frame = request(MAC1, IP1, IP2).to_bytes() + b'\x00' * 18
+
+        pkt = ArpPacket.from_bytes(memoryview(frame))
+
+        self.assertEqual(pkt.opcode, ARP_REQUEST)
+        self.assertEqual(pkt.src_mac, mac_to_bytes(MAC1))
+        self.assertEqual(pkt.src_ip, ip_to_bytes(IP1))
+        self.assertEqual(pkt.dst_mac, ZERO_MAC)
+        self.assertEqual(pkt.dst_ip, ip_to_bytes(IP2))
+
+    def test_to_bytes(self):
+        frame = request(MAC1, IP1, IP2).to_bytes()
+
+        self.assertEqual(len(frame), ARP_SIZE)
+        self.assertEqual(frame[:14], b'\xff' * 6 + mac_to_bytes(MAC1) +
+                         b'\x08\x06')
+        self.assertEqual(frame[14:22], b'\x00\x01\x08\x00\x06\x04\x00\x01')
+
+    def test_from_bytes__truncated(self):
+        with self.assertRaisesRegex(ValueError, r'truncated ARP packet'):
+            ArpPacket.from_bytes(request(MAC1, IP1, IP2).to_bytes()[:30])
+
+    def test_from_bytes__unsupported(self):
+        frame = bytearray(request(MAC1, IP1, IP2).to_bytes())
+        frame[16:18] = b'\x86\xdd'
+
+        with self.assertRaisesRegex(ValueError, r'unsupported ARP packet'):
+            ArpPacket.from_bytes(frame)
+
+
+class TestArpReplyTemplate(unittest.TestCase):
+    def test_render(self):
+        template = ArpReplyTemplate(MAC2, IP2)
+
+        frame = template.render(mac_to_bytes(MAC1), ip_to_bytes(IP1))
+        template.render(mac_to_bytes(MAC3), ip_to_bytes(IP3))
+
+        self.assertEqual(
+            frame,
+            reply(MAC2, IP2, MAC1, IP1).to_bytes(mac_to_bytes(MAC1)))
+
+
+class TestArpProxy(ClockTestCase):
+    def setUp(self):
+        super(TestArpProxy, self).setUp()
+        self.host_table = HostTable(16, 300.0, self.clock)
+
+    def create_proxy(self,
+                     source_rate=10.0,
+                     coalesce_window=0.5,
+                     flood_interval=1.0,
+                     max_floods_per_sec=10.0,
+                     refresh_age=150.0,
+                     capacity=16):
+        return ArpProxy(self.host_table, source_rate, coalesce_window,
+                        flood_interval, max_floods_per_sec, refresh_age,
+                        capacity, self.clock)
+
+    def test_handle__learns_sender(self):
+        proxy = self.create_proxy()
+
+        proxy.handle(request(MAC1, IP1, IP2), 1, 3)
+
+        host = self.host_table.get(IP1)
+        self.assertEqual((host.mac_address, host.dpid, host.port_no),
+                         (MAC1, 1, 3))
+
+    def test_handle__not_edge_port(self):
+        proxy = self.create_proxy()
+
+        proxy.handle(request(MAC1, IP1, IP2), 1, 3, edge=False)
+
+        self.assertIsNone(self.host_table.get(IP1))
+
+    def test_handle__known_target(self):
+        proxy = self.create_proxy()
+        self.host_table.learn(IP2, MAC2, 2, 1)
+
+        actions = proxy.handle(request(MAC1, IP1, IP2), 1, 3)
+
+        self.assertEqual(len(actions), 1)
+        self.assertIsInstance(actions[0], ArpReply)
+        self.assertEqual(
+            actions[0].data,
+            reply(MAC2, IP2, MAC1, IP1).to_bytes(mac_to_bytes(MAC1)))
+        self.assertEqual(proxy.replies, 1)
+
+    def test_handle__relearned_target(self):
+        proxy = self.create_proxy(coalesce_window=0.0)
+        self.host_table.learn(IP2, MAC2, 2, 1)
+        proxy.handle(request(MAC1, IP1, IP2), 1, 3)
+        self.host_table.learn(IP2, MAC3, 2, 1)
+
+        actions = proxy.handle(request(MAC1, IP1, IP2), 1, 3)
+
+        self.assertEqual(
+            actions[0].data,
+            reply(MAC3, IP2, MAC1, IP1).to_bytes(mac_to_bytes(MAC1)))
+
+    def test_handle__aging_target_is_probed(self):
+        proxy = self.create_proxy()
+        self.host_table.learn(IP2, MAC2, 2, 1)
+        self.clock.now += 200
+
+        actions = proxy.handle(request(MAC1, IP1, IP2), 1, 3)
+
+        self.assertIsInstance(actions[0], ArpReply)
+        self.assertIsInstance(actions[1], ArpUnicast)
+        self.assertEqual(actions[1].host.ip_address, IP2)
+        self.assertEqual(actions[1].data[:6], mac_to_bytes(MAC2))
+        self.assertEqual(ArpPacket.from_bytes(actions[1].data).dst_ip,
+                         ip_to_bytes(IP2))
+        self.assertEqual(proxy.unicasts, 1)
+
+        actions = proxy.handle(request(MAC3, IP3, IP2), 1, 4)
+
+        self.assertEqual(len(actions), 1)
+
+    def test_handle__unknown_target_is_flooded_once(self):
+        proxy = self.create_proxy()
+
+        actions = proxy.handle(request(MAC1, IP1, IP2), 1, 3)
+        self.clock.now += 0.1
+        suppressed = proxy.handle(request(MAC3, IP3, IP2), 1, 4)
+
+        self.assertEqual(len(actions), 1)
+        self.assertIsInstance(actions[0], ArpFlood)
+        self.assertEqual(actions[0].data,
+                         request(MAC1, IP1, IP2).to_bytes())
+        self.assertListEqual(suppressed, [])
+        self.assertEqual(proxy.floods, 1)
+        self.assertEqual(proxy.suppressed_floods, 1)
+
+        self.clock.now += 1.0
+        self.assertIsInstance(
+            proxy.handle(request(MAC3, IP3, IP2), 1, 4)[0], ArpFlood)
+
+    def test_handle__flood_rate_limit(self):
+        proxy = self.create_proxy(max_floods_per_sec=2.0)
+
+        floods = [
+            proxy.handle(request(MAC1, IP1, '10.0.1.' + str(i)), 1, 3)
+            for i in range(5)
+        ]
+
+        self.assertEqual(sum(len(actions) for actions in floods), 2)
+        self.assertEqual(proxy.suppressed_floods, 3)
+
+    def test_handle__coalesces_duplicate_requests(self):
+        proxy = self.create_proxy()
+        self.host_table.learn(IP2, MAC2, 2, 1)
+
+        first = proxy.handle(request(MAC1, IP1, IP2), 1, 3)
+        duplicates = [
+            proxy.handle(request(MAC1, IP1, IP2), dpid, 1)
+            for dpid in range(2, 6)
+        ]
+
+        self.assertEqual(len(first), 1)
+        self.assertListEqual(duplicates, [[]] * 4)
+        self.assertEqual(proxy.coalesced, 4)
+
+        self.clock.now += 0.5
+        self.assertEqual(len(proxy.handle(request(MAC1, IP1, IP2), 1, 3)),
+                         1)
+
+    def test_handle__source_rate_limit(self):
+        proxy = self.create_proxy(source_rate=3.0)
+
+        replies = [
+            proxy.handle(request(MAC1, IP1, '10.0.1.' + str(i)), 1, 3)
+            for i in range(5)
+        ]
+
+        self.assertEqual(sum(len(actions) for actions in replies), 3)
+        self.assertEqual(proxy.rate_limited, 2)
+        self.assertEqual(
+            len(proxy.handle(request(MAC3, IP3, '10.0.2.1'), 1, 4)), 1)
+
+        self.clock.now += 1.0
+        self.assertEqual(
+            len(proxy.handle(request(MAC1, IP1, '10.0.3.1'), 1, 3)), 1)
+
+    def test_handle__reply_delivered_to_requester(self):
+        proxy = self.create_proxy()
+        proxy.handle(request(MAC1, IP1, IP2), 1, 3)
+
+        actions = proxy.handle(reply(MAC2, IP2, MAC1, IP1), 2, 1)
+
+        self.assertEqual(len(actions), 1)
+        self.assertIsInstance(actions[0], ArpUnicast)
+        self.assertEqual(actions[0].host.ip_address, IP1)
+        self.assertEqual(actions[0].data,
+                         reply(MAC2, IP2, MAC1, IP1).to_bytes(
+                             mac_to_bytes(MAC1)))
+        self.assertEqual(self.host_table.get(IP2).dpid, 2)
+
+    def test_handle__reply_to_unknown_host(self):
+        proxy = self.create_proxy()
+
+        self.assertListEqual(
+            proxy.handle(reply(MAC2, IP2, MAC1, IP1), 2, 1), [])
+
+    def test_handle__gratuitous(self):
+        proxy = self.create_proxy()
+
+        self.assertListEqual(proxy.handle(request(MAC1, IP1, IP1), 1, 3),
+                             [])
+        self.assertIsNotNone(self.host_table.get(IP1))
+
+    def test_handle__probe_from_unconfigured_host(self):
+        proxy = self.create_proxy()
+        pkt = ArpPacket(ARP_REQUEST, mac_to_bytes(MAC1), ZERO_IP, ZERO_MAC,
+                        ip_to_bytes(IP2))
+
+        self.assertListEqual(proxy.handle(pkt, 1, 3), [])
+        self.assertEqual(len(self.host_table), 0)
+
+    def test_handle__bounded_state(self):
+        proxy = self.create_proxy(capacity=4)
+
+        for i in range(100):
+            self.host_table.learn('10.0.1.' + str(i), MAC2, 2, 1)
+            proxy.handle(
+                request('00:00:00:00:01:' + format(i, '02x'),
+                        '10.0.2.' + str(i), '10.0.1.' + str(i)), 1, 3)
+
+        self.assertLessEqual(len(proxy), 4 * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from lib.util import dpid_to_string
+from lib.measurement_repositories import DatapathTimings
+
+
+class DatapathViewModel:
+    def __init__(self, dpid, echo_timings, stats_timings, stats_poll=None):
+        echo_timings = echo_timings or DatapathTimings()
+        stats_timings = stats_timings or DatapathTimings()
+        self.dpid = dpid_to_string(dpid)
+        self.response_time_ms = echo_timings.get_response_time().milliseconds()
+        self.response_time_variation_ms = \
+            echo_timings.get_response_time_variation().milliseconds()
+        self.last_response_time_ms = _to_milliseconds(
+            echo_timings.last_response_time)
+        self.min_response_time_ms = _to_milliseconds(
+            echo_timings.min_response_time)
+        self.stats_latency_ms = \
+            stats_timings.get_response_time().milliseconds()
+        self.stats_latency_variation_ms = \
+            stats_timings.get_response_time_variation().milliseconds()
+        self.in_flight_stats_requests = stats_timings.get_in_flight()
+        self.timed_out_stats_requests = stats_timings.timeouts
+        self.stats_polls = stats_poll.polls if stats_poll else 0
+        self.skipped_stats_polls = stats_poll.skipped if stats_poll else 0
+        self.stats_poll_lag_ms = _to_milliseconds(
+            stats_poll.last_lag) if stats_poll else None
+        self.max_stats_poll_lag_ms = _to_milliseconds(
+            stats_poll.max_lag) if stats_poll else None
+
+
+class CounterResetViewModel:
+    def __init__(self, reset):
+        self.dpid = dpid_to_string(reset.dpid)
+        self.port_no = reset.port_no
+        self.reason = reset.reason
+        self.ts = reset.ts
+
+
+def _to_milliseconds(seconds, ndigits=3):
+    return None if seconds is None else round(seconds * 1000, ndigits)
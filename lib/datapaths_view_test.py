@@ -0,0 +1,90 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.datapaths_view import DatapathViewModel, CounterResetViewModel
+from lib.measurement_repositories import DatapathTimings, CounterReset, \
+    RESET_DURATION
+from lib.stats_poller import DatapathPoll
+
+
+class TestDatapathViewModel(unittest.TestCase):
+    def test__init__(self):
+        echo_timings = DatapathTimings()
+        echo_timings.add_response_time(0.0005)
+        stats_timings = DatapathTimings(8, 5.0)
+        stats_timings.write_send_time(1, 100.0)
+        stats_timings.write_receive_time(1, 100.0015)
+        stats_timings.write_send_time(2, 100.5)
+        stats_poll = DatapathPoll(1.0)
+        stats_poll.polls = 2
+        stats_poll.skipped = 1
+        stats_poll.last_lag = 0.0015
+        stats_poll.max_lag = 0.002
+
+        view = DatapathViewModel(1, echo_timings, stats_timings, stats_poll)
+
+        self.assertDictEqual(
+            view.__dict__, {
+                'dpid': '00:00:00:00:00:00:00:01',
+                'response_time_ms': 0.5,
+                'response_time_variation_ms': 0.0,
+                'last_response_time_ms': 0.5,
+                'min_response_time_ms': 0.5,
+                'stats_latency_ms': 1.5,
+                'stats_latency_variation_ms': 0.0,
+                'in_flight_stats_requests': 1,
+                'timed_out_stats_requests': 0,
+                'stats_polls': 2,
+                'skipped_stats_polls': 1,
+                'stats_poll_lag_ms': 1.5,
+                'max_stats_poll_lag_ms': 2.0
+            })
+
+    def test__init__no_timings(self):
+        view = DatapathViewModel(1, None, None)
+
+        self.assertEqual(view.response_time_ms, 0.0)
+        self.assertIsNone(view.last_response_time_ms)
+        self.assertIsNone(view.min_response_time_ms)
+        self.assertEqual(view.stats_latency_ms, 0.0)
+        self.assertEqual(view.in_flight_stats_requests, 0)
+        self.assertEqual(view.skipped_stats_polls, 0)
+        self.assertIsNone(view.stats_poll_lag_ms)
+
+
+class TestCounterResetViewModel(unittest.TestCase):
+    def test__init__(self):
+        view = CounterResetViewModel(
+            CounterReset(1, 2, RESET_DURATION, 1600000000.5))
+
+        self.assertDictEqual(
+            view.__dict__, {
+                'dpid': '00:00:00:00:00:00:00:01',
+                'port_no': 2,
+                'reason': 'duration',
+                'ts': 1600000000.5
+            })
+
+
+if __name__ == '__main__':
+    unittest.main()
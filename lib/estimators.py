@@ -0,0 +1,161 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import math
+
+
+class Ewma:
+    def __init__(self, alpha):
+        if not 0 < alpha <= 1:
+            raise ValueError('alpha must be in (0, 1]')
+        self._alpha = alpha
+        self.value = None
+
+    def update(self, value):
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self._alpha * (value - self.value)
+
+
+class DDSketch:
+    MIN_INDEXABLE_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('relative accuracy must be in (0, 1)')
+        self._relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max_buckets
+        self._buckets = {}
+        self._zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value < self.MIN_INDEXABLE_VALUE:
+            self._zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        if len(self._buckets) > self._max_buckets:
+            self._collapse_lowest_buckets()
+
+    def _collapse_lowest_buckets(self):
+        lowest, second_lowest = sorted(self._buckets)[:2]
+        self._buckets[second_lowest] += self._buckets.pop(lowest)
+
+    def merge(self, other):
+        if self._gamma != other._gamma:
+            raise ValueError('sketches have different relative accuracy')
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        while len(self._buckets) > self._max_buckets:
+            self._collapse_lowest_buckets()
+
+    def copy(self):
+        sketch = DDSketch(self._relative_accuracy, self._max_buckets)
+        sketch.merge(self)
+        return sketch
+
+    def quantile(self, q):
+        if not 0 <= q <= 1:
+            raise ValueError('quantile must be in [0, 1]')
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                return 2 * self._gamma**index / (self._gamma + 1)
+        return 2 * self._gamma**max(self._buckets) / (self._gamma + 1)
+
+
+class LatencySummary:
+    def __init__(self, ewma=None, minimum=None, maximum=None, p50=None,
+                 p95=None, p99=None):
+        self.ewma = ewma
+        self.min = minimum
+        self.max = maximum
+        self.p50 = p50
+        self.p95 = p95
+        self.p99 = p99
+
+    def shift(self, delta, ndigits=3):
+        def shifted(value):
+            return None if value is None else round(value + delta, ndigits)
+
+        return LatencySummary(shifted(self.ewma), shifted(self.min),
+                              shifted(self.max), shifted(self.p50),
+                              shifted(self.p95), shifted(self.p99))
+
+
+class LatencyEstimator:
+    def __init__(self, ewma_alpha=0.125, relative_accuracy=0.01):
+        self._ewma = Ewma(ewma_alpha)
+        self._jitter = Ewma(ewma_alpha)
+        self._ewma_alpha = ewma_alpha
+        self._sketch = DDSketch(relative_accuracy)
+        self._min = None
+        self._max = None
+
+    def update(self, latency):
+        if self._ewma.value is not None:
+            self._jitter.update(abs(latency - self._ewma.value))
+        self._ewma.update(latency)
+        self._sketch.add(latency)
+        if self._min is None or latency < self._min:
+            self._min = latency
+        if self._max is None or latency > self._max:
+            self._max = latency
+
+    def is_unstable(self, threshold):
+        if self._jitter.value is None:
+            return False
+        return self._jitter.value > threshold * self._ewma.value
+
+    def merge(self, other):
+        estimator = LatencyEstimator(self._ewma_alpha)
+        estimator._sketch = self._sketch.copy()
+        estimator._sketch.merge(other._sketch)
+        estimators = (self, other)
+        ewmas = [
+            e._ewma.value for e in estimators if e._ewma.value is not None
+        ]
+        if ewmas:
+            estimator._ewma.value = sum(ewmas) / len(ewmas)
+        mins = [e._min for e in estimators if e._min is not None]
+        maxs = [e._max for e in estimators if e._max is not None]
+        estimator._min = min(mins) if mins else None
+        estimator._max = max(maxs) if maxs else None
+        return estimator
+
+    def summary(self):
+        return LatencySummary(self._ewma.value, self._min, self._max,
+                              self._sketch.quantile(0.5),
+                              self._sketch.quantile(0.95),
+                              self._sketch.quantile(0.99))
@@ -0,0 +1,164 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+import random
+
+from lib.estimators import Ewma, DDSketch, LatencySummary, LatencyEstimator
+
+
+class TestEwma(unittest.TestCase):
+    def test__init__(self):
+        with self.assertRaises(ValueError):
+            Ewma(0)
+        with self.assertRaises(ValueError):
+            Ewma(1.5)
+
+    def test_update(self):
+        ewma = Ewma(0.5)
+        self.assertIsNone(ewma.value)
+
+        ewma.update(10.0)
+        self.assertEqual(ewma.value, 10.0)
+
+        ewma.update(20.0)
+        self.assertEqual(ewma.value, 15.0)
+
+
+class TestDDSketch(unittest.TestCase):
+    def test_quantile__empty(self):
+        self.assertIsNone(DDSketch().quantile(0.5))
+
+    def test_quantile(self):
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in range(1, 1001):
+            sketch.add(float(value))
+
+        self.assertEqual(sketch.count, 1000)
+        for q, expected in ((0.5, 500.5), (0.95, 950.05), (0.99, 990.01)):
+            self.assertAlmostEqual(sketch.quantile(q),
+                                   expected,
+                                   delta=expected * 0.01)
+
+    def test_quantile__zero(self):
+        sketch = DDSketch()
+        sketch.add(0.0)
+        sketch.add(0.0)
+        sketch.add(5.0)
+
+        self.assertEqual(sketch.quantile(0.0), 0.0)
+        self.assertAlmostEqual(sketch.quantile(1.0), 5.0, delta=0.05)
+
+    def test_quantile__invalid(self):
+        with self.assertRaises(ValueError):
+            DDSketch().quantile(1.5)
+
+    def test_add__max_buckets(self):
+        sketch = DDSketch(relative_accuracy=0.01, max_buckets=10)
+        for value in range(1, 1001):
+            sketch.add(float(value))
+
+        self.assertLessEqual(len(sketch._buckets), 10)
+        self.assertAlmostEqual(sketch.quantile(1.0), 1000.0, delta=10.0)
+
+    def test_merge(self):
+        rnd = random.Random(1)
+        values = [rnd.uniform(0.1, 10.0) for _ in range(2000)]
+        sketch1, sketch2, sketch = DDSketch(), DDSketch(), DDSketch()
+        for i, value in enumerate(values):
+            (sketch1 if i % 2 else sketch2).add(value)
+            sketch.add(value)
+
+        sketch1.merge(sketch2)
+
+        self.assertEqual(sketch1.count, 2000)
+        self.assertEqual(sketch1.quantile(0.95), sketch.quantile(0.95))
+
+    def test_merge__different_accuracy(self):
+        with self.assertRaises(ValueError):
+            DDSketch(0.01).merge(DDSketch(0.02))
+
+
+class TestLatencySummary(unittest.TestCase):
+    def test_shift(self):
+        summary = LatencySummary(2.0, 1.0, 3.0, 2.0, 2.9, 2.99).shift(-0.5)
+
+        self.assertEqual(summary.ewma, 1.5)
+        self.assertEqual(summary.min, 0.5)
+        self.assertEqual(summary.max, 2.5)
+        self.assertEqual(summary.p50, 1.5)
+        self.assertEqual(summary.p95, 2.4)
+        self.assertEqual(summary.p99, 2.49)
+
+    def test_shift__empty(self):
+        summary = LatencySummary().shift(-0.5)
+
+        self.assertIsNone(summary.ewma)
+        self.assertIsNone(summary.p99)
+
+
+class TestLatencyEstimator(unittest.TestCase):
+    def test_update(self):
+        estimator = LatencyEstimator(ewma_alpha=0.5)
+        for latency in (1.0, 3.0, 2.0):
+            estimator.update(latency)
+
+        summary = estimator.summary()
+        self.assertEqual(summary.ewma, 2.0)
+        self.assertEqual(summary.min, 1.0)
+        self.assertEqual(summary.max, 3.0)
+        self.assertAlmostEqual(summary.p50, 2.0, delta=0.02)
+
+    def test_is_unstable(self):
+        estimator = LatencyEstimator(ewma_alpha=0.5)
+        estimator.update(1.0)
+        self.assertFalse(estimator.is_unstable(0.5))
+
+        estimator.update(1.1)
+        self.assertFalse(estimator.is_unstable(0.5))
+
+        estimator.update(5.0)
+        self.assertTrue(estimator.is_unstable(0.5))
+
+    def test_summary__empty(self):
+        summary = LatencyEstimator().summary()
+
+        self.assertIsNone(summary.ewma)
+        self.assertIsNone(summary.min)
+        self.assertIsNone(summary.p50)
+
+    def test_merge(self):
+        estimator1 = LatencyEstimator()
+        estimator1.update(1.0)
+        estimator2 = LatencyEstimator()
+        estimator2.update(3.0)
+
+        summary = estimator1.merge(estimator2).summary()
+
+        self.assertEqual(summary.ewma, 2.0)
+        self.assertEqual(summary.min, 1.0)
+        self.assertEqual(summary.max, 3.0)
+        self.assertEqual(estimator1.summary().max, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+class FlowKey:
+    __slots__ = ('table_id', 'priority', 'cookie', 'match_fields')
+
+    def __init__(self, table_id, priority, cookie, match_fields):
+        self.table_id = table_id
+        self.priority = priority
+        self.cookie = cookie
+        self.match_fields = tuple(match_fields)
+
+    def _as_tuple(self):
+        return (self.table_id, self.priority, self.cookie, self.match_fields)
+
+    def __hash__(self):
+        return hash(self._as_tuple())
+
+    def __eq__(self, other):
+        return self._as_tuple() == other._as_tuple()
+
+
+class FlowRate:
+    __slots__ = ('flow_key', 'byte_count', 'packet_count', 'duration',
+                 'bytes_per_sec', 'packets_per_sec', 'poll')
+
+    def __init__(self, flow_key, byte_count, packet_count, duration, poll):
+        self.flow_key = flow_key
+        self.byte_count = byte_count
+        self.packet_count = packet_count
+        self.duration = duration
+        self.poll = poll
+        # average since the flow was installed until a second sample comes
+        self.bytes_per_sec = byte_count / duration if duration > 0 else 0.0
+        self.packets_per_sec = packet_count / duration if duration > 0 else 0.0
+
+    def update(self, byte_count, packet_count, duration, poll):
+        time_delta = duration - self.duration
+        if time_delta > 0 and byte_count >= self.byte_count:
+            self.bytes_per_sec = (byte_count - self.byte_count) / time_delta
+            self.packets_per_sec = (packet_count -
+                                    self.packet_count) / time_delta
+        self.byte_count = byte_count
+        self.packet_count = packet_count
+        self.duration = duration
+        self.poll = poll
+
+
+class TopFlows:
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._flows = {}
+        self._min_flow = None
+        # flows below the minimum whose next sample gives a measured rate
+        self._candidates = {}
+
+    def __len__(self):
+        return len(self._flows)
+
+    def update(self, flow_key, byte_count, packet_count, duration, poll):
+        flow = self._flows.get(flow_key)
+        if flow is not None:
+            flow.update(byte_count, packet_count, duration, poll)
+            if flow is self._min_flow:
+                self._min_flow = None
+            elif self._min_flow is not None and \
+                    flow.bytes_per_sec < self._min_flow.bytes_per_sec:
+                self._min_flow = flow
+            return
+        flow = self._candidates.pop(flow_key, None)
+        measured = flow is not None
+        if measured:
+            flow.update(byte_count, packet_count, duration, poll)
+        else:
+            flow = FlowRate(flow_key, byte_count, packet_count, duration,
+                            poll)
+        if len(self._flows) >= self._capacity:
+            min_flow = self._find_min_flow()
+            if flow.bytes_per_sec <= min_flow.bytes_per_sec:
+                if not measured and \
+                        len(self._candidates) < self._capacity:
+                    self._candidates[flow_key] = flow
+                return
+            del self._flows[min_flow.flow_key]
+            self._min_flow = None
+        self._flows[flow_key] = flow
+
+    def remove_stale(self, poll):
+        stale = [key for key, flow in self._flows.items() if flow.poll != poll]
+        for key in stale:
+            del self._flows[key]
+        if stale:
+            self._min_flow = None
+        for key in [
+                key for key, flow in self._candidates.items()
+                if flow.poll != poll
+        ]:
+            del self._candidates[key]
+
+    def get_top(self, k):
+        return sorted(self._flows.values(),
+                      key=lambda flow: flow.bytes_per_sec,
+                      reverse=True)[:k]
+
+    def _find_min_flow(self):
+        if self._min_flow is None:
+            self._min_flow = min(self._flows.values(),
+                                 key=lambda flow: flow.bytes_per_sec)
+        return self._min_flow
+
+
+class FlowStatsRepository:
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._top_flows = {}
+        self._polls = {}
+
+    def start_poll(self, dpid):
+        self._polls[dpid] = self._polls.get(dpid, 0) + 1
+
+    def add_stats(self, dpid, port_no, flow_key, byte_count, packet_count,
+                  duration):
+        port_flows = self._top_flows.setdefault(dpid, {})
+        top_flows = port_flows.get(port_no)
+        if top_flows is None:
+            top_flows = port_flows[port_no] = TopFlows(self._capacity)
+        top_flows.update(flow_key, byte_count, packet_count, duration,
+                         self._polls.get(dpid, 0))
+
+    def finish_poll(self, dpid):
+        poll = self._polls.get(dpid, 0)
+        for top_flows in self._top_flows.get(dpid, {}).values():
+            top_flows.remove_stale(poll)
+
+    def __len__(self):
+        return sum(
+            len(top_flows) for port_flows in self._top_flows.values()
+            for top_flows in port_flows.values())
+
+    def remove_datapath(self, dpid):
+        self._top_flows.pop(dpid, None)
+        self._polls.pop(dpid, None)
+
+    def get_top_flows(self, dpid, port_no, k):
+        top_flows = self._top_flows.get(dpid, {}).get(port_no)
+        if top_flows is None:
+            return []
+        return top_flows.get_top(k)
@@ -0,0 +1,198 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.flow_stats import FlowKey, FlowRate, TopFlows, FlowStatsRepository
+
+
+class TestFlowKey(unittest.TestCase):
+    def test__eq__(self):
+        key1 = FlowKey(0, 10, 0, [('in_port', 1), ('eth_type', 2048)])
+        key2 = FlowKey(0, 10, 0, (('in_port', 1), ('eth_type', 2048)))
+        key3 = FlowKey(0, 10, 0, [('in_port', 2)])
+
+        self.assertEqual(key1, key2)
+        self.assertEqual(hash(key1), hash(key2))
+        self.assertNotEqual(key1, key3)
+
+
+class TestFlowRate(unittest.TestCase):
+    def test__init__(self):
+        flow = FlowRate('f1', 1000, 10, 10.0, 1)
+
+        self.assertEqual(flow.bytes_per_sec, 100.0)
+        self.assertEqual(flow.packets_per_sec, 1.0)
+
+        flow = FlowRate('f1', 1000, 10, 0.0, 1)
+        self.assertEqual(flow.bytes_per_sec, 0.0)
+
+    def test_update(self):
+        flow = FlowRate('f1', 1000, 10, 10.0, 1)
+
+        flow.update(4000, 40, 11.0, 2)
+
+        self.assertEqual(flow.bytes_per_sec, 3000.0)
+        self.assertEqual(flow.packets_per_sec, 30.0)
+        self.assertEqual(flow.poll, 2)
+
+    def test_update__counter_reset(self):
+        flow = FlowRate('f1', 1000, 10, 10.0, 1)
+
+        flow.update(100, 1, 1.0, 2)
+
+        self.assertEqual(flow.bytes_per_sec, 100.0)
+        self.assertEqual(flow.byte_count, 100)
+
+
+class TestTopFlows(unittest.TestCase):
+    def test_update__capacity(self):
+        top_flows = TopFlows(3)
+        for i in range(10):
+            top_flows.update('f' + str(i), i * 100, i, 1.0, 1)
+
+        self.assertEqual(len(top_flows), 3)
+        self.assertListEqual(
+            [flow.flow_key for flow in top_flows.get_top(10)],
+            ['f9', 'f8', 'f7'])
+
+    def test_update__rate_change(self):
+        top_flows = TopFlows(2)
+        top_flows.update('f1', 100, 1, 1.0, 1)
+        top_flows.update('f2', 200, 2, 1.0, 1)
+        top_flows.update('f0', 50, 1, 1.0, 1)
+
+        # f2 slows down below f1 and is evicted by a new flow
+        top_flows.update('f2', 200, 2, 2.0, 2)
+        top_flows.update('f3', 150, 1, 1.0, 2)
+
+        self.assertListEqual(
+            [flow.flow_key for flow in top_flows.get_top(10)], ['f3', 'f1'])
+
+    def test_update__long_installed_flow_turns_heavy(self):
+        top_flows = TopFlows(2)
+        top_flows.update('f1', 1000, 1, 1.0, 1)
+        top_flows.update('f2', 2000, 2, 1.0, 1)
+        # installed an hour ago, idle so far
+        top_flows.update('f3', 3600, 1, 3600.0, 1)
+
+        top_flows.update('f1', 2000, 2, 2.0, 2)
+        top_flows.update('f2', 4000, 4, 2.0, 2)
+        top_flows.update('f3', 1000000, 100, 3601.0, 2)
+
+        self.assertListEqual(
+            [flow.flow_key for flow in top_flows.get_top(10)], ['f3', 'f2'])
+        self.assertEqual(top_flows.get_top(1)[0].bytes_per_sec, 996400.0)
+
+    def test_update__candidates_bounded(self):
+        top_flows = TopFlows(2)
+        for poll in range(1, 4):
+            for i in range(10):
+                top_flows.update('f' + str(i), 100 * poll, 1, 1.0 * poll,
+                                 poll)
+            top_flows.remove_stale(poll)
+
+        self.assertEqual(len(top_flows), 2)
+        self.assertLessEqual(len(top_flows._candidates), 2)
+
+    def test_remove_stale__candidates(self):
+        top_flows = TopFlows(1)
+        top_flows.update('f1', 1000, 1, 1.0, 1)
+        top_flows.update('f2', 10, 1, 10.0, 1)
+        top_flows.update('f1', 2000, 2, 2.0, 2)
+
+        top_flows.remove_stale(2)
+        top_flows.update('f2', 100000, 10, 11.0, 3)
+
+        # f2 was dropped with the stale candidates, its rate is an average
+        self.assertListEqual(
+            [flow.flow_key for flow in top_flows.get_top(10)], ['f2'])
+        self.assertAlmostEqual(top_flows.get_top(1)[0].bytes_per_sec,
+                               100000 / 11.0)
+
+    def test_remove_stale(self):
+        top_flows = TopFlows(3)
+        top_flows.update('f1', 100, 1, 1.0, 1)
+        top_flows.update('f2', 200, 2, 1.0, 1)
+        top_flows.update('f1', 300, 3, 2.0, 2)
+
+        top_flows.remove_stale(2)
+
+        self.assertListEqual(
+            [flow.flow_key for flow in top_flows.get_top(10)], ['f1'])
+
+    def test_get_top(self):
+        top_flows = TopFlows(5)
+        for i in range(5):
+            top_flows.update('f' + str(i), i * 100, i, 1.0, 1)
+
+        self.assertListEqual(
+            [flow.flow_key for flow in top_flows.get_top(2)], ['f4', 'f3'])
+
+
+class TestFlowStatsRepository(unittest.TestCase):
+    def test_get_top_flows(self):
+        repo = FlowStatsRepository(2)
+        repo.start_poll(1)
+        repo.add_stats(1, 2, 'f1', 100, 1, 1.0)
+        repo.add_stats(1, 2, 'f2', 300, 3, 1.0)
+        repo.add_stats(1, 3, 'f3', 200, 2, 1.0)
+        repo.finish_poll(1)
+
+        self.assertListEqual(
+            [flow.flow_key for flow in repo.get_top_flows(1, 2, 10)],
+            ['f2', 'f1'])
+        self.assertListEqual(
+            [flow.flow_key for flow in repo.get_top_flows(1, 3, 1)], ['f3'])
+        self.assertListEqual(repo.get_top_flows(1, 4, 10), [])
+        self.assertListEqual(repo.get_top_flows(2, 2, 10), [])
+
+    def test_finish_poll(self):
+        repo = FlowStatsRepository(2)
+        repo.start_poll(1)
+        repo.add_stats(1, 2, 'f1', 100, 1, 1.0)
+        repo.add_stats(1, 2, 'f2', 300, 3, 1.0)
+        repo.finish_poll(1)
+
+        repo.start_poll(1)
+        repo.add_stats(1, 2, 'f2', 600, 6, 2.0)
+        repo.finish_poll(1)
+
+        flows = repo.get_top_flows(1, 2, 10)
+        self.assertListEqual([flow.flow_key for flow in flows], ['f2'])
+        self.assertEqual(flows[0].bytes_per_sec, 300.0)
+
+    def test_remove_datapath(self):
+        repo = FlowStatsRepository(2)
+        for dpid in (1, 2):
+            repo.start_poll(dpid)
+            repo.add_stats(dpid, 2, 'f1', 100, 1, 1.0)
+            repo.add_stats(dpid, 3, 'f2', 100, 1, 1.0)
+        self.assertEqual(len(repo), 4)
+
+        repo.remove_datapath(1)
+
+        self.assertEqual(len(repo), 2)
+        self.assertListEqual(repo.get_top_flows(1, 2, 10), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
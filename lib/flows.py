@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+TABLE_MISS_PRIORITY = 0
+ARP_PRIORITY = 65534
+PROBE_PRIORITY = 65535
+
+ETH_TYPE_ARP = 0x0806
+
+TABLE_MISS_ACTIONS = ('drop', 'controller', 'normal')
+
+
+def add_flow(datapath, priority, match, actions):
+    ofproto = datapath.ofproto
+    parser = datapath.ofproto_parser
+
+    inst = [
+        parser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)
+    ]
+    mod = parser.OFPFlowMod(datapath=datapath,
+                            priority=priority,
+                            match=match,
+                            instructions=inst)
+    datapath.send_msg(mod)
+
+
+def to_controller_actions(datapath, max_len=None):
+    ofproto = datapath.ofproto
+    parser = datapath.ofproto_parser
+    if max_len is None:
+        max_len = ofproto.OFPCML_NO_BUFFER
+    return [parser.OFPActionOutput(ofproto.OFPP_CONTROLLER, max_len)]
+
+
+def table_miss_actions(datapath, action):
+    if action == 'drop':
+        return []
+    if action == 'controller':
+        return to_controller_actions(datapath)
+    if action == 'normal':
+        return [
+            datapath.ofproto_parser.OFPActionOutput(
+                datapath.ofproto.OFPP_NORMAL)
+        ]
+    raise ValueError('unknown table-miss action ' + str(action))
+
+
+def add_eth_type_flow(datapath, priority, eth_type, max_len=None):
+    match = datapath.ofproto_parser.OFPMatch(eth_type=eth_type)
+    add_flow(datapath, priority, match,
+             to_controller_actions(datapath, max_len))
+
+
+def add_table_miss_flow(datapath, action):
+    add_flow(datapath, TABLE_MISS_PRIORITY,
+             datapath.ofproto_parser.OFPMatch(),
+             table_miss_actions(datapath, action))
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.flows import add_table_miss_flow, add_eth_type_flow, \
+    table_miss_actions, ETH_TYPE_ARP, ARP_PRIORITY, TABLE_MISS_PRIORITY
+
+
+class FakeOfproto:
+    OFPIT_APPLY_ACTIONS = 4
+    OFPP_CONTROLLER = 0xfffffffd
+    OFPP_NORMAL = 0xfffffffa
+    OFPCML_NO_BUFFER = 0xffff
+
+
+class FakeParser:
+    @staticmethod
+    def OFPMatch(**fields):
+        return fields
+
+    @staticmethod
+    def OFPActionOutput(port, max_len=0xffe5):
+        return ('output', port, max_len)
+
+    @staticmethod
+    def OFPInstructionActions(type_, actions):
+        return (type_, actions)
+
+    @staticmethod
+    def OFPFlowMod(**kwargs):
+        return kwargs
+
+
+class FakeDatapath:
+    ofproto = FakeOfproto
+    ofproto_parser = FakeParser
+
+    def __init__(self):
+        self.sent = []
+
+    def send_msg(self, msg):
+        self.sent.append(msg)
+
+
+class TestFlows(unittest.TestCase):
+    def test_table_miss_actions(self):
+        datapath = FakeDatapath()
+
+        self.assertListEqual(table_miss_actions(datapath, 'drop'), [])
+        self.assertListEqual(
+            table_miss_actions(datapath, 'controller'),
+            [('output', FakeOfproto.OFPP_CONTROLLER, 0xffff)])
+        self.assertListEqual(table_miss_actions(datapath, 'normal'),
+                             [('output', FakeOfproto.OFPP_NORMAL, 0xffe5)])
+
+    def test_table_miss_actions__unknown(self):
+        with self.assertRaisesRegex(ValueError,
+                                    r'unknown table-miss action flood'):
+            table_miss_actions(FakeDatapath(), 'flood')
+
+    def test_add_table_miss_flow(self):
+        datapath = FakeDatapath()
+
+        add_table_miss_flow(datapath, 'drop')
+
+        self.assertEqual(len(datapath.sent), 1)
+        self.assertEqual(datapath.sent[0]['priority'], TABLE_MISS_PRIORITY)
+        self.assertDictEqual(datapath.sent[0]['match'], {})
+        self.assertListEqual(datapath.sent[0]['instructions'],
+                             [(FakeOfproto.OFPIT_APPLY_ACTIONS, [])])
+
+    def test_add_eth_type_flow(self):
+        datapath = FakeDatapath()
+
+        add_eth_type_flow(datapath, ARP_PRIORITY, ETH_TYPE_ARP, 64)
+
+        self.assertEqual(datapath.sent[0]['priority'], ARP_PRIORITY)
+        self.assertDictEqual(datapath.sent[0]['match'],
+                             {'eth_type': ETH_TYPE_ARP})
+        self.assertListEqual(
+            datapath.sent[0]['instructions'],
+            [(FakeOfproto.OFPIT_APPLY_ACTIONS,
+              [('output', FakeOfproto.OFPP_CONTROLLER, 64)])])
+
+
+if __name__ == '__main__':
+    unittest.main()
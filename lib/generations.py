@@ -0,0 +1,52 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+class Generations:
+    def __init__(self):
+        self.generation = 0
+        self._key_generations = {}
+        self._subscribers = []
+
+    def subscribe(self):
+        changed_keys = set()
+        self._subscribers.append(changed_keys)
+        return changed_keys
+
+    def touch(self, key=None):
+        self.generation += 1
+        if key is not None:
+            self._key_generations[key] = self.generation
+            for changed_keys in self._subscribers:
+                changed_keys.add(key)
+
+    def forget(self, key):
+        self.generation += 1
+        self._key_generations.pop(key, None)
+        for changed_keys in self._subscribers:
+            changed_keys.add(key)
+
+    def __len__(self):
+        return len(self._key_generations)
+
+    def get(self, key):
+        return self._key_generations.get(key, 0)
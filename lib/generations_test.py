@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.generations import Generations
+
+
+class TestGenerations(unittest.TestCase):
+    def test_touch(self):
+        generations = Generations()
+        self.assertEqual(generations.generation, 0)
+        self.assertEqual(generations.get((1, 2)), 0)
+
+        generations.touch((1, 2))
+        generations.touch((2, 1))
+
+        self.assertEqual(generations.generation, 2)
+        self.assertEqual(generations.get((1, 2)), 1)
+        self.assertEqual(generations.get((2, 1)), 2)
+
+    def test_touch__no_key(self):
+        generations = Generations()
+
+        generations.touch()
+
+        self.assertEqual(generations.generation, 1)
+        self.assertEqual(generations.get(None), 0)
+
+    def test_forget(self):
+        generations = Generations()
+        generations.touch((1, 2))
+
+        generations.forget((1, 2))
+        generations.forget((3, 4))
+
+        self.assertEqual(generations.generation, 3)
+        self.assertEqual(generations.get((1, 2)), 0)
+        self.assertEqual(len(generations), 0)
+
+    def test_subscribe(self):
+        generations = Generations()
+        generations.touch((1, 2))
+        changed_keys = generations.subscribe()
+
+        generations.touch((2, 1))
+        generations.touch((2, 1))
+        generations.touch()
+        generations.forget((1, 2))
+
+        self.assertSetEqual(changed_keys, {(2, 1), (1, 2)})
+
+
+if __name__ == '__main__':
+    unittest.main()
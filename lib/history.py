@@ -0,0 +1,104 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from array import array
+
+
+class TimeSeries:
+    MAX_OFFSET_MS = 2**32 - 1
+
+    def __init__(self, depth):
+        if depth <= 0:
+            raise ValueError('depth must be positive')
+        self._depth = depth
+        self._epoch = None
+        self._offsets_ms = array('I', bytes(4 * depth))
+        self._values = array('f', bytes(4 * depth))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp, value):
+        if self._epoch is None:
+            self._epoch = timestamp
+        offset_ms = int((timestamp - self._epoch) * 1000)
+        if offset_ms > self.MAX_OFFSET_MS:
+            # keep half of the offset range free so moves stay rare
+            self._move_epoch(offset_ms - self.MAX_OFFSET_MS // 2)
+            offset_ms = int((timestamp - self._epoch) * 1000)
+        self._store(max(offset_ms, 0), value)
+
+    def _store(self, offset_ms, value):
+        self._offsets_ms[self._next] = offset_ms
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self._depth
+        self._size = min(self._size + 1, self._depth)
+
+    def _move_epoch(self, shift_ms):
+        samples = [(offset_ms - shift_ms, value)
+                   for offset_ms, value in self._samples()
+                   if offset_ms >= shift_ms]
+        self._epoch += shift_ms / 1000
+        self._next = 0
+        self._size = 0
+        for offset_ms, value in samples:
+            self._store(offset_ms, value)
+
+    def _samples(self):
+        start = (self._next - self._size) % self._depth
+        for i in range(self._size):
+            idx = (start + i) % self._depth
+            yield self._offsets_ms[idx], self._values[idx]
+
+    def get_series(self, since=None):
+        series = []
+        for offset_ms, value in self._samples():
+            timestamp = self._epoch + offset_ms / 1000
+            if since is not None and timestamp < since:
+                continue
+            series.append((timestamp, value))
+        return series
+
+
+class HistoryRepository:
+    def __init__(self, depth):
+        self._depth = depth
+        self._series = {}
+
+    def add(self, key, timestamp, value):
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = TimeSeries(self._depth)
+        series.append(timestamp, value)
+
+    def __len__(self):
+        return len(self._series)
+
+    def remove(self, key):
+        self._series.pop(key, None)
+
+    def get_series(self, key, since=None):
+        series = self._series.get(key)
+        if series is None:
+            return []
+        return series.get_series(since)
@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.history import TimeSeries, HistoryRepository
+
+
+class TestTimeSeries(unittest.TestCase):
+    def test__init__(self):
+        with self.assertRaises(ValueError):
+            TimeSeries(0)
+
+    def test_append(self):
+        series = TimeSeries(3)
+        series.append(100.0, 1.5)
+        series.append(101.0, 2.5)
+
+        self.assertEqual(len(series), 2)
+        self.assertListEqual(series.get_series(), [(100.0, 1.5),
+                                                  (101.0, 2.5)])
+
+    def test_append__overwrites_oldest(self):
+        series = TimeSeries(3)
+        for i in range(5):
+            series.append(100.0 + i, float(i))
+
+        self.assertEqual(len(series), 3)
+        self.assertListEqual(series.get_series(), [(102.0, 2.0),
+                                                  (103.0, 3.0),
+                                                  (104.0, 4.0)])
+
+    def test_append__millisecond_resolution(self):
+        series = TimeSeries(2)
+        series.append(1586869012.1606, 0.0)
+        series.append(1586869012.9123, 0.0)
+
+        timestamps = [ts for ts, _ in series.get_series()]
+        self.assertAlmostEqual(timestamps[1] - timestamps[0], 0.751, 3)
+
+    def test_get_series__since(self):
+        series = TimeSeries(10)
+        for i in range(5):
+            series.append(100.0 + i, float(i))
+
+        self.assertListEqual(series.get_series(since=103.0), [(103.0, 3.0),
+                                                             (104.0, 4.0)])
+        self.assertListEqual(series.get_series(since=200.0), [])
+
+    def test_append__past_offset_range(self):
+        day = 24 * 3600.0
+        series = TimeSeries(10)
+        series.append(100.0, 0.0)
+        series.append(100.0 + 30 * day, 1.0)
+        series.append(100.0 + 50 * day, 2.0)
+        series.append(100.0 + 51 * day, 3.0)
+
+        self.assertListEqual(series.get_series(),
+                             [(100.0 + 30 * day, 1.0),
+                              (100.0 + 50 * day, 2.0),
+                              (100.0 + 51 * day, 3.0)])
+        self.assertListEqual(series.get_series(since=100.0 + 51 * day - 60),
+                             [(100.0 + 51 * day, 3.0)])
+
+    def test_append__long_gap(self):
+        day = 24 * 3600.0
+        series = TimeSeries(10)
+        series.append(100.0, 0.0)
+        series.append(100.0 + 200 * day, 1.0)
+
+        self.assertListEqual(series.get_series(), [(100.0 + 200 * day, 1.0)])
+
+
+class TestHistoryRepository(unittest.TestCase):
+    def test_add(self):
+        repo = HistoryRepository(2)
+        repo.add((1, 2), 100.0, 1.0)
+        repo.add((1, 2), 101.0, 2.0)
+        repo.add((1, 2), 102.0, 3.0)
+        repo.add((2, 1), 102.0, 4.0)
+
+        self.assertListEqual(repo.get_series((1, 2)), [(101.0, 2.0),
+                                                       (102.0, 3.0)])
+        self.assertListEqual(repo.get_series((2, 1)), [(102.0, 4.0)])
+
+    def test_get_series__no_such_key(self):
+        repo = HistoryRepository(2)
+
+        self.assertListEqual(repo.get_series((1, 2)), [])
+        self.assertListEqual(repo.get_series((1, 2), since=100.0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import collections
+import time
+
+
+class Host:
+    __slots__ = ('ip_address', 'mac_address', 'dpid', 'port_no', 'last_seen')
+
+    def __init__(self, ip_address, mac_address, dpid, port_no, last_seen):
+        self.ip_address = ip_address
+        self.mac_address = mac_address
+        self.dpid = dpid
+        self.port_no = port_no
+        self.last_seen = last_seen
+
+
+class HostTable:
+    def __init__(self, capacity, ttl, clock=time.monotonic):
+        self._capacity = capacity
+        self._ttl = ttl
+        self._clock = clock
+        # least recently seen hosts first
+        self._hosts = collections.OrderedDict()
+        self._ips_by_mac = {}
+        self._ips_by_dpid = {}
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._hosts)
+
+    def learn(self, ip_address, mac_address, dpid, port_no):
+        now = self._clock()
+        self.expire(now)
+        host = self._hosts.get(ip_address)
+        if host is None:
+            host = Host(ip_address, mac_address, dpid, port_no, now)
+            self._hosts[ip_address] = host
+            _index(self._ips_by_mac, mac_address, ip_address)
+            _index(self._ips_by_dpid, dpid, ip_address)
+            while len(self._hosts) > self._capacity:
+                self._remove(next(iter(self._hosts)))
+                self.evictions += 1
+            return host
+        if host.mac_address != mac_address:
+            _unindex(self._ips_by_mac, host.mac_address, ip_address)
+            _index(self._ips_by_mac, mac_address, ip_address)
+            host.mac_address = mac_address
+        if host.dpid != dpid:
+            _unindex(self._ips_by_dpid, host.dpid, ip_address)
+            _index(self._ips_by_dpid, dpid, ip_address)
+            host.dpid = dpid
+        host.port_no = port_no
+        host.last_seen = now
+        self._hosts.move_to_end(ip_address)
+        return host
+
+    def expire(self, now=None):
+        if now is None:
+            now = self._clock()
+        while self._hosts:
+            host = next(iter(self._hosts.values()))
+            if now - host.last_seen < self._ttl:
+                break
+            self._remove(host.ip_address)
+            self.expirations += 1
+
+    def get(self, ip_address):
+        host = self._hosts.get(ip_address)
+        if host is None or self._is_expired(host):
+            return None
+        return host
+
+    def get_age(self, host):
+        return self._clock() - host.last_seen
+
+    def get_all(self):
+        self.expire()
+        return list(self._hosts.values())
+
+    def find_by_mac(self, mac_address):
+        return self._find(self._ips_by_mac.get(mac_address, ()))
+
+    def find_by_dpid(self, dpid):
+        return self._find(self._ips_by_dpid.get(dpid, ()))
+
+    def remove(self, ip_address):
+        if ip_address not in self._hosts:
+            return None
+        return self._remove(ip_address)
+
+    def remove_datapath(self, dpid):
+        return [
+            self._remove(ip_address)
+            for ip_address in list(self._ips_by_dpid.get(dpid, ()))
+        ]
+
+    def _find(self, ip_addresses):
+        hosts = []
+        for ip_address in ip_addresses:
+            host = self._hosts[ip_address]
+            if not self._is_expired(host):
+                hosts.append(host)
+        return hosts
+
+    def _is_expired(self, host):
+        return self._clock() - host.last_seen >= self._ttl
+
+    def _remove(self, ip_address):
+        host = self._hosts.pop(ip_address)
+        _unindex(self._ips_by_mac, host.mac_address, ip_address)
+        _unindex(self._ips_by_dpid, host.dpid, ip_address)
+        return host
+
+
+def _index(index, key, ip_address):
+    ip_addresses = index.get(key)
+    if ip_addresses is None:
+        index[key] = ip_addresses = set()
+    ip_addresses.add(ip_address)
+
+
+def _unindex(index, key, ip_address):
+    ip_addresses = index[key]
+    ip_addresses.discard(ip_address)
+    if not ip_addresses:
+        del index[key]
@@ -0,0 +1,162 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.hosts import HostTable
+from lib.memory import deep_sizeof
+from lib.testing import ClockTestCase
+
+
+class TestHostTable(ClockTestCase):
+    def create_table(self, capacity=16, ttl=60.0):
+        return HostTable(capacity, ttl, self.clock)
+
+    def test_learn(self):
+        table = self.create_table()
+
+        host = table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 3)
+
+        self.assertIs(table.get('10.0.0.1'), host)
+        self.assertEqual(host.mac_address, '00:00:00:00:00:01')
+        self.assertEqual(host.dpid, 1)
+        self.assertEqual(host.port_no, 3)
+        self.assertEqual(len(table), 1)
+        self.assertIsNone(table.get('10.0.0.2'))
+
+    def test_learn__relearn(self):
+        table = self.create_table()
+        table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 3)
+        self.clock.now += 10
+
+        host = table.learn('10.0.0.1', '00:00:00:00:00:02', 2, 4)
+
+        self.assertEqual(len(table), 1)
+        self.assertEqual(host.mac_address, '00:00:00:00:00:02')
+        self.assertEqual((host.dpid, host.port_no), (2, 4))
+        self.assertEqual(host.last_seen, 110.0)
+        self.assertListEqual(table.find_by_mac('00:00:00:00:00:01'), [])
+        self.assertListEqual(table.find_by_mac('00:00:00:00:00:02'), [host])
+        self.assertListEqual(table.find_by_dpid(1), [])
+        self.assertListEqual(table.find_by_dpid(2), [host])
+
+    def test_find_by_mac(self):
+        table = self.create_table()
+        host1 = table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 3)
+        host2 = table.learn('10.0.0.2', '00:00:00:00:00:01', 1, 3)
+        table.learn('10.0.0.3', '00:00:00:00:00:03', 1, 4)
+
+        self.assertCountEqual(table.find_by_mac('00:00:00:00:00:01'),
+                              [host1, host2])
+        self.assertListEqual(table.find_by_mac('00:00:00:00:00:04'), [])
+
+    def test_find_by_dpid(self):
+        table = self.create_table()
+        host1 = table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 3)
+        host2 = table.learn('10.0.0.2', '00:00:00:00:00:02', 1, 4)
+        host3 = table.learn('10.0.0.3', '00:00:00:00:00:03', 2, 1)
+
+        self.assertCountEqual(table.find_by_dpid(1), [host1, host2])
+        self.assertListEqual(table.find_by_dpid(2), [host3])
+        self.assertListEqual(table.find_by_dpid(3), [])
+
+    def test_learn__evicts_least_recently_seen(self):
+        table = self.create_table(capacity=2)
+        table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 1)
+        table.learn('10.0.0.2', '00:00:00:00:00:02', 1, 2)
+        table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 1)
+
+        table.learn('10.0.0.3', '00:00:00:00:00:03', 1, 3)
+
+        self.assertEqual(len(table), 2)
+        self.assertIsNone(table.get('10.0.0.2'))
+        self.assertIsNotNone(table.get('10.0.0.1'))
+        self.assertListEqual(table.find_by_mac('00:00:00:00:00:02'), [])
+        self.assertEqual(table.evictions, 1)
+
+    def test_expire(self):
+        table = self.create_table(ttl=60.0)
+        table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 1)
+        self.clock.now += 30
+        host2 = table.learn('10.0.0.2', '00:00:00:00:00:02', 1, 2)
+        self.clock.now += 30
+
+        self.assertIsNone(table.get('10.0.0.1'))
+        self.assertListEqual(table.find_by_dpid(1), [host2])
+        self.assertEqual(len(table), 2)
+
+        table.expire()
+
+        self.assertEqual(len(table), 1)
+        self.assertEqual(table.expirations, 1)
+        self.assertListEqual(table.get_all(), [host2])
+        self.assertListEqual(table.find_by_mac('00:00:00:00:00:01'), [])
+
+    def test_learn__expires_stale_hosts(self):
+        table = self.create_table(ttl=60.0)
+        table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 1)
+        self.clock.now += 60
+
+        table.learn('10.0.0.2', '00:00:00:00:00:02', 1, 2)
+
+        self.assertEqual(len(table), 1)
+
+    def test_get_age(self):
+        table = self.create_table()
+        host = table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 1)
+        self.clock.now += 2.5
+
+        self.assertEqual(table.get_age(host), 2.5)
+
+    def test_remove(self):
+        table = self.create_table()
+        host = table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 1)
+
+        self.assertIs(table.remove('10.0.0.1'), host)
+        self.assertIsNone(table.remove('10.0.0.1'))
+        self.assertEqual(len(table), 0)
+        self.assertListEqual(table.find_by_dpid(1), [])
+
+    def test_remove_datapath(self):
+        table = self.create_table()
+        host1 = table.learn('10.0.0.1', '00:00:00:00:00:01', 1, 1)
+        host2 = table.learn('10.0.0.2', '00:00:00:00:00:02', 2, 1)
+
+        self.assertListEqual(table.remove_datapath(1), [host1])
+        self.assertListEqual(table.remove_datapath(1), [])
+        self.assertListEqual(table.get_all(), [host2])
+        self.assertListEqual(table.find_by_mac('00:00:00:00:00:01'), [])
+
+    def test_memory__bounded(self):
+        table = self.create_table(capacity=100)
+        for i in range(100):
+            table.learn('10.0.0.' + str(i), '00:00:00:00:00:01', 1, i)
+        size = deep_sizeof(table)
+
+        for i in range(1000):
+            table.learn('10.0.1.' + str(i), '00:00:00:00:00:01', 1, i)
+
+        self.assertEqual(len(table), 100)
+        self.assertLess(deep_sizeof(table), size * 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
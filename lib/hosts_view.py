@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from lib.util import dpid_to_string
+from lib.measurement_repositories import LinkBandwidth, PortRates
+
+
+class HostViewModel:
+    def __init__(self, host, age_sec, port_rates=None):
+        port_rates = port_rates or PortRates()
+        self.ip = host.ip_address
+        self.mac = host.mac_address
+        self.dpid = dpid_to_string(host.dpid)
+        self.port_no = host.port_no
+        self.age_sec = round(age_sec, 3)
+        self.port_rx_bit_per_sec = port_rates.rx_bits_per_sec
+        self.port_tx_bit_per_sec = port_rates.tx_bits_per_sec
+
+
+class PathHopViewModel:
+    def __init__(self, link, delay_ms, plr_percents, link_bandwidth=None):
+        link_bandwidth = link_bandwidth or LinkBandwidth(
+            PortRates(), PortRates())
+        self.src_dpid = dpid_to_string(link.src_dpid)
+        self.src_port_no = link.src_port_no
+        self.dst_dpid = dpid_to_string(link.dst_dpid)
+        self.dst_port_no = link.dst_port_no
+        self.delay_ms = delay_ms
+        self.plr_percents = plr_percents
+        self.bandwidth_bit_per_sec = link_bandwidth.forward_bits_per_sec
+        self.capacity_bit_per_sec = link_bandwidth.capacity
+        self.utilization_percents = \
+            link_bandwidth.forward_utilization_percents()
+
+
+class HostPathViewModel:
+    PERCENTS_100 = 100
+
+    def __init__(self, src_host, dst_host, hops):
+        self.src = src_host
+        self.dst = dst_host
+        self.hops = [hop.__dict__ for hop in hops]
+        self.hop_count = len(hops)
+        self.delay_ms = sum(hop.delay_ms for hop in hops)
+        delivery_ratio = 1.0
+        for hop in hops:
+            delivery_ratio *= 1 - hop.plr_percents / self.PERCENTS_100
+        self.plr_percents = self.PERCENTS_100 * (1 - delivery_ratio)
+        utilizations = [
+            hop.utilization_percents for hop in hops
+            if hop.utilization_percents is not None
+        ]
+        self.max_utilization_percents = max(
+            utilizations) if utilizations else None
+        available = [
+            max(0.0, hop.capacity_bit_per_sec - hop.bandwidth_bit_per_sec)
+            for hop in hops if hop.capacity_bit_per_sec
+        ]
+        self.available_bandwidth_bit_per_sec = min(
+            available) if available else None
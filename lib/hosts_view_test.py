@@ -0,0 +1,117 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.hosts import Host
+from lib.hosts_view import HostViewModel, PathHopViewModel, \
+    HostPathViewModel
+from lib.measurement_repositories import LinkBandwidth, PortRates
+from lib.topology import Link
+
+
+class TestHostViewModel(unittest.TestCase):
+    def test__init__(self):
+        host = Host('10.0.0.1', '00:00:00:00:00:01', 1, 3, 100.0)
+
+        view = HostViewModel(host, 2.5004, PortRates(800.0, 1600.0))
+
+        self.assertDictEqual(
+            view.__dict__, {
+                'ip': '10.0.0.1',
+                'mac': '00:00:00:00:00:01',
+                'dpid': '00:00:00:00:00:00:00:01',
+                'port_no': 3,
+                'age_sec': 2.5,
+                'port_rx_bit_per_sec': 800.0,
+                'port_tx_bit_per_sec': 1600.0
+            })
+
+    def test__init__no_port_rates(self):
+        host = Host('10.0.0.1', '00:00:00:00:00:01', 1, 3, 100.0)
+
+        view = HostViewModel(host, 0.0)
+
+        self.assertEqual(view.port_rx_bit_per_sec, 0.0)
+        self.assertEqual(view.port_tx_bit_per_sec, 0.0)
+
+
+class TestPathHopViewModel(unittest.TestCase):
+    def test__init__(self):
+        link_bandwidth = LinkBandwidth(PortRates(0.0, 300.0),
+                                       PortRates(500.0, 0.0), 1000.0)
+
+        view = PathHopViewModel(Link(1, 2, 3, 4), 1.5, 0.5, link_bandwidth)
+
+        self.assertDictEqual(
+            view.__dict__, {
+                'src_dpid': '00:00:00:00:00:00:00:01',
+                'src_port_no': 2,
+                'dst_dpid': '00:00:00:00:00:00:00:03',
+                'dst_port_no': 4,
+                'delay_ms': 1.5,
+                'plr_percents': 0.5,
+                'bandwidth_bit_per_sec': 400.0,
+                'capacity_bit_per_sec': 1000.0,
+                'utilization_percents': 40.0
+            })
+
+
+class TestHostPathViewModel(unittest.TestCase):
+    def test__init__(self):
+        hops = [
+            PathHopViewModel(
+                Link(1, 2, 2, 1), 1.5, 10.0,
+                LinkBandwidth(PortRates(0.0, 400.0), PortRates(400.0, 0.0),
+                              1000.0)),
+            PathHopViewModel(
+                Link(2, 3, 3, 2), 2.0, 50.0,
+                LinkBandwidth(PortRates(0.0, 100.0), PortRates(100.0, 0.0),
+                              200.0)),
+            PathHopViewModel(Link(3, 4, 4, 3), 0.5, 0.0)
+        ]
+
+        view = HostPathViewModel({'ip': '10.0.0.1'}, {'ip': '10.0.0.2'},
+                                 hops)
+
+        self.assertEqual(view.src, {'ip': '10.0.0.1'})
+        self.assertEqual(view.dst, {'ip': '10.0.0.2'})
+        self.assertEqual(len(view.hops), 3)
+        self.assertEqual(view.hops[0]['src_dpid'],
+                         '00:00:00:00:00:00:00:01')
+        self.assertEqual(view.hop_count, 3)
+        self.assertEqual(view.delay_ms, 4.0)
+        self.assertAlmostEqual(view.plr_percents, 55.0)
+        self.assertEqual(view.max_utilization_percents, 50.0)
+        self.assertEqual(view.available_bandwidth_bit_per_sec, 100.0)
+
+    def test__init__same_datapath(self):
+        view = HostPathViewModel({}, {}, [])
+
+        self.assertListEqual(view.hops, [])
+        self.assertEqual(view.delay_ms, 0)
+        self.assertEqual(view.plr_percents, 0.0)
+        self.assertIsNone(view.max_utilization_percents)
+        self.assertIsNone(view.available_bandwidth_bit_per_sec)
+
+
+if __name__ == '__main__':
+    unittest.main()
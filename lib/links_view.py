@@ -0,0 +1,193 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import json
+import os
+
+from lib.util import dpid_to_string
+from lib.estimators import LatencySummary
+from lib.measurement_repositories import LinkBandwidth, PortRates
+
+
+class LinkViewModel:
+    def __init__(self,
+                 src_dpid,
+                 dst_dpid,
+                 delay_ms,
+                 bandwidth_bit_per_sec,
+                 plr_percents,
+                 delay_summary_ms=None,
+                 probe_plr_percents=0.0,
+                 probe_duplicates=0,
+                 probe_reordered=0,
+                 link_bandwidth=None):
+        self.src_dpid = dpid_to_string(src_dpid)
+        self.dst_dpid = dpid_to_string(dst_dpid)
+        self.delay_ms = delay_ms
+        self.bandwidth_bit_per_sec = bandwidth_bit_per_sec
+        self.plr_percents = plr_percents
+        delay_summary_ms = delay_summary_ms or LatencySummary()
+        self.delay_ewma_ms = delay_summary_ms.ewma
+        self.delay_min_ms = delay_summary_ms.min
+        self.delay_max_ms = delay_summary_ms.max
+        self.delay_p50_ms = delay_summary_ms.p50
+        self.delay_p95_ms = delay_summary_ms.p95
+        self.delay_p99_ms = delay_summary_ms.p99
+        self.probe_plr_percents = probe_plr_percents
+        self.probe_duplicates = probe_duplicates
+        self.probe_reordered = probe_reordered
+        link_bandwidth = link_bandwidth or LinkBandwidth(
+            PortRates(), PortRates())
+        self.forward_bandwidth_bit_per_sec = \
+            link_bandwidth.forward_bits_per_sec
+        self.reverse_bandwidth_bit_per_sec = \
+            link_bandwidth.reverse_bits_per_sec
+        self.forward_utilization_percents = \
+            link_bandwidth.forward_utilization_percents()
+        self.reverse_utilization_percents = \
+            link_bandwidth.reverse_utilization_percents()
+
+
+class LinkHistoryViewModel:
+    def __init__(self, src_dpid, dst_dpid, window_sec, latency_ms,
+                 reverse_latency_ms, src_port_bandwidth_bit_per_sec,
+                 dst_port_bandwidth_bit_per_sec, src_port_plr_percents,
+                 dst_port_plr_percents):
+        self.src_dpid = dpid_to_string(src_dpid)
+        self.dst_dpid = dpid_to_string(dst_dpid)
+        self.window_sec = window_sec
+        self.latency_ms = _series_to_list(latency_ms)
+        self.reverse_latency_ms = _series_to_list(reverse_latency_ms)
+        self.src_port_bandwidth_bit_per_sec = _series_to_list(
+            src_port_bandwidth_bit_per_sec)
+        self.dst_port_bandwidth_bit_per_sec = _series_to_list(
+            dst_port_bandwidth_bit_per_sec)
+        self.src_port_plr_percents = _series_to_list(src_port_plr_percents)
+        self.dst_port_plr_percents = _series_to_list(dst_port_plr_percents)
+
+
+def _series_to_list(series, ndigits=3):
+    return [[round(timestamp, ndigits),
+             round(value, ndigits)] for timestamp, value in series]
+
+
+class FlowViewModel:
+    def __init__(self, flow):
+        self.table_id = flow.flow_key.table_id
+        self.priority = flow.flow_key.priority
+        self.cookie = flow.flow_key.cookie
+        self.match = dict(flow.flow_key.match_fields)
+        self.bit_per_sec = round(8 * flow.bytes_per_sec, 3)
+        self.packet_per_sec = round(flow.packets_per_sec, 3)
+
+
+class LinksSnapshot:
+    def __init__(self, views, body, etag):
+        self.views = views
+        self.body = body
+        self.etag = etag
+
+
+class _CachedLinkView:
+    def __init__(self, link, view):
+        self.link = link
+        self.view = view
+        self.encoded = json.dumps(view).encode()
+
+
+KEY_DATAPATH = 'datapath'
+KEY_DATAPATH_PAIR = 'datapath_pair'
+KEY_PORT = 'port'
+
+
+class LinksViewCache:
+    JSON_DELIMETER = b', '
+
+    def __init__(self, link_repository, repositories, create_link_view):
+        self._link_repository = link_repository
+        self._changed_keys = [(repository.generations.subscribe(), key_type)
+                              for repository, key_type in repositories]
+        self._create_link_view = create_link_view
+        self._topology_generation = None
+        self._link_views = {}
+        self._snapshot = None
+        # tells apart the etags of two controller runs
+        self._etag_prefix = os.urandom(4).hex()
+        self._version = 0
+
+    def get_snapshot(self):
+        dirty_pairs = set()
+        for changed_keys, key_type in self._changed_keys:
+            for key in changed_keys:
+                dirty_pairs.update(self._find_dpid_pairs(key_type, key))
+            changed_keys.clear()
+
+        changed = self._update_links(dirty_pairs)
+        for pair in dirty_pairs:
+            cached = self._link_views.get(pair)
+            if cached is None:
+                continue
+            updated = _CachedLinkView(cached.link,
+                                      self._create_link_view(cached.link))
+            if updated.encoded != cached.encoded:
+                self._link_views[pair] = updated
+                changed = True
+
+        if changed or self._snapshot is None:
+            self._version += 1
+            self._snapshot = LinksSnapshot(
+                [cached.view for cached in self._link_views.values()],
+                b'[' + self.JSON_DELIMETER.join(
+                    cached.encoded
+                    for cached in self._link_views.values()) + b']',
+                '{0}-{1}'.format(self._etag_prefix, self._version))
+        return self._snapshot
+
+    def _update_links(self, dirty_pairs):
+        generation = self._link_repository.generations.generation
+        if generation == self._topology_generation:
+            return False
+        self._topology_generation = generation
+        link_views = {}
+        for link in self._link_repository.find_bidirectional_links():
+            pair = _dpid_pair(link.src_dpid, link.dst_dpid)
+            cached = self._link_views.get(pair)
+            if cached is None or cached.link is not link:
+                cached = _CachedLinkView(link, self._create_link_view(link))
+                dirty_pairs.discard(pair)
+            link_views[pair] = cached
+        self._link_views = link_views
+        return True
+
+    def _find_dpid_pairs(self, key_type, key):
+        if key_type == KEY_DATAPATH:
+            return [
+                _dpid_pair(key, neighbor)
+                for neighbor in self._link_repository.get_neighbors(key)
+            ]
+        if key_type == KEY_PORT:
+            peer = self._link_repository.get_peer(*key)
+            return [] if peer is None else [_dpid_pair(key[0], peer[0])]
+        return [_dpid_pair(*key)]
+
+
+def _dpid_pair(dpid1, dpid2):
+    return (dpid1, dpid2) if dpid1 < dpid2 else (dpid2, dpid1)
@@ -0,0 +1,237 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+import json
+
+from lib.links_view import LinkViewModel, LinkHistoryViewModel, \
+    FlowViewModel, LinksViewCache, KEY_DATAPATH, KEY_PORT
+from lib.topology import Link, LinkRepository
+from lib.estimators import LatencySummary
+from lib.flow_stats import FlowKey, FlowRate
+from lib.measurement_repositories import PortStatsRepository, \
+    PlrPortMeasurementData, LinkBandwidth, PortRates, \
+    DatapathResponseTimeRepository
+
+
+class TestLinkViewModel(unittest.TestCase):
+    def test__init__(self):
+        view = LinkViewModel(1, 2, 1.5, 96.0, 0.0)
+
+        self.assertDictEqual(
+            view.__dict__, {
+                'src_dpid': '00:00:00:00:00:00:00:01',
+                'dst_dpid': '00:00:00:00:00:00:00:02',
+                'delay_ms': 1.5,
+                'bandwidth_bit_per_sec': 96.0,
+                'plr_percents': 0.0,
+                'delay_ewma_ms': None,
+                'delay_min_ms': None,
+                'delay_max_ms': None,
+                'delay_p50_ms': None,
+                'delay_p95_ms': None,
+                'delay_p99_ms': None,
+                'probe_plr_percents': 0.0,
+                'probe_duplicates': 0,
+                'probe_reordered': 0,
+                'forward_bandwidth_bit_per_sec': 0.0,
+                'reverse_bandwidth_bit_per_sec': 0.0,
+                'forward_utilization_percents': None,
+                'reverse_utilization_percents': None
+            })
+
+    def test__init__link_bandwidth(self):
+        view = LinkViewModel(
+            1, 2, 1.5, 96.0, 0.0, link_bandwidth=LinkBandwidth(
+                PortRates(100.0, 900.0), PortRates(1100.0, 300.0), 10000))
+
+        self.assertEqual(view.forward_bandwidth_bit_per_sec, 1000.0)
+        self.assertEqual(view.reverse_bandwidth_bit_per_sec, 200.0)
+        self.assertEqual(view.forward_utilization_percents, 10.0)
+        self.assertEqual(view.reverse_utilization_percents, 2.0)
+
+    def test__init__delay_summary(self):
+        view = LinkViewModel(1, 2, 1.5, 96.0, 0.0,
+                             LatencySummary(1.4, 1.0, 3.0, 1.5, 2.5, 2.9))
+
+        self.assertEqual(view.delay_ewma_ms, 1.4)
+        self.assertEqual(view.delay_min_ms, 1.0)
+        self.assertEqual(view.delay_max_ms, 3.0)
+        self.assertEqual(view.delay_p50_ms, 1.5)
+        self.assertEqual(view.delay_p95_ms, 2.5)
+        self.assertEqual(view.delay_p99_ms, 2.9)
+
+
+class TestLinkHistoryViewModel(unittest.TestCase):
+    def test__init__(self):
+        view = LinkHistoryViewModel(1, 2, 60.0, [(100.0, 1.2345678)],
+                                    [(100.5, 1.5)], [], [], [(101.0, 0.0)],
+                                    [])
+
+        self.assertEqual(view.src_dpid, '00:00:00:00:00:00:00:01')
+        self.assertEqual(view.dst_dpid, '00:00:00:00:00:00:00:02')
+        self.assertEqual(view.window_sec, 60.0)
+        self.assertListEqual(view.latency_ms, [[100.0, 1.235]])
+        self.assertListEqual(view.reverse_latency_ms, [[100.5, 1.5]])
+        self.assertListEqual(view.src_port_bandwidth_bit_per_sec, [])
+        self.assertListEqual(view.src_port_plr_percents, [[101.0, 0.0]])
+
+
+class TestFlowViewModel(unittest.TestCase):
+    def test__init__(self):
+        flow = FlowRate(FlowKey(0, 10, 5, [('in_port', 1)]), 1000, 3, 3.0, 1)
+
+        view = FlowViewModel(flow)
+
+        self.assertDictEqual(
+            view.__dict__, {
+                'table_id': 0,
+                'priority': 10,
+                'cookie': 5,
+                'match': {
+                    'in_port': 1
+                },
+                'bit_per_sec': 2666.667,
+                'packet_per_sec': 1.0
+            })
+
+
+class TestLinksViewCache(unittest.TestCase):
+    def setUp(self):
+        self.link_repository = LinkRepository()
+        self.plr_repository = PortStatsRepository()
+        self.timing_repository = DatapathResponseTimeRepository()
+        self.created_views = []
+
+        def create_link_view(link):
+            self.created_views.append(link)
+            return LinkViewModel(
+                link.src_dpid, link.dst_dpid,
+                self.timing_repository.get_response_time(
+                    link.src_dpid).milliseconds(), 0.0,
+                self.plr_repository.get_stats(link.src_dpid,
+                                              link.src_port_no)).__dict__
+
+        self.cache = LinksViewCache(
+            self.link_repository, [(self.plr_repository, KEY_PORT),
+                                   (self.timing_repository, KEY_DATAPATH)],
+            create_link_view)
+
+    def register_bidirectional_link(self, dpid1, port1, dpid2, port2):
+        self.link_repository.register_link(dpid1, port1, dpid2, port2)
+        self.link_repository.register_link(dpid2, port2, dpid1, port1)
+
+    def test_get_snapshot__empty(self):
+        snapshot = self.cache.get_snapshot()
+
+        self.assertEqual(snapshot.views, [])
+        self.assertEqual(snapshot.body, b'[]')
+
+    def test_get_snapshot(self):
+        self.register_bidirectional_link(1, 19, 2, 24)
+        self.register_bidirectional_link(2, 21, 3, 9)
+
+        snapshot = self.cache.get_snapshot()
+
+        self.assertEqual(json.loads(snapshot.body.decode()), snapshot.views)
+        self.assertEqual(snapshot.body, json.dumps(snapshot.views).encode())
+        self.assertEqual(len(snapshot.views), 2)
+
+    def test_get_snapshot__unchanged(self):
+        self.register_bidirectional_link(1, 19, 2, 24)
+
+        snapshot1 = self.cache.get_snapshot()
+        snapshot2 = self.cache.get_snapshot()
+
+        self.assertIs(snapshot1, snapshot2)
+        self.assertEqual(len(self.created_views), 1)
+
+    def test_get_snapshot__only_dirty_links_recomputed(self):
+        self.register_bidirectional_link(1, 19, 2, 24)
+        self.register_bidirectional_link(2, 21, 3, 9)
+        snapshot1 = self.cache.get_snapshot()
+        self.created_views = []
+
+        self.plr_repository.add_stats(3, 9,
+                                      PlrPortMeasurementData(40, 60, 10, 5))
+        self.plr_repository.add_stats(3, 9,
+                                      PlrPortMeasurementData(80, 120, 20, 10))
+        snapshot2 = self.cache.get_snapshot()
+
+        self.assertListEqual(self.created_views, [Link(3, 9, 2, 21)])
+        self.assertNotEqual(snapshot1.etag, snapshot2.etag)
+        self.assertEqual(snapshot2.views[1]['plr_percents'], 15.0)
+
+    def test_get_snapshot__new_link(self):
+        self.register_bidirectional_link(1, 19, 2, 24)
+        snapshot1 = self.cache.get_snapshot()
+
+        self.register_bidirectional_link(2, 21, 3, 9)
+        snapshot2 = self.cache.get_snapshot()
+
+        self.assertEqual(len(snapshot1.views), 1)
+        self.assertEqual(len(snapshot2.views), 2)
+        self.assertEqual(len(self.created_views), 2)
+        self.assertNotEqual(snapshot1.etag, snapshot2.etag)
+
+    def test_get_snapshot__removed_link(self):
+        self.register_bidirectional_link(1, 19, 2, 24)
+        self.register_bidirectional_link(2, 21, 3, 9)
+        self.cache.get_snapshot()
+
+        self.link_repository.unregister_link(3, 9, 2, 21)
+        snapshot = self.cache.get_snapshot()
+
+        self.assertEqual(len(snapshot.views), 1)
+        self.assertEqual(len(self.created_views), 2)
+
+    def test_get_snapshot__datapath_key(self):
+        self.register_bidirectional_link(1, 19, 2, 24)
+        self.register_bidirectional_link(2, 21, 3, 9)
+        self.register_bidirectional_link(3, 5, 4, 6)
+        self.cache.get_snapshot()
+        self.created_views = []
+
+        self.timing_repository.add_response_time(2, 0.004)
+        snapshot = self.cache.get_snapshot()
+
+        self.assertCountEqual(self.created_views,
+                              [Link(2, 24, 1, 19), Link(3, 9, 2, 21)])
+        self.assertEqual(snapshot.views[0]['delay_ms'], 4.0)
+
+    def test_get_snapshot__unchanged_view(self):
+        self.register_bidirectional_link(1, 19, 2, 24)
+        snapshot1 = self.cache.get_snapshot()
+
+        # the view does not depend on the port 19 stats
+        self.plr_repository.add_stats(1, 19,
+                                      PlrPortMeasurementData(40, 60, 10, 5))
+        self.plr_repository.add_stats(1, 19,
+                                      PlrPortMeasurementData(80, 120, 20, 10))
+        snapshot2 = self.cache.get_snapshot()
+
+        self.assertEqual(len(self.created_views), 2)
+        self.assertIs(snapshot1, snapshot2)
+
+
+if __name__ == '__main__':
+    unittest.main()
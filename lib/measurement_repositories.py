@@ -21,45 +21,122 @@
 #
 import time
 import math
+import collections
 
 from lib.time_units import TimeStamp, TimeDelta
 from lib.packets import ReceivedTestPacket
+from lib.generations import Generations
+from lib.history import HistoryRepository
+from lib.estimators import Ewma, LatencyEstimator
+from lib.probe_loss import ProbeLossTracker
 
 
 class DatapathTimings:
-    def __init__(self):
-        self._response_time = TimeDelta(0.0)
-        self._send_ts = TimeStamp(0.0)
+    SRTT_ALPHA = 0.125
+    RTTVAR_BETA = 0.25
+
+    def __init__(self, max_in_flight=64, timeout=5.0):
+        self._max_in_flight = max_in_flight
+        self._timeout = timeout
+        self._in_flight = {}
+        self._srtt = Ewma(self.SRTT_ALPHA)
+        self._rttvar = Ewma(self.RTTVAR_BETA)
+        self.last_response_time = None
+        self.min_response_time = None
+        self.timeouts = 0
 
     def get_response_time(self):
-        return self._response_time
+        return TimeDelta(self._srtt.value or 0.0)
+
+    def get_response_time_variation(self):
+        return TimeDelta(self._rttvar.value or 0.0)
+
+    def get_in_flight(self):
+        return len(self._in_flight)
+
+    def write_send_time(self, xid, now):
+        self._expire(now)
+        if len(self._in_flight) >= self._max_in_flight:
+            del self._in_flight[next(iter(self._in_flight))]
+            self.timeouts += 1
+        self._in_flight.pop(xid, None)
+        self._in_flight[xid] = now
 
-    def write_send_time(self):
-        self._send_ts = TimeStamp(time.time())
+    def write_receive_time(self, xid, now):
+        send_ts = self._in_flight.pop(xid, None)
+        if send_ts is None:
+            return False
+        self.add_response_time(now - send_ts)
+        return True
 
-    def write_receive_time(self):
-        receive_ts = TimeStamp(time.time())
-        self._response_time = receive_ts - self._send_ts
-        self._send_ts = TimeStamp(0.0)
+    def add_response_time(self, response_time):
+        if self._srtt.value is not None:
+            self._rttvar.update(abs(response_time - self._srtt.value))
+        self._srtt.update(response_time)
+        self.last_response_time = response_time
+        if self.min_response_time is None or \
+                response_time < self.min_response_time:
+            self.min_response_time = response_time
+
+    def _expire(self, now):
+        while self._in_flight:
+            xid = next(iter(self._in_flight))
+            if self._in_flight[xid] + self._timeout > now:
+                return
+            del self._in_flight[xid]
+            self.timeouts += 1
 
 
 class DatapathResponseTimeRepository:
-    def __init__(self):
+    def __init__(self, max_in_flight=64, timeout=5.0, clock=time.monotonic):
         self._timings = {}
+        self._max_in_flight = max_in_flight
+        self._timeout = timeout
+        self._clock = clock
+        self.generations = Generations()
 
-    def write_send_time(self, dpid):
-        self._timings.setdefault(dpid, DatapathTimings()).write_send_time()
+    def write_send_time(self, dpid, xid=None):
+        timings = self._timings.get(dpid)
+        if timings is None:
+            timings = self._timings[dpid] = DatapathTimings(
+                self._max_in_flight, self._timeout)
+        timings.write_send_time(xid, self._clock())
 
-    def write_receive_time(self, dpid):
+    def write_receive_time(self, dpid, xid=None):
         try:
-            self._timings[dpid].write_receive_time()
+            timings = self._timings[dpid]
         except KeyError:
             raise KeyError("dpid " + str(dpid) +
                            " is not in datapath time repository")
+        if timings.write_receive_time(xid, self._clock()):
+            self.generations.touch(dpid)
+
+    def add_response_time(self, dpid, response_time):
+        timings = self._timings.get(dpid)
+        if timings is None:
+            timings = self._timings[dpid] = DatapathTimings(
+                self._max_in_flight, self._timeout)
+        timings.add_response_time(response_time)
+        self.generations.touch(dpid)
+
+    def __len__(self):
+        return len(self._timings)
+
+    def remove_datapath(self, dpid):
+        if self._timings.pop(dpid, None) is not None:
+            self.generations.forget(dpid)
+
+    def get_timings(self, dpid):
+        return self._timings.get(dpid)
+
+    def get_dpids(self):
+        return self._timings.keys()
 
     def get_response_time(self, dpid):
-        return self._timings.setdefault(dpid,
-                                        DatapathTimings()).get_response_time()
+        timings = self._timings.get(dpid)
+        if timings is None:
+            return TimeDelta(0.0)
+        return timings.get_response_time()
 
     def __str__(self):
         s = ''
@@ -70,17 +147,63 @@ class DatapathResponseTimeRepository:
 
 
 class LinkLatencyRepository:
-    def __init__(self):
+    def __init__(self, history_depth=None, ewma_alpha=0.125):
         self._latencies = {}
+        self._estimators = {}
+        self._ewma_alpha = ewma_alpha
+        self.generations = Generations()
+        self._history = HistoryRepository(
+            history_depth) if history_depth else None
 
     def parse_test_packet(self, rpkt):
         src_dpid, dst_dpid = rpkt.src_dpid, rpkt.dst_dpid
         latency = rpkt.receive_ts - rpkt.send_ts
         self._latencies.setdefault(src_dpid, {})[dst_dpid] = latency
+        estimator = self._estimators.get((src_dpid, dst_dpid))
+        if estimator is None:
+            estimator = self._estimators[(src_dpid, dst_dpid)] = \
+                LatencyEstimator(self._ewma_alpha)
+        estimator.update(latency.milliseconds())
+        self.generations.touch((src_dpid, dst_dpid))
+        if self._history is not None:
+            self._history.add((src_dpid, dst_dpid), rpkt.receive_ts.seconds(),
+                              latency.milliseconds())
+
+    def __len__(self):
+        return len(self._estimators)
+
+    def remove_datapath(self, dpid):
+        self._latencies.pop(dpid, None)
+        for latencies in self._latencies.values():
+            latencies.pop(dpid, None)
+        for key in [key for key in self._estimators if dpid in key]:
+            self.remove_link(*key)
+
+    def remove_link(self, src_dpid, dst_dpid):
+        self._latencies.get(src_dpid, {}).pop(dst_dpid, None)
+        if self._estimators.pop((src_dpid, dst_dpid), None) is None:
+            return
+        self.generations.forget((src_dpid, dst_dpid))
+        if self._history is not None:
+            self._history.remove((src_dpid, dst_dpid))
+
+    def get_latency_estimator(self, src_dpid, dst_dpid):
+        return self._estimators.get((src_dpid, dst_dpid))
+
+    def get_link_latency_estimator(self, dpid1, dpid2):
+        estimator = LatencyEstimator(self._ewma_alpha)
+        for key in ((dpid1, dpid2), (dpid2, dpid1)):
+            if key in self._estimators:
+                estimator = estimator.merge(self._estimators[key])
+        return estimator
+
+    def get_latency_history(self, src_dpid, dst_dpid, since=None):
+        if self._history is None:
+            return []
+        return self._history.get_series((src_dpid, dst_dpid), since)
 
     def get_latency_between(self, dpid1, dpid2):
-        return self._latencies.setdefault(dpid1, {}).setdefault(
-            dpid2, TimeDelta(0.0))
+        return self._latencies.get(dpid1, {}).get(dpid2, TimeDelta(0.0))
 
     def __str__(self):
         repr = ''
@@ -91,21 +214,164 @@ class LinkLatencyRepository:
         return repr
 
 
+class ProbeLossRepository:
+    def __init__(self, window=1024, timeout=2.0):
+        self._window = window
+        self._timeout = timeout
+        self._trackers = {}
+        self.generations = Generations()
+
+    def record_sent(self, dpid, port_no, now):
+        tracker = self._trackers.get((dpid, port_no))
+        if tracker is None:
+            tracker = self._trackers[(dpid, port_no)] = ProbeLossTracker(
+                self._window, self._timeout)
+        lost = tracker.lost
+        seq_num = tracker.record_sent(now)
+        if tracker.lost != lost:
+            self.generations.touch((dpid, port_no))
+        return seq_num
+
+    def parse_test_packet(self, rpkt):
+        tracker = self._trackers.get((rpkt.src_dpid, rpkt.src_port_no))
+        if tracker is None:
+            return
+        tracker.record_received(rpkt.seq_num)
+        self.generations.touch((rpkt.src_dpid, rpkt.src_port_no))
+
+    def __len__(self):
+        return len(self._trackers)
+
+    def remove_datapath(self, dpid):
+        for key in [key for key in self._trackers if key[0] == dpid]:
+            self.remove_port(*key)
+
+    def remove_port(self, dpid, port_no):
+        if self._trackers.pop((dpid, port_no), None) is not None:
+            self.generations.forget((dpid, port_no))
+
+    def get_tracker(self, dpid, port_no):
+        return self._trackers.get((dpid, port_no))
+
+    def __str__(self):
+        s = ''
+        for (dpid, port_no), tracker in self._trackers.items():
+            s += '[{0}][{1}] sent={2} received={3} lost={4}\n'.format(
+                dpid, port_no, tracker.sent, tracker.received, tracker.lost)
+        return s
+
+
+COUNTER_WIDTHS = (32, 64)
+# largest step read as a counter wrap when the port speed is unknown
+MAX_WRAP_DELTA = 1 << 28
+
+RESET_DURATION = 'duration'
+RESET_COUNTER = 'counter'
+
+
+def counter_delta(previous, current, max_delta=None):
+    if current >= previous:
+        return current - previous
+    for width in COUNTER_WIDTHS:
+        modulus = 1 << width
+        delta = current + modulus - previous
+        limit = modulus // 2 if max_delta is None else max_delta
+        if previous < modulus and delta <= limit:
+            return delta
+    return None
+
+
+class CounterReset:
+    def __init__(self, dpid, port_no, reason, ts):
+        self.dpid = dpid
+        self.port_no = port_no
+        self.reason = reason
+        self.ts = ts
+
+
+class PortRates:
+    __slots__ = ('rx_bits_per_sec', 'tx_bits_per_sec')
+
+    def __init__(self, rx_bits_per_sec=0.0, tx_bits_per_sec=0.0):
+        self.rx_bits_per_sec = rx_bits_per_sec
+        self.tx_bits_per_sec = tx_bits_per_sec
+
+    def total(self):
+        return self.rx_bits_per_sec + self.tx_bits_per_sec
+
+    def __float__(self):
+        return float(self.total())
+
+    def __eq__(self, other):
+        return isinstance(other, PortRates) and \
+            self.rx_bits_per_sec == other.rx_bits_per_sec and \
+            self.tx_bits_per_sec == other.tx_bits_per_sec
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'PortRates(rx={0}, tx={1})'.format(self.rx_bits_per_sec,
+                                                  self.tx_bits_per_sec)
+
+
+class LinkBandwidth:
+    PERCENTS_100 = 100
+
+    def __init__(self, src_port_rates, dst_port_rates, capacity=None):
+        self.forward_bits_per_sec = (src_port_rates.tx_bits_per_sec +
+                                     dst_port_rates.rx_bits_per_sec) / 2
+        self.reverse_bits_per_sec = (src_port_rates.rx_bits_per_sec +
+                                     dst_port_rates.tx_bits_per_sec) / 2
+        self.capacity = capacity
+
+    def forward_utilization_percents(self):
+        return self._utilization_percents(self.forward_bits_per_sec)
+
+    def reverse_utilization_percents(self):
+        return self._utilization_percents(self.reverse_bits_per_sec)
+
+    def _utilization_percents(self, bits_per_sec):
+        if not self.capacity:
+            return None
+        return self.PERCENTS_100 * bits_per_sec / self.capacity
+
+
 class BandwidthPortMeasurementData:
+    __slots__ = ('_duration', '_bytes_received', '_bytes_transferred')
+
     def __init__(self, switch_uptime_sec, switch_uptime_nsec, bytes_received,
                  bytes_transferred):
-        self._measurement_ts = TimeStamp(switch_uptime_sec +
-                                         switch_uptime_nsec * 1e-9)
-        self._bits_through = 8 * (bytes_received + bytes_transferred)
+        self._duration = switch_uptime_sec + switch_uptime_nsec * 1e-9
+        self._bytes_received = bytes_received
+        self._bytes_transferred = bytes_transferred
 
-    def __sub__(self, new):
-        time_delta = (self._measurement_ts - new._measurement_ts).seconds()
-        if time_delta == 0:
-            return 0
-        return (self._bits_through - new._bits_through) / time_delta
+    def find_reset(self, previous, speed=None):
+        if self._duration < previous._duration:
+            return RESET_DURATION
+        max_bytes = MAX_WRAP_DELTA if speed is None else \
+            speed * (self._duration - previous._duration) / 8
+        if counter_delta(previous._bytes_received, self._bytes_received,
+                         max_bytes) is None or \
+                counter_delta(previous._bytes_transferred,
+                              self._bytes_transferred, max_bytes) is None:
+            return RESET_COUNTER
+        return None
+
+    def __sub__(self, previous):
+        time_delta = self._duration - previous._duration
+        if time_delta <= 0:
+            return PortRates()
+        bytes_received = counter_delta(previous._bytes_received,
+                                       self._bytes_received) or 0
+        bytes_transferred = counter_delta(previous._bytes_transferred,
+                                          self._bytes_transferred) or 0
+        return PortRates(8 * bytes_received / time_delta,
+                         8 * bytes_transferred / time_delta)
 
 
 class PlrPortMeasurementData:
+    __slots__ = ('_packets_through', '_errors')
 
     PERCENTS_100 = 100
 
@@ -119,28 +385,128 @@ class PlrPortMeasurementData:
         self._packets_through = packets_received + packets_transferred
         self._errors = receive_errors + transfer_errors
 
-    def __sub__(self, new):
-        packets_delta = new._packets_through - self._packets_through
-        errors_delta = new._errors - self._errors
-        if packets_delta == 0 or errors_delta == 0:
+    def find_reset(self, previous, speed=None):
+        if counter_delta(previous._packets_through, self._packets_through,
+                         MAX_WRAP_DELTA) is None or \
+                counter_delta(previous._errors, self._errors,
+                              MAX_WRAP_DELTA) is None:
+            return RESET_COUNTER
+        return None
+
+    def __sub__(self, previous):
+        packets_delta = counter_delta(previous._packets_through,
+                                      self._packets_through)
+        errors_delta = counter_delta(previous._errors, self._errors)
+        if not packets_delta or not errors_delta:
             return 0
         return self.PERCENTS_100 * (errors_delta / packets_delta)
 
 
-class PortStatsRepository:
+class PortSpeedRepository:
     def __init__(self):
+        self._speeds = {}
+        self.generations = Generations()
+
+    def set_speed(self, dpid, port_no, speed_kbps):
+        if not speed_kbps:
+            self.remove_port(dpid, port_no)
+            return
+        bits_per_sec = speed_kbps * 1000
+        if self._speeds.get((dpid, port_no)) != bits_per_sec:
+            self._speeds[(dpid, port_no)] = bits_per_sec
+            self.generations.touch((dpid, port_no))
+
+    def remove_port(self, dpid, port_no):
+        if self._speeds.pop((dpid, port_no), None) is not None:
+            self.generations.touch((dpid, port_no))
+
+    def __len__(self):
+        return len(self._speeds)
+
+    def remove_datapath(self, dpid):
+        for key in [key for key in self._speeds if key[0] == dpid]:
+            del self._speeds[key]
+            self.generations.forget(key)
+
+    def get_speed(self, dpid, port_no):
+        return self._speeds.get((dpid, port_no))
+
+    def get_link_capacity(self, link):
+        speeds = [
+            speed for speed in (self.get_speed(link.src_dpid,
+                                               link.src_port_no),
+                                self.get_speed(link.dst_dpid,
+                                               link.dst_port_no))
+            if speed is not None
+        ]
+        return min(speeds) if speeds else None
+
+
+class PortStatsRepository:
+    MAX_RESETS = 256
+
+    def __init__(self, history_depth=None, empty_stats=0.0,
+                 port_speed_repository=None):
         self._stats = {}
+        self._port_speed_repository = port_speed_repository
         self._last_measurement_data = {}
+        self._empty_stats = empty_stats
+        self.generations = Generations()
+        self.resets = collections.deque(maxlen=self.MAX_RESETS)
+        self.reset_count = 0
+        self._history = HistoryRepository(
+            history_depth) if history_depth else None
 
     def add_stats(self, dpid, port_no, measurement_data):
         last_measurement_data = self._last_measurement_data.setdefault(
-            dpid, {}).setdefault(port_no, None)
-        if not last_measurement_data:
-            self._last_measurement_data[dpid][port_no] = measurement_data
-            return
-        self._stats.setdefault(
-            dpid, {})[port_no] = measurement_data - last_measurement_data
+            dpid, {}).get(port_no)
         self._last_measurement_data[dpid][port_no] = measurement_data
+        if last_measurement_data is None:
+            return None
+        speed = None
+        if self._port_speed_repository is not None:
+            speed = self._port_speed_repository.get_speed(dpid, port_no)
+        reason = measurement_data.find_reset(last_measurement_data, speed)
+        if reason is not None:
+            reset = CounterReset(dpid, port_no, reason, time.time())
+            self.resets.append(reset)
+            self.reset_count += 1
+            return reset
+        stats = measurement_data - last_measurement_data
+        port_stats = self._stats.setdefault(dpid, {})
+        if port_stats.get(port_no) != stats:
+            port_stats[port_no] = stats
+            self.generations.touch((dpid, port_no))
+        if self._history is not None:
+            self._history.add((dpid, port_no), time.time(), float(stats))
+        return None
+
+    def __len__(self):
+        return sum(len(port_data)
+                   for port_data in self._last_measurement_data.values())
+
+    def remove_datapath(self, dpid):
+        for port_no in list(self._last_measurement_data.get(dpid, ())):
+            self.remove_port(dpid, port_no)
+
+    def remove_port(self, dpid, port_no):
+        port_data = self._last_measurement_data.get(dpid, {})
+        if port_data.pop(port_no, None) is None:
+            return
+        if not port_data:
+            del self._last_measurement_data[dpid]
+        port_stats = self._stats.get(dpid, {})
+        port_stats.pop(port_no, None)
+        if not port_stats:
+            self._stats.pop(dpid, None)
+        self.generations.forget((dpid, port_no))
+        if self._history is not None:
+            self._history.remove((dpid, port_no))
 
     def get_stats(self, dpid, port_no):
-        return self._stats.setdefault(dpid, {}).setdefault(port_no, 0.0)
\ No newline at end of file
+        return self._stats.get(dpid, {}).get(port_no, self._empty_stats)
+
+    def get_stats_history(self, dpid, port_no, since=None):
+        if self._history is None:
+            return []
+        return self._history.get_series((dpid, port_no), since)
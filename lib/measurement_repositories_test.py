@@ -23,10 +23,74 @@ import unittest
 
 import time
 
-from lib.measurement_repositories import DatapathResponseTimeRepository, \
-    LinkLatencyRepository, BandwidthPortMeasurementData, PlrPortMeasurementData, PortStatsRepository
+from lib.measurement_repositories import DatapathTimings, DatapathResponseTimeRepository, \
+    LinkLatencyRepository, BandwidthPortMeasurementData, PlrPortMeasurementData, PortStatsRepository, \
+    ProbeLossRepository, PortRates, counter_delta, RESET_DURATION, RESET_COUNTER, \
+    LinkBandwidth, PortSpeedRepository
+from lib.topology import Link
 from lib.packets import ReceivedTestPacket
 from lib.time_units import TimeStamp
+from lib.testing import FakeClock
+
+
+class TestDatapathTimings(unittest.TestCase):
+    def test_write_receive_time(self):
+        timings = DatapathTimings(8, 5.0)
+        timings.write_send_time(1, 100.0)
+        timings.write_send_time(2, 100.5)
+
+        self.assertTrue(timings.write_receive_time(2, 100.75))
+        self.assertTrue(timings.write_receive_time(1, 101.0))
+
+        self.assertEqual(timings.last_response_time, 1.0)
+        self.assertEqual(timings.min_response_time, 0.25)
+        self.assertEqual(timings.get_response_time().seconds(), 0.344)
+        self.assertEqual(timings.get_response_time_variation().seconds(),
+                         0.75)
+        self.assertEqual(timings.get_in_flight(), 0)
+
+    def test_write_receive_time__multipart(self):
+        timings = DatapathTimings(8, 5.0)
+        timings.write_send_time(1, 100.0)
+
+        self.assertTrue(timings.write_receive_time(1, 100.5))
+        self.assertFalse(timings.write_receive_time(1, 103.0))
+        self.assertEqual(timings.get_response_time().seconds(), 0.5)
+
+    def test_add_response_time(self):
+        timings = DatapathTimings()
+        timings.add_response_time(0.002)
+        timings.add_response_time(0.001)
+
+        self.assertEqual(timings.last_response_time, 0.001)
+        self.assertEqual(timings.min_response_time, 0.001)
+        self.assertEqual(timings.get_response_time().milliseconds(), 1.875)
+
+    def test_write_receive_time__unknown_xid(self):
+        timings = DatapathTimings(8, 5.0)
+
+        self.assertFalse(timings.write_receive_time(1, 100.0))
+        self.assertEqual(timings.get_response_time().seconds(), 0.0)
+
+    def test_write_send_time__timeout(self):
+        timings = DatapathTimings(8, 5.0)
+        timings.write_send_time(1, 100.0)
+        timings.write_send_time(2, 103.0)
+
+        timings.write_send_time(3, 105.0)
+
+        self.assertEqual(timings.timeouts, 1)
+        self.assertEqual(timings.get_in_flight(), 2)
+        self.assertFalse(timings.write_receive_time(1, 105.5))
+
+    def test_write_send_time__max_in_flight(self):
+        timings = DatapathTimings(2, 5.0)
+        for xid in range(4):
+            timings.write_send_time(xid, 100.0)
+
+        self.assertEqual(timings.get_in_flight(), 2)
+        self.assertEqual(timings.timeouts, 2)
+        self.assertTrue(timings.write_receive_time(3, 100.5))
 
 
 class TestDatapathResponseTimeRepository(unittest.TestCase):
@@ -51,6 +115,57 @@ class TestDatapathResponseTimeRepository(unittest.TestCase):
         repo = DatapathResponseTimeRepository()
 
         self.assertEqual(repo.get_response_time(1).milliseconds(), 0.0)
+        self.assertEqual(len(repo), 0)
+
+    def test_remove_datapath(self):
+        repo = DatapathResponseTimeRepository()
+        repo.add_response_time(1, 0.001)
+        repo.add_response_time(2, 0.002)
+
+        repo.remove_datapath(1)
+        repo.remove_datapath(3)
+
+        self.assertEqual(len(repo), 1)
+        self.assertIsNone(repo.get_timings(1))
+        self.assertEqual(repo.generations.get(1), 0)
+        self.assertEqual(repo.get_response_time(2).milliseconds(), 2.0)
+
+    def test_write_receive_time__xid(self):
+        clock = FakeClock()
+        repo = DatapathResponseTimeRepository(clock=clock)
+        repo.write_send_time(1, 10)
+        clock.now += 0.002
+        repo.write_send_time(1, 11)
+        clock.now += 0.001
+
+        repo.write_receive_time(1, 11)
+        repo.write_receive_time(1, 11)
+
+        self.assertEqual(repo.get_response_time(1).milliseconds(), 1.0)
+        self.assertEqual(repo.get_timings(1).get_in_flight(), 1)
+        self.assertIsNone(repo.get_timings(2))
+        self.assertListEqual(list(repo.get_dpids()), [1])
+
+    def test_add_response_time(self):
+        repo = DatapathResponseTimeRepository()
+
+        repo.add_response_time(1, 0.002)
+
+        self.assertEqual(repo.get_response_time(1).milliseconds(), 2.0)
+        self.assertEqual(repo.generations.get(1), 1)
+
+    def test_write_receive_time__generations(self):
+        repo = DatapathResponseTimeRepository()
+
+        repo.write_send_time(1)
+        self.assertEqual(repo.generations.get(1), 0)
+
+        repo.write_receive_time(1)
+        self.assertEqual(repo.generations.get(1), 1)
+
+        # reply without a matching request
+        repo.write_receive_time(1)
+        self.assertEqual(repo.generations.get(1), 1)
 
 
 class TestLinkLatencyRepository(unittest.TestCase):
@@ -68,6 +183,150 @@ class TestLinkLatencyRepository(unittest.TestCase):
         repo = LinkLatencyRepository()
 
         self.assertEqual(repo.get_latency_between(1, 2).milliseconds(), 0.0)
+        self.assertEqual(str(repo), '')
+
+    def test_remove_datapath(self):
+        repo = LinkLatencyRepository(history_depth=10)
+        send_ts = TimeStamp(1586869012.1606)
+        for src_dpid, dst_dpid in ((1, 2), (2, 1), (2, 3)):
+            repo.parse_test_packet(
+                ReceivedTestPacket(src_dpid, dst_dpid, send_ts))
+
+        repo.remove_datapath(1)
+
+        self.assertEqual(len(repo), 1)
+        self.assertIsNone(repo.get_latency_estimator(1, 2))
+        self.assertIsNone(repo.get_latency_estimator(2, 1))
+        self.assertEqual(repo.get_latency_between(2, 1).milliseconds(), 0.0)
+        self.assertListEqual(repo.get_latency_history(1, 2), [])
+        self.assertEqual(repo.generations.get((1, 2)), 0)
+        self.assertIsNotNone(repo.get_latency_estimator(2, 3))
+
+    def test_remove_link(self):
+        repo = LinkLatencyRepository(history_depth=10)
+        send_ts = TimeStamp(1586869012.1606)
+        repo.parse_test_packet(ReceivedTestPacket(1, 2, send_ts))
+        repo.parse_test_packet(ReceivedTestPacket(2, 1, send_ts))
+
+        repo.remove_link(1, 2)
+        repo.remove_link(1, 3)
+
+        self.assertEqual(len(repo), 1)
+        self.assertIsNone(repo.get_latency_estimator(1, 2))
+        self.assertEqual(repo.get_latency_between(1, 2).milliseconds(), 0.0)
+        self.assertListEqual(repo.get_latency_history(1, 2), [])
+        self.assertIsNotNone(repo.get_latency_estimator(2, 1))
+
+    def test_get_latency_estimator(self):
+        repo = LinkLatencyRepository()
+        self.assertIsNone(repo.get_latency_estimator(1, 2))
+
+        repo.parse_test_packet(
+            ReceivedTestPacket(1, 2, TimeStamp(1586869012.1606)))
+
+        summary = repo.get_latency_estimator(1, 2).summary()
+        self.assertGreater(summary.ewma, 0.0)
+        self.assertEqual(summary.min, summary.max)
+        self.assertIsNone(repo.get_latency_estimator(2, 1))
+
+    def test_get_link_latency_estimator(self):
+        repo = LinkLatencyRepository()
+        self.assertIsNone(repo.get_link_latency_estimator(1, 2).summary().ewma)
+
+        repo.parse_test_packet(
+            ReceivedTestPacket(1, 2, TimeStamp(1586869012.1606)))
+        repo.parse_test_packet(
+            ReceivedTestPacket(2, 1, TimeStamp(1586869013.1606)))
+
+        summary = repo.get_link_latency_estimator(1, 2).summary()
+        self.assertLess(summary.min, summary.max)
+
+    def test_get_latency_history(self):
+        repo = LinkLatencyRepository(history_depth=2)
+        self.assertListEqual(repo.get_latency_history(1, 2), [])
+
+        for _ in range(3):
+            repo.parse_test_packet(
+                ReceivedTestPacket(1, 2, TimeStamp(1586869012.1606)))
+
+        history = repo.get_latency_history(1, 2)
+        self.assertEqual(len(history), 2)
+        self.assertGreater(history[-1][1], 0.0)
+        self.assertListEqual(repo.get_latency_history(2, 1), [])
+
+    def test_get_latency_history__disabled(self):
+        repo = LinkLatencyRepository()
+        repo.parse_test_packet(
+            ReceivedTestPacket(1, 2, TimeStamp(1586869012.1606)))
+
+        self.assertListEqual(repo.get_latency_history(1, 2), [])
+
+    def test_parse_test_packet__generations(self):
+        repo = LinkLatencyRepository()
+
+        repo.parse_test_packet(
+            ReceivedTestPacket(1, 2, TimeStamp(1586869012.1606)))
+
+        self.assertEqual(repo.generations.get((1, 2)), 1)
+        self.assertEqual(repo.generations.get((2, 1)), 0)
+
+
+class TestProbeLossRepository(unittest.TestCase):
+    def test_record_sent(self):
+        repo = ProbeLossRepository()
+
+        self.assertEqual(repo.record_sent(1, 2, 0.0), 0)
+        self.assertEqual(repo.record_sent(1, 2, 0.0), 1)
+        self.assertEqual(repo.record_sent(1, 3, 0.0), 0)
+        self.assertEqual(repo.get_tracker(1, 2).sent, 2)
+        self.assertIsNone(repo.get_tracker(2, 2))
+
+    def test_remove_datapath(self):
+        repo = ProbeLossRepository()
+        repo.record_sent(1, 2, 0.0)
+        repo.record_sent(1, 3, 0.0)
+        repo.record_sent(2, 2, 0.0)
+
+        repo.remove_datapath(1)
+
+        self.assertEqual(len(repo), 1)
+        self.assertIsNone(repo.get_tracker(1, 2))
+        self.assertIsNotNone(repo.get_tracker(2, 2))
+
+    def test_remove_port(self):
+        repo = ProbeLossRepository()
+        repo.record_sent(1, 2, 0.0)
+        repo.record_sent(1, 3, 0.0)
+
+        repo.remove_port(1, 2)
+
+        self.assertIsNone(repo.get_tracker(1, 2))
+        self.assertIsNotNone(repo.get_tracker(1, 3))
+
+    def test_parse_test_packet(self):
+        repo = ProbeLossRepository(timeout=1.0)
+        seq_num = repo.record_sent(1, 2, 0.0)
+        repo.record_sent(1, 2, 0.0)
+
+        repo.parse_test_packet(
+            ReceivedTestPacket(1, 3, TimeStamp(1586869012.1606), 2, seq_num))
+        self.assertEqual(repo.generations.get((1, 2)), 1)
+
+        repo.record_sent(1, 2, 5.0)
+        tracker = repo.get_tracker(1, 2)
+        self.assertEqual(tracker.received, 1)
+        self.assertEqual(tracker.lost, 1)
+        self.assertEqual(tracker.plr_percents(), 50.0)
+        self.assertEqual(repo.generations.get((1, 2)), 2)
+
+    def test_parse_test_packet__unknown_port(self):
+        repo = ProbeLossRepository()
+
+        repo.parse_test_packet(
+            ReceivedTestPacket(1, 3, TimeStamp(1586869012.1606), 2, 0))
+
+        self.assertIsNone(repo.get_tracker(1, 2))
+        self.assertEqual(repo.generations.generation, 0)
 
 
 class TestBandwidthPortMeasurementData(unittest.TestCase):
@@ -75,7 +334,39 @@ class TestBandwidthPortMeasurementData(unittest.TestCase):
         d1 = BandwidthPortMeasurementData(1, 842000000, 13, 16)
         d2 = BandwidthPortMeasurementData(2, 842000000, 20, 21)
 
-        self.assertEqual(d2 - d1, 96.0)
+        self.assertEqual(d2 - d1, PortRates(56.0, 40.0))
+        self.assertEqual((d2 - d1).total(), 96.0)
+
+    def test__sub__counter_wrap(self):
+        d1 = BandwidthPortMeasurementData(1, 0, 2**32 - 10, 100)
+        d2 = BandwidthPortMeasurementData(2, 0, 5, 110)
+
+        self.assertIsNone(d2.find_reset(d1))
+        self.assertIsNone(d2.find_reset(d1, 1000))
+        self.assertEqual(d2 - d1, PortRates(120.0, 80.0))
+
+    def test_find_reset(self):
+        d1 = BandwidthPortMeasurementData(100, 0, 1000, 1000)
+
+        self.assertIsNone(
+            BandwidthPortMeasurementData(101, 0, 1000, 2000).find_reset(d1))
+        # the switch or the port came back up
+        self.assertEqual(
+            BandwidthPortMeasurementData(2, 0, 5000, 5000).find_reset(d1),
+            RESET_DURATION)
+        # the counters were cleared
+        self.assertEqual(
+            BandwidthPortMeasurementData(101, 0, 10, 2000).find_reset(d1),
+            RESET_COUNTER)
+
+    def test_find_reset__counter_cleared_near_32_bits(self):
+        d1 = BandwidthPortMeasurementData(100, 0, 3000000000, 1000)
+        d2 = BandwidthPortMeasurementData(101, 0, 1000, 2000)
+
+        self.assertEqual(d2.find_reset(d1), RESET_COUNTER)
+        # 1.3 GB within a second does not fit a 10 Gbit/s port
+        self.assertEqual(d2.find_reset(d1, 10 * 10**9), RESET_COUNTER)
+        self.assertIsNone(d2.find_reset(d1, 100 * 10**9))
 
 
 class TestPlrPortMeasurementData(unittest.TestCase):
@@ -97,6 +388,80 @@ class TestPlrPortMeasurementData(unittest.TestCase):
 
         self.assertEqual(d2 - d1, 0.0)
 
+    def test_find_reset(self):
+        d1 = PlrPortMeasurementData(40, 60, 10, 5)
+
+        self.assertIsNone(PlrPortMeasurementData(80, 120, 20,
+                                                 10).find_reset(d1))
+        self.assertEqual(
+            PlrPortMeasurementData(4, 6, 1, 0).find_reset(d1), RESET_COUNTER)
+
+
+class TestCounterDelta(unittest.TestCase):
+    def test_counter_delta(self):
+        self.assertEqual(counter_delta(10, 15), 5)
+        self.assertEqual(counter_delta(2**32 - 1, 0), 1)
+        self.assertEqual(counter_delta(2**64 - 2, 3), 5)
+        self.assertIsNone(counter_delta(1000, 5))
+        self.assertEqual(counter_delta(2**32 - 10, 5, 15), 15)
+        self.assertIsNone(counter_delta(2**32 - 10, 5, 14))
+        self.assertIsNone(counter_delta(3000000000, 1000, 2**28))
+
+
+class TestLinkBandwidth(unittest.TestCase):
+    def test__init__(self):
+        bandwidth = LinkBandwidth(PortRates(100.0, 900.0),
+                                  PortRates(1100.0, 300.0), 10000)
+
+        self.assertEqual(bandwidth.forward_bits_per_sec, 1000.0)
+        self.assertEqual(bandwidth.reverse_bits_per_sec, 200.0)
+        self.assertEqual(bandwidth.forward_utilization_percents(), 10.0)
+        self.assertEqual(bandwidth.reverse_utilization_percents(), 2.0)
+
+    def test__init__unknown_capacity(self):
+        bandwidth = LinkBandwidth(PortRates(), PortRates())
+
+        self.assertIsNone(bandwidth.forward_utilization_percents())
+        self.assertIsNone(bandwidth.reverse_utilization_percents())
+
+
+class TestPortSpeedRepository(unittest.TestCase):
+    def test_set_speed(self):
+        repo = PortSpeedRepository()
+        repo.set_speed(1, 2, 10000000)
+        repo.set_speed(1, 2, 10000000)
+
+        self.assertEqual(repo.get_speed(1, 2), 10**10)
+        self.assertIsNone(repo.get_speed(1, 3))
+        self.assertEqual(repo.generations.get((1, 2)), 1)
+
+        # switches report zero when the speed is unknown
+        repo.set_speed(1, 2, 0)
+        self.assertIsNone(repo.get_speed(1, 2))
+        self.assertEqual(repo.generations.get((1, 2)), 2)
+
+    def test_remove_datapath(self):
+        repo = PortSpeedRepository()
+        repo.set_speed(1, 2, 10000000)
+        repo.set_speed(2, 2, 10000000)
+
+        repo.remove_datapath(1)
+
+        self.assertEqual(len(repo), 1)
+        self.assertIsNone(repo.get_speed(1, 2))
+        self.assertEqual(repo.generations.get((1, 2)), 0)
+
+    def test_get_link_capacity(self):
+        repo = PortSpeedRepository()
+        link = Link(1, 2, 3, 4)
+        self.assertIsNone(repo.get_link_capacity(link))
+
+        repo.set_speed(1, 2, 10000000)
+        self.assertEqual(repo.get_link_capacity(link), 10**10)
+
+        repo.set_speed(3, 4, 1000000)
+        self.assertEqual(repo.get_link_capacity(link), 10**9)
+
 
 class TestPortStatsRepository(unittest.TestCase):
     def test_add_stats__bandwidth(self):
@@ -106,11 +471,48 @@ class TestPortStatsRepository(unittest.TestCase):
         repo.add_stats(1, 2,
                        BandwidthPortMeasurementData(2, 842000000, 20, 21))
 
-        self.assertEqual(repo.get_stats(1, 2), 96.0)
+        self.assertEqual(repo.get_stats(1, 2).total(), 96.0)
 
         repo.add_stats(1, 2,
                        BandwidthPortMeasurementData(3, 842000000, 25, 39))
-        self.assertEqual(repo.get_stats(1, 2), 184.0)
+        self.assertEqual(repo.get_stats(1, 2), PortRates(40.0, 144.0))
+
+    def test_add_stats__reset(self):
+        repo = PortStatsRepository(history_depth=10, empty_stats=PortRates())
+        repo.add_stats(1, 2, BandwidthPortMeasurementData(100, 0, 1000, 1000))
+        repo.add_stats(1, 2, BandwidthPortMeasurementData(101, 0, 1100, 1100))
+
+        reset = repo.add_stats(1, 2,
+                               BandwidthPortMeasurementData(1, 0, 10, 10))
+
+        self.assertEqual(reset.reason, RESET_DURATION)
+        self.assertEqual((reset.dpid, reset.port_no), (1, 2))
+        self.assertEqual(repo.reset_count, 1)
+        self.assertListEqual(list(repo.resets), [reset])
+        self.assertEqual(repo.get_stats(1, 2), PortRates(800.0, 800.0))
+
+        # the sample after the reset is the new baseline
+        self.assertIsNone(
+            repo.add_stats(1, 2, BandwidthPortMeasurementData(2, 0, 20, 30)))
+        self.assertEqual(repo.get_stats(1, 2), PortRates(80.0, 160.0))
+        history = repo.get_stats_history(1, 2)
+        self.assertListEqual([value for _, value in history], [1600.0, 240.0])
+
+    def test_add_stats__counter_cleared(self):
+        speeds = PortSpeedRepository()
+        speeds.set_speed(1, 2, 1000000)
+        repo = PortStatsRepository(empty_stats=PortRates(),
+                                   port_speed_repository=speeds)
+        repo.add_stats(1, 2,
+                       BandwidthPortMeasurementData(100, 0, 3000000000, 10))
+        repo.add_stats(1, 2,
+                       BandwidthPortMeasurementData(101, 0, 3000000100, 20))
+
+        reset = repo.add_stats(1, 2,
+                               BandwidthPortMeasurementData(102, 0, 1000, 30))
+
+        self.assertEqual(reset.reason, RESET_COUNTER)
+        self.assertEqual(repo.get_stats(1, 2), PortRates(800.0, 80.0))
 
     def test_add_stats__plr(self):
         repo = PortStatsRepository()
@@ -125,11 +527,66 @@ class TestPortStatsRepository(unittest.TestCase):
     def test_add_stats__empty_stats(self):
         repo = PortStatsRepository()
         self.assertEqual(repo.get_stats(1, 2), 0.0)
+        self.assertEqual(len(repo), 0)
 
         repo.add_stats(1, 2,
                        BandwidthPortMeasurementData(1, 842000000, 13, 16))
         self.assertEqual(repo.get_stats(1, 2), 0.0)
 
+    def test_get_stats__read_only(self):
+        repo = PortStatsRepository()
+        for port_no in range(100):
+            repo.get_stats(1, port_no)
+
+        self.assertEqual(len(repo), 0)
+        self.assertEqual(repo.generations.generation, 0)
+
+    def test_remove_datapath(self):
+        repo = PortStatsRepository(history_depth=10)
+        for dpid in (1, 2):
+            repo.add_stats(dpid, 2, PlrPortMeasurementData(40, 60, 10, 5))
+            repo.add_stats(dpid, 2, PlrPortMeasurementData(80, 120, 20, 10))
+
+        repo.remove_datapath(1)
+        repo.remove_datapath(3)
+
+        self.assertEqual(len(repo), 1)
+        self.assertEqual(repo.get_stats(1, 2), 0.0)
+        self.assertListEqual(repo.get_stats_history(1, 2), [])
+        self.assertEqual(repo.generations.get((1, 2)), 0)
+        self.assertEqual(repo.get_stats(2, 2), 15.0)
+
+        repo.remove_port(2, 2)
+        self.assertEqual(len(repo), 0)
+        self.assertEqual(repo.get_stats(2, 2), 0.0)
+
+        # the next sample of a returning datapath is a new baseline
+        repo.add_stats(1, 2, PlrPortMeasurementData(80, 120, 20, 10))
+        self.assertEqual(repo.get_stats(1, 2), 0.0)
+
+    def test_get_stats_history(self):
+        repo = PortStatsRepository(history_depth=10)
+        repo.add_stats(1, 2, PlrPortMeasurementData(40, 60, 10, 5))
+        repo.add_stats(1, 2, PlrPortMeasurementData(80, 120, 20, 10))
+        repo.add_stats(1, 2, PlrPortMeasurementData(100, 200, 20, 10))
+
+        history = repo.get_stats_history(1, 2)
+        self.assertListEqual([value for _, value in history], [15.0, 0.0])
+        self.assertListEqual(repo.get_stats_history(1, 3), [])
+
+    def test_add_stats__generations(self):
+        repo = PortStatsRepository()
+        repo.add_stats(1, 2, PlrPortMeasurementData(40, 60, 10, 5))
+        self.assertEqual(repo.generations.generation, 0)
+
+        repo.add_stats(1, 2, PlrPortMeasurementData(80, 120, 20, 10))
+        self.assertEqual(repo.generations.get((1, 2)), 1)
+
+        # the same loss rate again does not change the generation
+        repo.add_stats(1, 2, PlrPortMeasurementData(120, 180, 30, 15))
+        self.assertEqual(repo.get_stats(1, 2), 15.0)
+        self.assertEqual(repo.generations.get((1, 2)), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+import array
+import sys
+
+from lib.memory import deep_sizeof, RepositoryMemoryViewModel
+from lib.measurement_repositories import PortStatsRepository, \
+    PlrPortMeasurementData
+
+
+class Slotted:
+    __slots__ = ('payload', )
+
+    def __init__(self, payload):
+        self.payload = payload
+
+
+class TestDeepSizeof(unittest.TestCase):
+    def test_deep_sizeof(self):
+        payload = array.array('d', bytes(8 * 1000))
+
+        self.assertGreaterEqual(deep_sizeof({'key': [payload]}),
+                                sys.getsizeof(payload))
+        self.assertGreaterEqual(deep_sizeof(Slotted(payload)),
+                                sys.getsizeof(payload))
+
+    def test_deep_sizeof__shared_objects_counted_once(self):
+        payload = array.array('d', bytes(8 * 1000))
+
+        self.assertLess(deep_sizeof([payload, payload]),
+                        2 * sys.getsizeof(payload))
+
+    def test_deep_sizeof__grows_with_entries(self):
+        repo = PortStatsRepository()
+        empty_size = deep_sizeof(repo)
+        for port_no in range(100):
+            repo.add_stats(1, port_no, PlrPortMeasurementData(40, 60, 10, 5))
+
+        self.assertGreater(deep_sizeof(repo), empty_size)
+
+
+class TestRepositoryMemoryViewModel(unittest.TestCase):
+    def test__init__(self):
+        repo = PortStatsRepository()
+        repo.add_stats(1, 2, PlrPortMeasurementData(40, 60, 10, 5))
+
+        view = RepositoryMemoryViewModel('plr_port_stats', repo)
+
+        self.assertEqual(view.name, 'plr_port_stats')
+        self.assertEqual(view.entries, 1)
+        self.assertGreater(view.bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
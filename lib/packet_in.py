@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import logging
+import struct
+
+from lib.packets import ETHERNET_HEADER_SIZE
+
+ETH_TYPE = struct.Struct('!H')
+ETH_TYPE_OFFSET = 12
+
+
+def peek_eth_type(data):
+    if len(data) < ETHERNET_HEADER_SIZE:
+        return None
+    return ETH_TYPE.unpack_from(data, ETH_TYPE_OFFSET)[0]
+
+
+class PacketInDispatcher:
+    def __init__(self, logger=None):
+        self._logger = logger or logging.getLogger(__name__)
+        self._handlers = {}
+        self._default_handlers = ()
+        self.dispatched = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def register(self, handler, eth_type=None):
+        if eth_type is None:
+            self._default_handlers += (handler, )
+        else:
+            self._handlers[eth_type] = self._handlers.get(eth_type,
+                                                          ()) + (handler, )
+
+    def unregister(self, handler, eth_type=None):
+        if eth_type is None:
+            self._default_handlers = tuple(
+                h for h in self._default_handlers if h != handler)
+            return
+        handlers = tuple(h for h in self._handlers.get(eth_type, ())
+                         if h != handler)
+        if handlers:
+            self._handlers[eth_type] = handlers
+        else:
+            self._handlers.pop(eth_type, None)
+
+    def dispatch(self, msg):
+        eth_type = peek_eth_type(msg.data)
+        handlers = self._handlers.get(eth_type) or self._default_handlers
+        if not handlers:
+            self.dropped += 1
+            return False
+        self.dispatched += 1
+        for handler in handlers:
+            try:
+                handler(msg)
+            except Exception:
+                self.failed += 1
+                self._logger.exception('packet-in handler %r failed',
+                                       handler)
+        return True
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.packet_in import PacketInDispatcher, peek_eth_type
+
+
+class FakeMsg:
+    def __init__(self, data):
+        self.data = data
+
+
+def frame(eth_type):
+    return b'\xff' * 6 + b'\x00' * 6 + eth_type.to_bytes(2, 'big') + \
+        b'\x00' * 46
+
+
+class TestPeekEthType(unittest.TestCase):
+    def test_peek_eth_type(self):
+        self.assertEqual(peek_eth_type(frame(0x0815)), 0x0815)
+        self.assertEqual(peek_eth_type(memoryview(frame(0x0806))), 0x0806)
+
+    def test_peek_eth_type__short_frame(self):
+        self.assertIsNone(peek_eth_type(b'\xff' * 13))
+
+
+class TestPacketInDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+        self.dispatcher = PacketInDispatcher()
+
+    def handler(self, name):
+        return lambda msg: self.received.append((name, msg))
+
+    def test_dispatch(self):
+        self.dispatcher.register(self.handler('probe'), 0x0815)
+        self.dispatcher.register(self.handler('arp'), 0x0806)
+        probe = FakeMsg(frame(0x0815))
+        arp = FakeMsg(frame(0x0806))
+
+        self.assertTrue(self.dispatcher.dispatch(probe))
+        self.assertTrue(self.dispatcher.dispatch(arp))
+
+        self.assertListEqual(self.received, [('probe', probe),
+                                             ('arp', arp)])
+        self.assertEqual(self.dispatcher.dispatched, 2)
+
+    def test_dispatch__no_handler(self):
+        self.dispatcher.register(self.handler('probe'), 0x0815)
+
+        self.assertFalse(self.dispatcher.dispatch(FakeMsg(frame(0x0800))))
+        self.assertFalse(self.dispatcher.dispatch(FakeMsg(b'\x00')))
+
+        self.assertListEqual(self.received, [])
+        self.assertEqual(self.dispatcher.dropped, 2)
+
+    def test_dispatch__default_handler(self):
+        self.dispatcher.register(self.handler('probe'), 0x0815)
+        self.dispatcher.register(self.handler('other'))
+        ipv4 = FakeMsg(frame(0x0800))
+
+        self.dispatcher.dispatch(ipv4)
+
+        self.assertListEqual(self.received, [('other', ipv4)])
+
+    def test_dispatch__multiple_handlers(self):
+        self.dispatcher.register(self.handler('first'), 0x0806)
+        self.dispatcher.register(self.handler('second'), 0x0806)
+        arp = FakeMsg(frame(0x0806))
+
+        self.dispatcher.dispatch(arp)
+
+        self.assertListEqual(self.received, [('first', arp),
+                                             ('second', arp)])
+
+    def test_dispatch__failing_handler(self):
+        def failing_handler(msg):
+            raise ValueError('malformed')
+
+        self.dispatcher.register(failing_handler, 0x0806)
+        self.dispatcher.register(self.handler('second'), 0x0806)
+        arp = FakeMsg(frame(0x0806))
+
+        with self.assertLogs('lib.packet_in', 'ERROR'):
+            self.assertTrue(self.dispatcher.dispatch(arp))
+
+        self.assertListEqual(self.received, [('second', arp)])
+        self.assertEqual(self.dispatcher.failed, 1)
+
+    def test_unregister(self):
+        probe_handler = self.handler('probe')
+        other_handler = self.handler('other')
+        self.dispatcher.register(probe_handler, 0x0815)
+        self.dispatcher.register(other_handler)
+
+        self.dispatcher.unregister(probe_handler, 0x0815)
+        self.dispatcher.unregister(other_handler)
+
+        self.assertFalse(self.dispatcher.dispatch(FakeMsg(frame(0x0815))))
+        self.assertListEqual(self.received, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
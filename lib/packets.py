@@ -19,35 +19,108 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 #
-import time
+import struct
 
 from lib.time_units import TimeStamp
 
+ETHERNET_HEADER_SIZE = 14
+
 
 class TestPacket:
-    def __init__(self, src_port):
+    VERSION = 1
+    # version, sequence number, src dpid, src port, send timestamp in ns
+    FORMAT = struct.Struct('!BIQIQ')
+
+    def __init__(self, src_port, src_dpid=0, seq_num=0):
         self._src_port = src_port
+        self._src_dpid = src_dpid
+        self._seq_num = seq_num
+        self._send_ts = TimeStamp.now()
 
-        current_time = time.time()
-        self._send_ts = TimeStamp(current_time)
+    def __str__(self):
+        return 'seq_num={0};src_dpid={1};src_port={2};send_ts={3}'.format(
+            self._seq_num, self._src_dpid, self._src_port, self._send_ts)
 
-    STR_DELIMETER = ':'
+    def to_bytes(self):
+        return self.FORMAT.pack(self.VERSION, self._seq_num, self._src_dpid,
+                                self._src_port, self._send_ts.nanoseconds())
 
-    def __str__(self):
-        return str(self._send_ts) + self.STR_DELIMETER + str(self._src_port)
+    def pack_into(self, buf, offset=0):
+        self.FORMAT.pack_into(buf, offset, self.VERSION, self._seq_num,
+                              self._src_dpid, self._src_port,
+                              self._send_ts.nanoseconds())
 
     @classmethod
-    def from_string(cls, raw_payload):
-        string_packet = raw_payload.replace('\x00', '')
-        ts_string, src_port_string = string_packet.split(cls.STR_DELIMETER, 2)
-        pkt = TestPacket(int(src_port_string))
-        pkt._send_ts = TimeStamp(ts_string)
+    def from_bytes(cls, data, offset=0):
+        if len(data) - offset < cls.FORMAT.size:
+            raise ValueError('truncated test packet')
+        version, seq_num, src_dpid, src_port, send_ts_ns = \
+            cls.FORMAT.unpack_from(data, offset)
+        if version != cls.VERSION:
+            raise ValueError('unsupported test packet version ' +
+                             str(version))
+        pkt = cls.__new__(cls)
+        pkt._src_port = src_port
+        pkt._src_dpid = src_dpid
+        pkt._seq_num = seq_num
+        pkt._send_ts = TimeStamp.from_nanoseconds(send_ts_ns)
         return pkt
 
 
+PROBE_SIZE = ETHERNET_HEADER_SIZE + TestPacket.FORMAT.size
+
+
+class EchoPayload:
+    # send timestamp in ns of a monotonic clock
+    FORMAT = struct.Struct('!Q')
+
+    def __init__(self, send_ts_ns):
+        self.send_ts_ns = send_ts_ns
+
+    def to_bytes(self):
+        return self.FORMAT.pack(self.send_ts_ns)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data is None or len(data) != cls.FORMAT.size:
+            raise ValueError('not an echo payload')
+        send_ts_ns, = cls.FORMAT.unpack(data)
+        return cls(send_ts_ns)
+
+
+class ProbeTemplate:
+    def __init__(self, message, payload_offset):
+        self._buf = bytearray(message)
+        self._payload_offset = payload_offset
+
+    def render(self, test_packet):
+        test_packet.pack_into(self._buf, self._payload_offset)
+        return bytes(self._buf)
+
+
+class ProbeTemplateCache:
+    def __init__(self):
+        self._templates = {}
+
+    def get(self, dpid, port_no):
+        return self._templates.get(dpid, {}).get(port_no)
+
+    def add(self, dpid, port_no, template):
+        self._templates.setdefault(dpid, {})[port_no] = template
+
+    def remove(self, dpid, port_no):
+        self._templates.get(dpid, {}).pop(port_no, None)
+
+    def remove_datapath(self, dpid):
+        self._templates.pop(dpid, None)
+
+
 class ReceivedTestPacket:
-    def __init__(self, src_dpid, dst_dpid, send_ts):
+    def __init__(self, src_dpid, dst_dpid, send_ts, src_port_no=0,
+                 seq_num=0):
         self.src_dpid = src_dpid
         self.dst_dpid = dst_dpid
         self.send_ts = send_ts
-        self.receive_ts = TimeStamp(time.time())
\ No newline at end of file
+        self.src_port_no = src_port_no
+        self.seq_num = seq_num
+        self.receive_ts = TimeStamp.now()
@@ -21,29 +21,147 @@
 #
 import unittest
 
-from lib.packets import TestPacket, ReceivedTestPacket
+from lib.packets import TestPacket, ReceivedTestPacket, EchoPayload, \
+    ProbeTemplate, ProbeTemplateCache, ETHERNET_HEADER_SIZE, PROBE_SIZE
 from lib.time_units import TimeStamp
 
 
 class TestTestPacket(unittest.TestCase):
     def test__init__(self):
-        pkt = TestPacket(12)
+        pkt = TestPacket(12, 3, 7)
 
-        self.assertRegex(str(pkt),
-                         r'\d+\.\d{4}:12')  # for example 1586869012.1606:12
+        self.assertRegex(
+            str(pkt), r'seq_num=7;src_dpid=3;src_port=12;send_ts=\d+\.\d+')
 
-    def test_from_string(self):
-        pkt1 = TestPacket.from_string('1586869012.1606:12')
-        self.assertEqual(str(pkt1), '1586869012.1606:12')
+    def test_to_bytes(self):
+        pkt = TestPacket(12, 3, 7)
+        pkt._send_ts = TimeStamp.from_nanoseconds(1586869012160612345)
 
-        pkt2 = TestPacket.from_string('1586869012.1606:12\x00\x00')
-        self.assertEqual(str(pkt2), '1586869012.1606:12')
+        self.assertEqual(
+            pkt.to_bytes(), b'\x01\x00\x00\x00\x07' +
+            b'\x00\x00\x00\x00\x00\x00\x00\x03' + b'\x00\x00\x00\x0c' +
+            (1586869012160612345).to_bytes(8, 'big'))
+
+    def test_pack_into(self):
+        pkt = TestPacket(12, 3, 7)
+        buf = bytearray(4 + TestPacket.FORMAT.size)
+
+        pkt.pack_into(buf, 4)
+
+        self.assertEqual(bytes(buf), b'\x00' * 4 + pkt.to_bytes())
+
+    def test_from_bytes(self):
+        pkt1 = TestPacket(12, 2**64 - 1, 2**32 - 1)
+        pkt2 = TestPacket.from_bytes(pkt1.to_bytes())
+
+        self.assertEqual(pkt2._src_port, 12)
+        self.assertEqual(pkt2._src_dpid, 2**64 - 1)
+        self.assertEqual(pkt2._seq_num, 2**32 - 1)
+        self.assertEqual(pkt2._send_ts.nanoseconds(),
+                         pkt1._send_ts.nanoseconds())
+
+    def test_from_bytes__frame(self):
+        pkt1 = TestPacket(12, 3, 7)
+        # ethernet header + payload + padding added by the switch
+        frame = b'\xff' * ETHERNET_HEADER_SIZE + pkt1.to_bytes() + b'\x00' * 8
+
+        pkt2 = TestPacket.from_bytes(memoryview(frame), ETHERNET_HEADER_SIZE)
+
+        self.assertEqual(str(pkt2), str(pkt1))
+
+    def test_from_bytes__invalid(self):
+        with self.assertRaisesRegex(ValueError,
+                                    r'unsupported test packet version 2'):
+            TestPacket.from_bytes(b'\x02' + TestPacket(12).to_bytes()[1:])
+
+    def test_from_bytes__short_frame(self):
+        frame = b'\xff' * ETHERNET_HEADER_SIZE + TestPacket(12).to_bytes()
+
+        with self.assertRaisesRegex(ValueError, r'truncated test packet'):
+            TestPacket.from_bytes(memoryview(frame)[:PROBE_SIZE - 1],
+                                  ETHERNET_HEADER_SIZE)
+
+    def test_from_bytes__truncated_frame(self):
+        pkt1 = TestPacket(12, 3, 7)
+        frame = b'\xff' * ETHERNET_HEADER_SIZE + pkt1.to_bytes() + b'\x00' * 8
+
+        pkt2 = TestPacket.from_bytes(
+            memoryview(frame)[:PROBE_SIZE], ETHERNET_HEADER_SIZE)
+
+        self.assertEqual(str(pkt2), str(pkt1))
+
+
+class TestEchoPayload(unittest.TestCase):
+    def test_from_bytes(self):
+        payload = EchoPayload.from_bytes(EchoPayload(123456789).to_bytes())
+
+        self.assertEqual(payload.send_ts_ns, 123456789)
+
+    def test_from_bytes__invalid(self):
+        for data in (None, b'', b'\x00' * 4):
+            with self.assertRaisesRegex(ValueError, r'not an echo payload'):
+                EchoPayload.from_bytes(data)
+
+
+class TestProbeTemplate(unittest.TestCase):
+    def test_render(self):
+        header = b'\x04\x0d\x00\x30'
+        template = ProbeTemplate(header + TestPacket(1).to_bytes(),
+                                 len(header))
+        pkt1 = TestPacket(12, 3, 7)
+        pkt2 = TestPacket(13, 3, 8)
+
+        message1 = template.render(pkt1)
+        message2 = template.render(pkt2)
+
+        self.assertEqual(message1, header + pkt1.to_bytes())
+        self.assertEqual(message2, header + pkt2.to_bytes())
+
+
+class TestProbeTemplateCache(unittest.TestCase):
+    def test_get(self):
+        cache = ProbeTemplateCache()
+        template = ProbeTemplate(b'', 0)
+        self.assertIsNone(cache.get(1, 2))
+
+        cache.add(1, 2, template)
+
+        self.assertIs(cache.get(1, 2), template)
+        self.assertIsNone(cache.get(1, 3))
+
+    def test_remove_datapath(self):
+        cache = ProbeTemplateCache()
+        cache.add(1, 2, ProbeTemplate(b'', 0))
+        cache.add(2, 2, ProbeTemplate(b'', 0))
+
+        cache.remove_datapath(1)
+        cache.remove_datapath(5)
+
+        self.assertIsNone(cache.get(1, 2))
+        self.assertIsNotNone(cache.get(2, 2))
+
+    def test_remove(self):
+        cache = ProbeTemplateCache()
+        cache.add(1, 2, ProbeTemplate(b'', 0))
+        cache.add(1, 3, ProbeTemplate(b'', 0))
+
+        cache.remove(1, 2)
+        cache.remove(5, 2)
+
+        self.assertIsNone(cache.get(1, 2))
+        self.assertIsNotNone(cache.get(1, 3))
 
 
 class TestReceivedTestPacket(unittest.TestCase):
     def test__init__(self):
         rpkt = ReceivedTestPacket(1, 2, TimeStamp(1586959016.8374))
         self.assertIsInstance(rpkt.receive_ts, TimeStamp)
+        self.assertEqual(rpkt.src_port_no, 0)
+        self.assertEqual(rpkt.seq_num, 0)
+
+        rpkt = ReceivedTestPacket(1, 2, TimeStamp(1586959016.8374), 12, 7)
+        self.assertEqual(rpkt.src_port_no, 12)
+        self.assertEqual(rpkt.seq_num, 7)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import random
+import time
+
+
+class PeriodicJob:
+    def __init__(self,
+                 name,
+                 interval,
+                 func,
+                 jitter=0.0,
+                 clock=time.monotonic,
+                 rand=random.random):
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        if not 0 <= jitter < 1:
+            raise ValueError('jitter must be in [0, 1)')
+        self.name = name
+        self.interval = interval
+        self._func = func
+        self._jitter = jitter
+        self._clock = clock
+        self._rand = rand
+        self._scheduled_ts = None
+        self._deadline_ts = None
+        self.runs = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.max_lateness = 0.0
+
+    def start(self):
+        self._scheduled_ts = self._clock()
+        self._deadline_ts = self._scheduled_ts + self._jitter_offset()
+
+    def get_delay(self):
+        return max(self._deadline_ts - self._clock(), 0.0)
+
+    def run(self):
+        started_ts = self._clock()
+        self.max_lateness = max(self.max_lateness,
+                                started_ts - self._deadline_ts)
+        try:
+            self._func()
+        finally:
+            finished_ts = self._clock()
+            self._update_stats(finished_ts - started_ts)
+            self._schedule_next(finished_ts)
+
+    def _update_stats(self, duration):
+        self.runs += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        if duration > self.interval:
+            self.overruns += 1
+
+    def _schedule_next(self, now):
+        # next run stays on the start_ts + k * interval grid, so the
+        # period does not drift by the time spent in the job
+        self._scheduled_ts += self.interval
+        if self._scheduled_ts < now:
+            missed = int((now - self._scheduled_ts) // self.interval) + 1
+            self.skipped += missed
+            self._scheduled_ts += missed * self.interval
+        self._deadline_ts = self._scheduled_ts + self._jitter_offset()
+
+    def _jitter_offset(self):
+        return self._rand() * self._jitter * self.interval
+
+
+class PeriodicJobViewModel:
+    def __init__(self, job):
+        self.name = job.name
+        self.interval_sec = job.interval
+        self.runs = job.runs
+        self.overruns = job.overruns
+        self.skipped = job.skipped
+        self.last_duration_ms = round(job.last_duration * 1000, 3)
+        self.max_duration_ms = round(job.max_duration * 1000, 3)
+        self.max_lateness_ms = round(job.max_lateness * 1000, 3)
@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.periodic import PeriodicJob, PeriodicJobViewModel
+from lib.testing import ClockTestCase
+
+
+class TestPeriodicJob(ClockTestCase):
+    def setUp(self):
+        super(TestPeriodicJob, self).setUp()
+        self.job_durations = []
+
+    def job(self):
+        if self.job_durations:
+            self.clock.now += self.job_durations.pop(0)
+
+    def create_job(self, interval=1.0, jitter=0.0, rand=lambda: 0.5):
+        job = PeriodicJob('test', interval, self.job, jitter, self.clock,
+                          rand)
+        job.start()
+        return job
+
+    def run_for(self, job, cycles):
+        run_ts = []
+        for _ in range(cycles):
+            self.clock.now += job.get_delay()
+            run_ts.append(self.clock.now)
+            job.run()
+        return run_ts
+
+    def test__init__(self):
+        with self.assertRaises(ValueError):
+            PeriodicJob('test', 0, self.job)
+
+    def test__init__invalid_jitter(self):
+        with self.assertRaisesRegex(ValueError, r'jitter must be in'):
+            PeriodicJob('test', 1.0, self.job, jitter=1.0)
+        with self.assertRaisesRegex(ValueError, r'jitter must be in'):
+            PeriodicJob('test', 1.0, self.job, jitter=-0.1)
+
+    def test_run__drift_compensation(self):
+        job = self.create_job(interval=1.0)
+        self.job_durations = [0.3, 0.3, 0.3]
+
+        run_ts = self.run_for(job, 4)
+
+        self.assertListEqual(run_ts, [100.0, 101.0, 102.0, 103.0])
+        self.assertEqual(job.runs, 4)
+        self.assertEqual(job.overruns, 0)
+        self.assertAlmostEqual(job.max_duration, 0.3)
+
+    def test_run__overrun(self):
+        job = self.create_job(interval=1.0)
+        self.job_durations = [2.5]
+
+        run_ts = self.run_for(job, 2)
+
+        self.assertListEqual(run_ts, [100.0, 103.0])
+        self.assertEqual(job.overruns, 1)
+        self.assertEqual(job.skipped, 2)
+        self.assertEqual(job.last_duration, 0.0)
+        self.assertEqual(job.max_duration, 2.5)
+
+    def test_run__jitter(self):
+        job = self.create_job(interval=1.0, jitter=0.2, rand=lambda: 0.5)
+
+        run_ts = self.run_for(job, 3)
+
+        self.assertListEqual(run_ts, [100.1, 101.1, 102.1])
+
+    def test_run__lateness(self):
+        job = self.create_job(interval=1.0)
+        self.clock.now += 0.25
+
+        job.run()
+
+        self.assertEqual(job.max_lateness, 0.25)
+
+    def test_run__exception(self):
+        def fail():
+            raise RuntimeError('job failed')
+
+        job = PeriodicJob('test', 1.0, fail, clock=self.clock)
+        job.start()
+
+        with self.assertRaises(RuntimeError):
+            job.run()
+        self.assertEqual(job.runs, 1)
+        self.assertEqual(job.get_delay(), 1.0)
+
+
+class TestPeriodicJobViewModel(unittest.TestCase):
+    def test__init__(self):
+        job = PeriodicJob('port_stats', 1.0, lambda: None)
+        job.runs = 10
+        job.overruns = 1
+        job.max_duration = 1.0123456
+
+        view = PeriodicJobViewModel(job)
+
+        self.assertDictEqual(
+            view.__dict__, {
+                'name': 'port_stats',
+                'interval_sec': 1.0,
+                'runs': 10,
+                'overruns': 1,
+                'skipped': 0,
+                'last_duration_ms': 0.0,
+                'max_duration_ms': 1012.346,
+                'max_lateness_ms': 0.0
+            })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from array import array
+
+
+class ProbeLossTracker:
+    SEQ_NUM_MASK = 2**32 - 1
+    PERCENTS_100 = 100
+
+    def __init__(self, window, timeout):
+        self._window = window
+        self._timeout = timeout
+        self._send_ts = array('d', bytes(8 * window))
+        self._received = bytearray(window)
+        self._outcomes = bytearray(window)
+        self._base = 0
+        self._next = 0
+        self._highest_received = -1
+        self._resolved = 0
+        self._recent_losses = 0
+        self.sent = 0
+        self.received = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.late = 0
+
+    def record_sent(self, now):
+        self.expire(now)
+        if self._next - self._base == self._window:
+            self._resolve(now, force=True)
+        seq = self._next
+        slot = seq % self._window
+        self._send_ts[slot] = now
+        self._received[slot] = 0
+        self._next += 1
+        self.sent += 1
+        return seq & self.SEQ_NUM_MASK
+
+    def record_received(self, seq_num):
+        seq = self._unwrap(seq_num)
+        if seq is None:
+            return
+        if seq < self._base:
+            self.late += 1
+            return
+        slot = seq % self._window
+        if self._received[slot]:
+            self.duplicates += 1
+            return
+        self._received[slot] = 1
+        self.received += 1
+        if seq < self._highest_received:
+            self.reordered += 1
+        else:
+            self._highest_received = seq
+
+    def expire(self, now):
+        while self._base < self._next and self._resolve(now):
+            pass
+
+    def plr_percents(self):
+        if self._resolved == 0:
+            return 0.0
+        return self.PERCENTS_100 * self._recent_losses / min(
+            self._resolved, self._window)
+
+    def _resolve(self, now, force=False):
+        slot = self._base % self._window
+        if self._received[slot]:
+            lost = 0
+        elif force or self._send_ts[slot] + self._timeout <= now:
+            lost = 1
+            self.lost += 1
+        else:
+            return False
+        outcome_slot = self._resolved % self._window
+        self._recent_losses += lost - self._outcomes[outcome_slot]
+        self._outcomes[outcome_slot] = lost
+        self._resolved += 1
+        self._base += 1
+        return True
+
+    def _unwrap(self, seq_num):
+        last = self._next - 1
+        distance = (last - seq_num) & self.SEQ_NUM_MASK
+        seq = last - distance
+        if distance > self.SEQ_NUM_MASK // 2 or seq < 0:
+            return None
+        return seq
@@ -0,0 +1,124 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.probe_loss import ProbeLossTracker
+
+
+class TestProbeLossTracker(unittest.TestCase):
+    def test_record_sent(self):
+        tracker = ProbeLossTracker(8, 1.0)
+
+        self.assertEqual([tracker.record_sent(0.0) for _ in range(3)],
+                         [0, 1, 2])
+        self.assertEqual(tracker.sent, 3)
+
+    def test_record_received(self):
+        tracker = ProbeLossTracker(8, 1.0)
+        for i in range(4):
+            tracker.record_received(tracker.record_sent(float(i)))
+        tracker.expire(10.0)
+
+        self.assertEqual(tracker.received, 4)
+        self.assertEqual(tracker.lost, 0)
+        self.assertEqual(tracker.plr_percents(), 0.0)
+
+    def test_expire__lost(self):
+        tracker = ProbeLossTracker(8, 1.0)
+        seq_nums = [tracker.record_sent(0.0) for _ in range(4)]
+        tracker.record_received(seq_nums[0])
+        tracker.record_received(seq_nums[2])
+
+        tracker.expire(0.5)
+        self.assertEqual(tracker.lost, 0)
+
+        tracker.expire(1.0)
+        self.assertEqual(tracker.lost, 2)
+        self.assertEqual(tracker.plr_percents(), 50.0)
+
+    def test_record_received__duplicate_and_reordered(self):
+        tracker = ProbeLossTracker(8, 1.0)
+        seq_nums = [tracker.record_sent(0.0) for _ in range(3)]
+
+        tracker.record_received(seq_nums[1])
+        tracker.record_received(seq_nums[0])
+        tracker.record_received(seq_nums[0])
+        tracker.record_received(seq_nums[2])
+
+        self.assertEqual(tracker.received, 3)
+        self.assertEqual(tracker.duplicates, 1)
+        self.assertEqual(tracker.reordered, 1)
+
+    def test_record_received__late(self):
+        tracker = ProbeLossTracker(8, 1.0)
+        seq_num = tracker.record_sent(0.0)
+        tracker.expire(2.0)
+
+        tracker.record_received(seq_num)
+
+        self.assertEqual(tracker.lost, 1)
+        self.assertEqual(tracker.late, 1)
+        self.assertEqual(tracker.received, 0)
+
+    def test_record_received__unknown(self):
+        tracker = ProbeLossTracker(8, 1.0)
+        tracker.record_received(5)
+        tracker.record_sent(0.0)
+        tracker.record_received(5)
+
+        self.assertEqual(tracker.received, 0)
+        self.assertEqual(tracker.late, 0)
+
+    def test_record_sent__window_full(self):
+        tracker = ProbeLossTracker(4, 100.0)
+        for i in range(10):
+            tracker.record_sent(float(i))
+
+        self.assertEqual(tracker.lost, 6)
+        self.assertEqual(tracker.plr_percents(), 100.0)
+
+    def test_plr_percents__recent_window(self):
+        tracker = ProbeLossTracker(4, 1.0)
+        for i in range(4):
+            tracker.record_sent(float(i))
+        for i in range(4, 12):
+            tracker.record_received(tracker.record_sent(float(i)))
+        tracker.expire(20.0)
+
+        self.assertEqual(tracker.lost, 4)
+        self.assertEqual(tracker.plr_percents(), 0.0)
+
+    def test_seq_num_wraparound(self):
+        tracker = ProbeLossTracker(8, 1.0)
+        tracker._base = tracker._next = 2**32 - 2
+        seq_nums = [tracker.record_sent(0.0) for _ in range(4)]
+
+        for seq_num in seq_nums:
+            tracker.record_received(seq_num)
+
+        self.assertEqual(seq_nums, [2**32 - 2, 2**32 - 1, 0, 1])
+        self.assertEqual(tracker.received, 4)
+        self.assertEqual(tracker.reordered, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import time
+
+from lib.staggered_schedule import StaggeredSchedule
+
+
+class _ScheduledProbe:
+    def __init__(self, base_interval):
+        self.base_interval = base_interval
+        self.interval = base_interval
+
+
+class ProbeScheduler:
+    BURST_SEC = 0.1
+
+    def __init__(self,
+                 interval,
+                 min_interval,
+                 max_probes_per_sec,
+                 clock=time.monotonic):
+        self._interval = interval
+        self._min_interval = min_interval
+        self._max_probes_per_sec = max_probes_per_sec
+        self._max_tokens = max(1.0, max_probes_per_sec * self.BURST_SEC)
+        self._clock = clock
+        self._probes = {}
+        self._schedule = StaggeredSchedule()
+        self._tokens = self._max_tokens
+        self._last_refill_ts = clock()
+
+    def __len__(self):
+        return len(self._probes)
+
+    def __contains__(self, key):
+        return key in self._probes
+
+    def add(self, key, interval=None):
+        if key in self._probes:
+            return
+        probe = _ScheduledProbe(interval or self._interval)
+        self._probes[key] = probe
+        self._schedule.add(key, self._clock(), probe.interval)
+
+    def remove(self, key):
+        self._probes.pop(key, None)
+        self._schedule.remove(key)
+
+    def get_interval(self, key):
+        return self._probes[key].interval
+
+    def set_interval(self, key, interval):
+        probe = self._probes[key]
+        probe.base_interval = interval
+        probe.interval = interval
+
+    def set_unstable(self, key, unstable):
+        probe = self._probes.get(key)
+        if probe is None:
+            return
+        if unstable:
+            min_interval = min(self._min_interval, probe.base_interval)
+            probe.interval = max(min_interval, probe.interval / 2)
+        else:
+            probe.interval = min(probe.base_interval, probe.interval * 2)
+
+    def pop_due(self):
+        now = self._clock()
+        self._refill(now)
+        keys = []
+        while self._tokens >= 1:
+            due_key = self._schedule.pop_due(now)
+            if due_key is None:
+                break
+            due, key = due_key
+            self._tokens -= 1
+            keys.append(key)
+            self._schedule.schedule(
+                key, max(due + self._probes[key].interval, now))
+        return keys
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill_ts
+        self._last_refill_ts = now
+        self._tokens = min(self._max_tokens,
+                           self._tokens + elapsed * self._max_probes_per_sec)
@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.probe_scheduler import ProbeScheduler
+from lib.testing import ClockTestCase
+
+
+class TestProbeScheduler(ClockTestCase):
+    def create_scheduler(self, interval=5.0, min_interval=1.0,
+                         max_probes_per_sec=1000):
+        return ProbeScheduler(interval, min_interval, max_probes_per_sec,
+                              self.clock)
+
+    def collect(self, scheduler, duration, step=0.01):
+        sent = []
+        end = self.clock.now + duration
+        while self.clock.now < end:
+            for key in scheduler.pop_due():
+                sent.append((round(self.clock.now, 2), key))
+            self.clock.now += step
+        return sent
+
+    def test_add(self):
+        scheduler = self.create_scheduler()
+        scheduler.add((1, 2))
+        scheduler.add((1, 2))
+
+        self.assertEqual(len(scheduler), 1)
+        self.assertIn((1, 2), scheduler)
+
+    def test_pop_due__spread_over_interval(self):
+        scheduler = self.create_scheduler(interval=5.0)
+        for port in range(10):
+            scheduler.add((1, port))
+
+        sent = self.collect(scheduler, 5.0)
+
+        self.assertEqual(sorted(key for _, key in sent),
+                         [(1, port) for port in range(10)])
+        # no more than two probes share any half a second of the interval
+        for slot in range(10):
+            start = 100.0 + slot * 0.5
+            self.assertLessEqual(
+                len([ts for ts, _ in sent if start <= ts < start + 0.5]), 2)
+
+    def test_pop_due__periodic(self):
+        scheduler = self.create_scheduler(interval=1.0)
+        scheduler.add((1, 2))
+
+        sent = self.collect(scheduler, 10.0)
+
+        self.assertEqual(len(sent), 10)
+
+    def test_pop_due__per_link_interval(self):
+        scheduler = self.create_scheduler(interval=1.0)
+        scheduler.add((1, 2))
+        scheduler.add((1, 3), interval=2.0)
+
+        sent = self.collect(scheduler, 10.0)
+
+        self.assertEqual(len([key for _, key in sent if key == (1, 2)]), 10)
+        self.assertEqual(len([key for _, key in sent if key == (1, 3)]), 5)
+
+    def test_pop_due__rate_limit(self):
+        scheduler = self.create_scheduler(interval=1.0, max_probes_per_sec=10)
+        for port in range(100):
+            scheduler.add((1, port))
+
+        sent = self.collect(scheduler, 2.0)
+
+        self.assertLessEqual(len(sent), 21)
+
+    def test_remove(self):
+        scheduler = self.create_scheduler(interval=1.0)
+        scheduler.add((1, 2))
+        scheduler.remove((1, 2))
+        scheduler.remove((1, 3))
+
+        self.assertEqual(self.collect(scheduler, 2.0), [])
+
+    def test_set_interval(self):
+        scheduler = self.create_scheduler(interval=5.0)
+        scheduler.add((1, 2))
+
+        scheduler.set_interval((1, 2), 2.0)
+
+        self.assertEqual(scheduler.get_interval((1, 2)), 2.0)
+
+    def test_set_unstable(self):
+        scheduler = self.create_scheduler(interval=8.0, min_interval=1.0)
+        scheduler.add((1, 2))
+
+        for expected in (4.0, 2.0, 1.0, 1.0):
+            scheduler.set_unstable((1, 2), True)
+            self.assertEqual(scheduler.get_interval((1, 2)), expected)
+
+        for expected in (2.0, 4.0, 8.0, 8.0):
+            scheduler.set_unstable((1, 2), False)
+            self.assertEqual(scheduler.get_interval((1, 2)), expected)
+
+        # unknown probes are ignored
+        scheduler.set_unstable((1, 3), True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import heapq
+import itertools
+
+
+class StaggeredSchedule:
+    # consecutive golden ratio steps spread start phases evenly
+    GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+    def __init__(self):
+        self._heap = []
+        self._seqs = {}
+        self._counter = itertools.count()
+        self._phase = 0.0
+
+    def __len__(self):
+        return len(self._seqs)
+
+    def __contains__(self, key):
+        return key in self._seqs
+
+    def add(self, key, now, interval):
+        self._phase = (self._phase + self.GOLDEN_RATIO_CONJUGATE) % 1
+        self.schedule(key, now + self._phase * interval)
+
+    def schedule(self, key, due):
+        seq = self._seqs[key] = next(self._counter)
+        heapq.heappush(self._heap, (due, seq, key))
+
+    def remove(self, key):
+        self._seqs.pop(key, None)
+
+    def pop_due(self, now):
+        while self._heap and self._heap[0][0] <= now:
+            due, seq, key = heapq.heappop(self._heap)
+            if self._seqs.get(key) == seq:
+                return due, key
+        return None
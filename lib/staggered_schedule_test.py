@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.staggered_schedule import StaggeredSchedule
+
+
+class TestStaggeredSchedule(unittest.TestCase):
+    def test_add(self):
+        schedule = StaggeredSchedule()
+        for key in range(5):
+            schedule.add(key, 100.0, 1.0)
+
+        dues = []
+        due_key = schedule.pop_due(101.0)
+        while due_key is not None:
+            dues.append(due_key[0])
+            due_key = schedule.pop_due(101.0)
+
+        self.assertEqual(len(schedule), 5)
+        self.assertEqual(len(dues), 5)
+        # start phases are spread over the interval
+        gaps = [b - a for a, b in zip(dues, dues[1:])]
+        self.assertGreater(min(gaps), 0.1)
+        self.assertTrue(all(100.0 <= due < 101.0 for due in dues))
+
+    def test_pop_due(self):
+        schedule = StaggeredSchedule()
+        schedule.schedule('a', 100.0)
+        schedule.schedule('b', 102.0)
+
+        self.assertIsNone(schedule.pop_due(99.0))
+        self.assertEqual(schedule.pop_due(101.0), (100.0, 'a'))
+        self.assertIsNone(schedule.pop_due(101.0))
+        self.assertIn('a', schedule)
+
+    def test_schedule__replaces_due(self):
+        schedule = StaggeredSchedule()
+        schedule.schedule('a', 100.0)
+        schedule.schedule('a', 105.0)
+
+        self.assertIsNone(schedule.pop_due(104.0))
+        self.assertEqual(schedule.pop_due(105.0), (105.0, 'a'))
+
+    def test_remove(self):
+        schedule = StaggeredSchedule()
+        schedule.schedule('a', 100.0)
+        schedule.remove('a')
+        schedule.remove('b')
+
+        self.assertIsNone(schedule.pop_due(200.0))
+        self.assertNotIn('a', schedule)
+        self.assertEqual(len(schedule), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import time
+
+from lib.staggered_schedule import StaggeredSchedule
+
+
+class DatapathPoll:
+    def __init__(self, interval):
+        self.interval = interval
+        self.backoff = 1
+        self.scheduled_ts = None
+        self.outstanding_since = None
+        self.pending_replies = 0
+        self.polls = 0
+        self.skipped = 0
+        self.timeouts = 0
+        self.last_lag = None
+        self.max_lag = 0.0
+
+    def is_outstanding(self):
+        return self.outstanding_since is not None
+
+
+class StatsPoller:
+    def __init__(self, interval, timeout, max_backoff=8,
+                 clock=time.monotonic):
+        self._interval = interval
+        self._timeout = timeout
+        self._max_backoff = max_backoff
+        self._clock = clock
+        self._polls = {}
+        self._schedule = StaggeredSchedule()
+
+    def __len__(self):
+        return len(self._polls)
+
+    def __contains__(self, dpid):
+        return dpid in self._polls
+
+    def add(self, dpid):
+        if dpid in self._polls:
+            return
+        poll = self._polls[dpid] = DatapathPoll(self._interval)
+        self._schedule.add(dpid, self._clock(), poll.interval)
+
+    def remove(self, dpid):
+        self._polls.pop(dpid, None)
+        self._schedule.remove(dpid)
+
+    def get_poll(self, dpid):
+        return self._polls.get(dpid)
+
+    def pop_due(self):
+        now = self._clock()
+        dpids = []
+        due_dpid = self._schedule.pop_due(now)
+        while due_dpid is not None:
+            due, dpid = due_dpid
+            poll = self._polls[dpid]
+            if self._start(poll, due, now):
+                dpids.append(dpid)
+            self._schedule.schedule(
+                dpid, max(due + poll.interval * poll.backoff, now))
+            due_dpid = self._schedule.pop_due(now)
+        return dpids
+
+    def expect_replies(self, dpid, replies):
+        poll = self._polls.get(dpid)
+        if poll is None or not poll.is_outstanding():
+            return
+        poll.pending_replies = replies
+        if not replies:
+            self._finish(poll)
+
+    def complete(self, dpid):
+        poll = self._polls.get(dpid)
+        if poll is None or not poll.is_outstanding():
+            return
+        poll.pending_replies -= 1
+        if poll.pending_replies <= 0:
+            self._finish(poll)
+
+    def _start(self, poll, due, now):
+        if poll.is_outstanding():
+            if now - poll.outstanding_since < self._timeout:
+                poll.skipped += 1
+                poll.backoff = min(self._max_backoff, poll.backoff * 2)
+                return False
+            poll.timeouts += 1
+        poll.polls += 1
+        poll.scheduled_ts = due
+        poll.outstanding_since = now
+        poll.pending_replies = 1
+        return True
+
+    def _finish(self, poll):
+        poll.last_lag = self._clock() - poll.scheduled_ts
+        poll.max_lag = max(poll.max_lag, poll.last_lag)
+        poll.outstanding_since = None
+        poll.backoff = max(1, poll.backoff // 2)
@@ -0,0 +1,156 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import unittest
+
+from lib.stats_poller import StatsPoller
+from lib.testing import ClockTestCase
+
+
+class TestStatsPoller(ClockTestCase):
+    def create_poller(self, interval=1.0, timeout=5.0, max_backoff=8):
+        return StatsPoller(interval, timeout, max_backoff, self.clock)
+
+    def collect(self, poller, duration, step=0.01, reply_delay=0.0):
+        sent = []
+        outstanding = []
+        end = self.clock.now + duration
+        while self.clock.now < end:
+            for dpid in [d for ts, d in outstanding if ts <= self.clock.now]:
+                poller.complete(dpid)
+            outstanding = [(ts, d) for ts, d in outstanding
+                           if ts > self.clock.now]
+            for dpid in poller.pop_due():
+                sent.append((round(self.clock.now, 2), dpid))
+                if reply_delay is not None:
+                    outstanding.append((self.clock.now + reply_delay, dpid))
+            self.clock.now += step
+        return sent
+
+    def test_add(self):
+        poller = self.create_poller()
+        poller.add(1)
+        poller.add(1)
+
+        self.assertEqual(len(poller), 1)
+        self.assertIn(1, poller)
+
+    def test_pop_due__staggered(self):
+        poller = self.create_poller(interval=1.0)
+        for dpid in range(10):
+            poller.add(dpid)
+
+        sent = self.collect(poller, 1.0)
+
+        self.assertEqual(sorted(dpid for _, dpid in sent), list(range(10)))
+        for slot in range(10):
+            start = 100.0 + slot * 0.1
+            self.assertLessEqual(
+                len([ts for ts, _ in sent if start <= ts < start + 0.1]), 2)
+
+    def test_pop_due__periodic(self):
+        poller = self.create_poller(interval=1.0)
+        poller.add(1)
+
+        sent = self.collect(poller, 10.0)
+
+        self.assertEqual(len(sent), 10)
+        self.assertEqual(poller.get_poll(1).skipped, 0)
+
+    def test_pop_due__skips_while_outstanding(self):
+        poller = self.create_poller(interval=1.0, timeout=100.0)
+        poller.add(1)
+
+        sent = self.collect(poller, 10.0, reply_delay=None)
+
+        poll = poller.get_poll(1)
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(poll.polls, 1)
+        # back off: skips at 1, 2, 4 and 8 intervals after the first poll
+        self.assertEqual(poll.skipped, 3)
+        self.assertEqual(poll.backoff, 8)
+
+    def test_pop_due__timeout(self):
+        poller = self.create_poller(interval=1.0, timeout=2.5,
+                                    max_backoff=1)
+        poller.add(1)
+
+        sent = self.collect(poller, 10.0, reply_delay=None)
+
+        poll = poller.get_poll(1)
+        self.assertEqual(len(sent), 4)
+        self.assertEqual(poll.timeouts, 3)
+        self.assertEqual(poll.skipped, 6)
+
+    def test_complete__lag(self):
+        poller = self.create_poller(interval=1.0)
+        poller.add(1)
+
+        self.collect(poller, 5.0, reply_delay=0.25)
+
+        poll = poller.get_poll(1)
+        self.assertAlmostEqual(poll.last_lag, 0.25, 2)
+        self.assertAlmostEqual(poll.max_lag, 0.25, 2)
+        self.assertFalse(poll.is_outstanding())
+
+    def test_complete__slow_datapath_recovers(self):
+        poller = self.create_poller(interval=1.0, timeout=100.0)
+        poller.add(1)
+
+        self.collect(poller, 4.0, reply_delay=None)
+        poller.complete(1)
+        self.collect(poller, 10.0)
+
+        self.assertEqual(poller.get_poll(1).backoff, 1)
+
+    def test_expect_replies(self):
+        poller = self.create_poller()
+        poller.add(1)
+        self.clock.now += 1.0
+        poller.pop_due()
+        poller.expect_replies(1, 2)
+
+        poller.complete(1)
+        self.assertTrue(poller.get_poll(1).is_outstanding())
+        poller.complete(1)
+        self.assertFalse(poller.get_poll(1).is_outstanding())
+
+    def test_expect_replies__none(self):
+        poller = self.create_poller()
+        poller.add(1)
+        self.clock.now += 1.0
+        poller.pop_due()
+        poller.expect_replies(1, 0)
+
+        self.assertFalse(poller.get_poll(1).is_outstanding())
+
+    def test_remove(self):
+        poller = self.create_poller()
+        poller.add(1)
+        poller.remove(1)
+        poller.complete(1)
+
+        self.assertEqual(self.collect(poller, 2.0), [])
+        self.assertNotIn(1, poller)
+
+
+if __name__ == '__main__':
+    unittest.main()
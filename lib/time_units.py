@@ -19,6 +19,9 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 #
+import math
+import time
+
 
 class TimeDelta:
     def __init__(self, delta_in_seconds):
@@ -38,21 +41,55 @@ class TimeStamp:
     def __init__(self, seconds):
         if isinstance(seconds, float):
             self._seconds = TimeStamp._normalize(seconds)
-            return
-
-        if isinstance(seconds, str):
+        elif isinstance(seconds, str):
             self._seconds = TimeStamp._normalize(float(seconds))
-            return
-        
-        raise ValueError('seconds must be float or string')
+        else:
+            raise ValueError('seconds must be float or string')
+        self._nanoseconds = round(self._seconds * 1e9)
+
+    @classmethod
+    def from_nanoseconds(cls, nanoseconds):
+        ts = cls.__new__(cls)
+        ts._nanoseconds = nanoseconds
+        ts._seconds = nanoseconds / 1e9
+        return ts
+
+    @classmethod
+    def now(cls):
+        return cls.from_nanoseconds(time.time_ns())
 
     @staticmethod
     def _normalize(t):
         k = 10000
         return int(t * k) / k
 
+    def seconds(self):
+        return self._seconds
+
+    def nanoseconds(self):
+        return self._nanoseconds
+
     def __str__(self):
         return str(self._seconds)
 
     def __sub__(self, other):
-        return TimeDelta(self._seconds - other._seconds)
\ No newline at end of file
+        return TimeDelta((self._nanoseconds - other._nanoseconds) / 1e9)
+
+
+DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def parse_duration(duration):
+    for unit in sorted(DURATION_UNITS, key=len, reverse=True):
+        if duration.endswith(unit):
+            number = duration[:-len(unit)]
+            break
+    else:
+        unit, number = 's', duration
+    try:
+        seconds = float(number) * DURATION_UNITS[unit]
+    except ValueError:
+        raise ValueError('invalid duration ' + repr(duration))
+    if not 0 <= seconds < math.inf:
+        raise ValueError('invalid duration ' + repr(duration))
+    return seconds
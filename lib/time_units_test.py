@@ -21,7 +21,7 @@
 #
 import unittest
 
-from lib.time_units import TimeStamp, TimeDelta
+from lib.time_units import TimeStamp, TimeDelta, parse_duration
 
 
 class TestTimeStamp(unittest.TestCase):
@@ -41,6 +41,19 @@ class TestTimeStamp(unittest.TestCase):
         ts2 = TimeStamp('12.456')
         self.assertEqual(str(ts2), '12.456')
 
+    def test_from_nanoseconds(self):
+        ts = TimeStamp.from_nanoseconds(1586869012160612345)
+
+        self.assertEqual(ts.nanoseconds(), 1586869012160612345)
+        self.assertAlmostEqual(ts.seconds(), 1586869012.1606123)
+
+    def test_now(self):
+        self.assertIsInstance(TimeStamp.now().nanoseconds(), int)
+
+    def test_seconds(self):
+        self.assertEqual(TimeStamp(3.21).seconds(), 3.21)
+        self.assertEqual(TimeStamp(3.21).nanoseconds(), 3210000000)
+
     def test__sub__(self):
         ts1 = TimeStamp(10.51)
         ts2 = TimeStamp(8.49)
@@ -48,6 +61,11 @@ class TestTimeStamp(unittest.TestCase):
 
         self.assertEqual(delta.milliseconds(), 2020.0)
 
+        # sub-millisecond precision
+        ts1 = TimeStamp.from_nanoseconds(1586869012160612345)
+        ts2 = TimeStamp.from_nanoseconds(1586869012160000000)
+        self.assertEqual((ts1 - ts2).milliseconds(), 0.612)
+
 
 class TestTimeDelta(unittest.TestCase):
     def test_milliseconds(self):
@@ -69,5 +87,24 @@ class TestTimeDelta(unittest.TestCase):
         self.assertEqual(td.seconds(5), 2.12346)
 
 
+class TestParseDuration(unittest.TestCase):
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration('60s'), 60.0)
+        self.assertEqual(parse_duration('60'), 60.0)
+        self.assertEqual(parse_duration('500ms'), 0.5)
+        self.assertEqual(parse_duration('5m'), 300.0)
+        self.assertEqual(parse_duration('2h'), 7200.0)
+
+    def test_parse_duration__invalid(self):
+        with self.assertRaisesRegex(ValueError, r"invalid duration 'abc'"):
+            parse_duration('abc')
+        with self.assertRaises(ValueError):
+            parse_duration('-5s')
+        with self.assertRaisesRegex(ValueError, r"invalid duration 'nan'"):
+            parse_duration('nan')
+        with self.assertRaisesRegex(ValueError, r"invalid duration 'infs'"):
+            parse_duration('infs')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -19,33 +19,9 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 #
-from lib.util import delete_duplicates_from_list
+import collections
 
-
-class Topology:
-    def __init__(self):
-        self._dpid_and_opposite_port_to_opposite_dpid = {}
-        self._dpid_to_ports = {}
-
-    def get_ports(self, dpid):
-        return self._dpid_to_ports.setdefault(dpid, [])
-
-    def register_link(self, src_dpid, src_port_no, dst_dpid, dst_port_no):
-        self._dpid_and_opposite_port_to_opposite_dpid.setdefault(
-            src_dpid, {})[dst_port_no] = dst_dpid
-        self._dpid_and_opposite_port_to_opposite_dpid.setdefault(
-            dst_dpid, {})[src_port_no] = src_dpid
-
-        self._dpid_to_ports.setdefault(src_dpid, []).append(src_port_no)
-        self._dpid_to_ports[src_dpid] = delete_duplicates_from_list(
-            self._dpid_to_ports[src_dpid])
-        self._dpid_to_ports.setdefault(dst_dpid, []).append(dst_port_no)
-        self._dpid_to_ports[dst_dpid] = delete_duplicates_from_list(
-            self._dpid_to_ports[dst_dpid])
-
-    def get_opposite_dpid(self, dpid, opposite_port_no):
-        return self._dpid_and_opposite_port_to_opposite_dpid.setdefault(
-            dpid, {}).setdefault(opposite_port_no, 0)
+from lib.generations import Generations
 
 
 class Link:
@@ -56,9 +32,8 @@ class Link:
         self.dst_port_no = dst_port_no
 
     def __hash__(self):
-        return hash(
-            str(self.src_dpid) + str(self.src_port_no) + str(self.dst_dpid) +
-            str(self.dst_port_no))
+        return hash((self.src_dpid, self.src_port_no, self.dst_dpid,
+                     self.dst_port_no))
 
     def __eq__(self, other):
         return self.src_dpid == other.src_dpid and \
@@ -76,42 +51,176 @@ class Link:
 class LinkRepository:
     def __init__(self):
         self._links = {}
+        self._links_by_dpids = {}
+        self._links_by_dpid = {}
+        self._ports = {}
+        self._peers = {}
+        self._adjacency = {}
+        self._bidirectional_links = BidirectionalLinkSet()
+        self.generations = Generations()
+
+    def __len__(self):
+        return len(self._links)
 
     def register_link(self, src_dpid, src_port_no, dst_dpid, dst_port_no):
         link = Link(src_dpid, src_port_no, dst_dpid, dst_port_no)
+        if link in self._links:
+            return None
         self._links[link] = link
+        self._links_by_dpids[(src_dpid, dst_dpid)] = link
+        self._links_by_dpid.setdefault(src_dpid, set()).add(link)
+        self._links_by_dpid.setdefault(dst_dpid, set()).add(link)
+        _increment(self._ports.setdefault(src_dpid, {}), src_port_no)
+        _increment(self._ports.setdefault(dst_dpid, {}), dst_port_no)
+        _increment(self._adjacency.setdefault(src_dpid, {}), dst_dpid)
+        _increment(self._adjacency.setdefault(dst_dpid, {}), src_dpid)
+        self._peers[(src_dpid, src_port_no)] = (dst_dpid, dst_port_no)
+        self._peers[(dst_dpid, dst_port_no)] = (src_dpid, src_port_no)
+        self._bidirectional_links.add(link)
+        self.generations.touch()
+        return link
+
+    def unregister_link(self, src_dpid, src_port_no, dst_dpid, dst_port_no):
+        link = self._links.pop(
+            Link(src_dpid, src_port_no, dst_dpid, dst_port_no), None)
+        if link is None:
+            return None
+        for dpid in (src_dpid, dst_dpid):
+            links = self._links_by_dpid[dpid]
+            links.discard(link)
+            if not links:
+                del self._links_by_dpid[dpid]
+        for dpid, port_no in ((src_dpid, src_port_no),
+                              (dst_dpid, dst_port_no)):
+            if not _decrement(self._ports, dpid, port_no):
+                self._peers.pop((dpid, port_no), None)
+        _decrement(self._adjacency, src_dpid, dst_dpid)
+        _decrement(self._adjacency, dst_dpid, src_dpid)
+        self._bidirectional_links.remove(link)
+        if self._links_by_dpids.get((src_dpid, dst_dpid)) == link:
+            del self._links_by_dpids[(src_dpid, dst_dpid)]
+            for parallel_link in self._links_by_dpid.get(src_dpid, ()):
+                if parallel_link.src_dpid == src_dpid and \
+                        parallel_link.dst_dpid == dst_dpid:
+                    self._links_by_dpids[(src_dpid,
+                                          dst_dpid)] = parallel_link
+        self.generations.touch()
+        return link
+
+    def remove_datapath(self, dpid):
+        links = list(self._links_by_dpid.get(dpid, ()))
+        for link in links:
+            self.unregister_link(link.src_dpid, link.src_port_no,
+                                 link.dst_dpid, link.dst_port_no)
+        return links
+
+    def get_ports(self, dpid):
+        return list(self._ports.get(dpid, ()))
+
+    def get_peer(self, dpid, port_no):
+        return self._peers.get((dpid, port_no))
+
+    def get_neighbors(self, dpid):
+        return list(self._adjacency.get(dpid, ()))
+
+    def find_links_of_datapath(self, dpid):
+        return list(self._links_by_dpid.get(dpid, ()))
+
+    def find_link(self, src_dpid, dst_dpid):
+        return self._links_by_dpids.get((src_dpid, dst_dpid))
+
+    def find_path(self, src_dpid, dst_dpid):
+        parents = {src_dpid: None}
+        queue = collections.deque([src_dpid])
+        while queue and dst_dpid not in parents:
+            dpid = queue.popleft()
+            for neighbor in self._adjacency.get(dpid, ()):
+                if neighbor not in parents and \
+                        (dpid, neighbor) in self._links_by_dpids:
+                    parents[neighbor] = dpid
+                    queue.append(neighbor)
+        if dst_dpid not in parents:
+            return None
+        path = []
+        dpid = dst_dpid
+        while parents[dpid] is not None:
+            path.append(self._links_by_dpids[(parents[dpid], dpid)])
+            dpid = parents[dpid]
+        path.reverse()
+        return path
 
     def find_directed_links(self):
         return self._links.values()
 
     def find_bidirectional_links(self):
-        s = BidirectionalLinkSet()
-        for link in self.find_directed_links():
-            s.add(link)
-        return s.get_all()
+        return self._bidirectional_links.get_all()
 
 
 class BidirectionalLinkSet:
     def __init__(self):
         self._directed_links = {}
-        self._bidirectional_links = []
-
-    def _get_opposit_link(self, link):
-        first_direction_link = self._directed_links.setdefault(
-            link.src_dpid, {}).setdefault(link.dst_dpid, None)
-        if first_direction_link:
-            return first_direction_link
+        self._bidirectional_links = {}
+        self._all = []
 
-        second_direction_link = self._directed_links.setdefault(
-            link.dst_dpid, {}).setdefault(link.src_dpid, None)
-        return second_direction_link
+    def __len__(self):
+        return len(self._bidirectional_links)
 
     def add(self, link):
-        opposite_link = self._get_opposit_link(link)
-        if opposite_link:
-            self._bidirectional_links.append(link)
+        direction = (link.src_dpid, link.dst_dpid)
+        links = self._directed_links.get(direction)
+        if links is None:
+            links = self._directed_links[direction] = {}
+        elif link in links:
+            return
+        links[link] = None
+        pair = _dpid_pair(link)
+        if pair not in self._bidirectional_links and \
+                (link.dst_dpid, link.src_dpid) in self._directed_links:
+            self._bidirectional_links[pair] = link
+            self._all = None
+
+    def remove(self, link):
+        direction = (link.src_dpid, link.dst_dpid)
+        links = self._directed_links.get(direction)
+        if links is None or link not in links:
+            return
+        del links[link]
+        if not links:
+            del self._directed_links[direction]
+        pair = _dpid_pair(link)
+        representative = self._bidirectional_links.get(pair)
+        if representative is None:
+            return
+        if not links or \
+                (link.dst_dpid, link.src_dpid) not in self._directed_links:
+            del self._bidirectional_links[pair]
+        elif representative is link:
+            self._bidirectional_links[pair] = next(iter(links))
         else:
-            self._directed_links[link.src_dpid][link.dst_dpid] = link
+            return
+        self._all = None
 
     def get_all(self):
-        return self._bidirectional_links
+        if self._all is None:
+            self._all = list(self._bidirectional_links.values())
+        return self._all
+
+
+def _dpid_pair(link):
+    return (min(link.src_dpid, link.dst_dpid),
+            max(link.src_dpid, link.dst_dpid))
+
+
+def _increment(counts, key):
+    counts[key] = counts.get(key, 0) + 1
+
+
+def _decrement(counts_by_dpid, dpid, key):
+    counts = counts_by_dpid[dpid]
+    counts[key] -= 1
+    if counts[key]:
+        return True
+    del counts[key]
+    if not counts:
+        del counts_by_dpid[dpid]
+    return False
@@ -21,51 +21,7 @@
 #
 import unittest
 
-from lib.topology import Topology, Link, LinkRepository, BidirectionalLinkSet
-
-
-class TestTopology(unittest.TestCase):
-    def test_get_opposite_dpid__empty_topology(self):
-        topo = Topology()
-
-        self.assertEqual(topo.get_opposite_dpid(1, 19), 0)
-
-    def test_get_opposite_dpid(self):
-        topo = Topology()
-
-        topo.register_link(1, 24, 2, 19)
-
-        self.assertEqual(topo.get_opposite_dpid(1, 19), 2)
-        self.assertEqual(topo.get_opposite_dpid(2, 24), 1)
-
-    def test_get_ports__empty_topology(self):
-        topo = Topology()
-
-        self.assertEqual(topo.get_ports(1), [])
-
-    def test_get_ports(self):
-        topo = Topology()
-
-        self.assertEqual(topo.get_ports(1), [])
-
-        topo.register_link(1, 24, 2, 19)
-        topo.register_link(1, 21, 3, 10)
-
-        self.assertEqual(topo.get_ports(1), [24, 21])
-        self.assertEqual(topo.get_ports(2), [19])
-        self.assertEqual(topo.get_ports(3), [10])
-
-    def test_register_link__multiple_times(self):
-        topo = Topology()
-
-        for _ in range(10):
-            topo.register_link(1, 24, 2, 19)
-
-        self.assertEqual(topo.get_ports(2), [19])
-        self.assertEqual(topo.get_opposite_dpid(1, 19), 2)
-        # check side effects
-        self.assertEqual(topo.get_ports(10), [])
-        self.assertEqual(topo.get_opposite_dpid(15, 4), 0)
+from lib.topology import Link, LinkRepository, BidirectionalLinkSet
 
 
 class TestLink(unittest.TestCase):
@@ -122,6 +78,176 @@ class TestLinkRepository(unittest.TestCase):
 
         self.assertListEqual(repo.find_bidirectional_links(), [link2])
 
+    def test_find_bidirectional_links__unregister_link(self):
+        repo = LinkRepository()
+        repo.register_link(1, 19, 2, 24)
+        repo.register_link(2, 24, 1, 19)
+        repo.register_link(2, 21, 3, 9)
+        repo.register_link(3, 9, 2, 21)
+
+        repo.unregister_link(1, 19, 2, 24)
+        self.assertListEqual(repo.find_bidirectional_links(),
+                             [Link(3, 9, 2, 21)])
+
+        repo.remove_datapath(3)
+        self.assertListEqual(repo.find_bidirectional_links(), [])
+
+    def test_find_path(self):
+        repo = LinkRepository()
+        for src_dpid, dst_dpid in ((1, 2), (2, 3), (3, 4), (1, 5), (5, 4)):
+            repo.register_link(src_dpid, dst_dpid, dst_dpid, src_dpid)
+            repo.register_link(dst_dpid, src_dpid, src_dpid, dst_dpid)
+
+        self.assertListEqual(repo.find_path(1, 4), [
+            Link(1, 5, 5, 1), Link(5, 4, 4, 5)
+        ])
+        self.assertListEqual(repo.find_path(3, 1), [
+            Link(3, 2, 2, 3), Link(2, 1, 1, 2)
+        ])
+        self.assertListEqual(repo.find_path(2, 2), [])
+
+    def test_find_path__unreachable(self):
+        repo = LinkRepository()
+        repo.register_link(1, 2, 2, 1)
+        repo.register_link(3, 4, 4, 3)
+        repo.register_link(4, 3, 3, 4)
+
+        self.assertListEqual(repo.find_path(1, 2), [Link(1, 2, 2, 1)])
+        self.assertIsNone(repo.find_path(2, 1))
+        self.assertIsNone(repo.find_path(1, 3))
+        self.assertIsNone(repo.find_path(1, 9))
+
+    def test_find_link(self):
+        repo = LinkRepository()
+        repo.register_link(1, 19, 2, 24)
+
+        self.assertEqual(repo.find_link(1, 2), Link(1, 19, 2, 24))
+        self.assertIsNone(repo.find_link(2, 1))
+
+    def test_unregister_link(self):
+        repo = LinkRepository()
+        repo.register_link(1, 19, 2, 24)
+        repo.register_link(2, 24, 1, 19)
+        generation = repo.generations.generation
+
+        self.assertEqual(repo.unregister_link(1, 19, 2, 24),
+                         Link(1, 19, 2, 24))
+        self.assertIsNone(repo.unregister_link(1, 19, 2, 24))
+
+        self.assertIsNone(repo.find_link(1, 2))
+        self.assertListEqual(list(repo.find_directed_links()),
+                             [Link(2, 24, 1, 19)])
+        self.assertEqual(repo.generations.generation, generation + 1)
+
+    def test_unregister_link__parallel_link(self):
+        repo = LinkRepository()
+        repo.register_link(1, 19, 2, 24)
+        repo.register_link(1, 20, 2, 25)
+
+        repo.unregister_link(1, 20, 2, 25)
+
+        self.assertEqual(repo.find_link(1, 2), Link(1, 19, 2, 24))
+
+    def test_remove_datapath(self):
+        repo = LinkRepository()
+        repo.register_link(1, 19, 2, 24)
+        repo.register_link(2, 24, 1, 19)
+        repo.register_link(2, 21, 3, 9)
+
+        removed = repo.remove_datapath(1)
+
+        self.assertSetEqual(set(removed),
+                            {Link(1, 19, 2, 24),
+                             Link(2, 24, 1, 19)})
+        self.assertEqual(len(repo), 1)
+        self.assertIsNone(repo.find_link(2, 1))
+        self.assertEqual(repo.find_link(2, 3), Link(2, 21, 3, 9))
+        self.assertEqual(repo.get_ports(1), [])
+        self.assertEqual(repo.get_ports(2), [21])
+        self.assertListEqual(repo.find_links_of_datapath(1), [])
+        self.assertListEqual(repo.remove_datapath(1), [])
+
+    def test_get_peer__empty_topology(self):
+        repo = LinkRepository()
+
+        self.assertIsNone(repo.get_peer(1, 19))
+        self.assertEqual(repo.get_ports(1), [])
+        self.assertEqual(repo.get_neighbors(1), [])
+
+    def test_get_peer(self):
+        repo = LinkRepository()
+
+        repo.register_link(1, 24, 2, 19)
+
+        self.assertEqual(repo.get_peer(1, 24), (2, 19))
+        self.assertEqual(repo.get_peer(2, 19), (1, 24))
+        self.assertIsNone(repo.get_peer(1, 19))
+
+    def test_get_ports(self):
+        repo = LinkRepository()
+
+        repo.register_link(1, 24, 2, 19)
+        repo.register_link(1, 21, 3, 10)
+
+        self.assertEqual(repo.get_ports(1), [24, 21])
+        self.assertEqual(repo.get_ports(2), [19])
+        self.assertEqual(repo.get_ports(3), [10])
+
+    def test_get_neighbors(self):
+        repo = LinkRepository()
+
+        repo.register_link(1, 24, 2, 19)
+        repo.register_link(2, 19, 1, 24)
+        repo.register_link(1, 21, 3, 10)
+
+        self.assertEqual(repo.get_neighbors(1), [2, 3])
+        self.assertEqual(repo.get_neighbors(3), [1])
+
+    def test_register_link__multiple_times(self):
+        repo = LinkRepository()
+
+        self.assertEqual(repo.register_link(1, 24, 2, 19), Link(1, 24, 2, 19))
+        for _ in range(10):
+            self.assertIsNone(repo.register_link(1, 24, 2, 19))
+
+        self.assertEqual(repo.get_ports(2), [19])
+        self.assertEqual(repo.get_peer(1, 24), (2, 19))
+        # check side effects
+        self.assertEqual(repo.get_ports(10), [])
+        self.assertIsNone(repo.get_peer(15, 4))
+
+    def test_unregister_link__ports(self):
+        repo = LinkRepository()
+        repo.register_link(1, 24, 2, 19)
+        repo.register_link(2, 19, 1, 24)
+        repo.register_link(1, 21, 3, 10)
+
+        repo.unregister_link(1, 24, 2, 19)
+
+        # the reverse direction still uses both ports
+        self.assertEqual(repo.get_ports(1), [24, 21])
+        self.assertEqual(repo.get_peer(1, 24), (2, 19))
+        self.assertEqual(repo.get_neighbors(1), [2, 3])
+
+        repo.unregister_link(2, 19, 1, 24)
+
+        self.assertEqual(repo.get_ports(1), [21])
+        self.assertEqual(repo.get_ports(2), [])
+        self.assertIsNone(repo.get_peer(1, 24))
+        self.assertEqual(repo.get_neighbors(1), [3])
+        self.assertEqual(repo.get_neighbors(2), [])
+
+    def test_register_link__generations(self):
+        repo = LinkRepository()
+        self.assertEqual(repo.generations.generation, 0)
+
+        repo.register_link(1, 19, 2, 24)
+        repo.register_link(1, 19, 2, 24)
+        self.assertEqual(repo.generations.generation, 1)
+
+        repo.register_link(2, 24, 1, 19)
+        self.assertEqual(repo.generations.generation, 2)
+
 
 class TestBidirectionalLinkSet(unittest.TestCase):
     def test_add(self):
@@ -143,6 +269,73 @@ class TestBidirectionalLinkSet(unittest.TestCase):
         expected = [link2, link5]
         self.assertListEqual(s.get_all(), expected)
 
+    def test_add__same_link_twice(self):
+        link1 = Link(1, 19, 2, 24)
+        link2 = Link(2, 24, 1, 19)
+
+        s = BidirectionalLinkSet()
+        s.add(link1)
+        s.add(link1)
+        self.assertListEqual(s.get_all(), [])
+
+        s.add(link2)
+        s.add(link2)
+        self.assertListEqual(s.get_all(), [link2])
+
+    def test_remove(self):
+        link1 = Link(1, 19, 2, 24)
+        link2 = Link(2, 24, 1, 19)
+
+        s = BidirectionalLinkSet()
+        s.add(link1)
+        s.add(link2)
+        s.remove(link1)
+        self.assertListEqual(s.get_all(), [])
+
+        s.add(link1)
+        self.assertListEqual(s.get_all(), [link1])
+
+    def test_remove__parallel_link(self):
+        link1 = Link(1, 19, 2, 24)
+        link2 = Link(2, 24, 1, 19)
+        link3 = Link(2, 25, 1, 20)
+
+        s = BidirectionalLinkSet()
+        s.add(link1)
+        s.add(link2)
+        s.add(link3)
+        s.remove(link2)
+        self.assertListEqual(s.get_all(), [link3])
+
+        s.remove(link3)
+        self.assertListEqual(s.get_all(), [])
+        self.assertEqual(len(s), 0)
+
+    def test_remove__unknown_link(self):
+        link1 = Link(1, 19, 2, 24)
+        link2 = Link(2, 24, 1, 19)
+
+        s = BidirectionalLinkSet()
+        s.add(link1)
+        s.add(link2)
+        s.remove(Link(3, 1, 4, 1))
+        self.assertListEqual(s.get_all(), [link2])
+
+    def test_get_all__cached(self):
+        s = BidirectionalLinkSet()
+        s.add(Link(1, 19, 2, 24))
+        s.add(Link(2, 24, 1, 19))
+        all_links = s.get_all()
+
+        self.assertIs(s.get_all(), all_links)
+
+        s.add(Link(2, 21, 3, 9))
+        self.assertIs(s.get_all(), all_links)
+
+        s.add(Link(3, 9, 2, 21))
+        self.assertIsNot(s.get_all(), all_links)
+        self.assertEqual(len(s.get_all()), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -21,10 +21,6 @@
 #
 
 
-def delete_duplicates_from_list(lst):
-    return list(dict.fromkeys(lst))
-
-
 def dpid_to_string(dpid):
     dpid_raw_str = format(dpid, '016x')
     dpid_str = ''
@@ -34,4 +30,8 @@ def dpid_to_string(dpid):
         if i % 2 == 1 and i < len(dpid_raw_str) - 1:
             dpid_str += ':'
 
-    return dpid_str
\ No newline at end of file
+    return dpid_str
+
+
+def string_to_dpid(dpid_str):
+    return int(dpid_str.replace(':', ''), 16)
@@ -21,7 +21,7 @@
 #
 import unittest
 
-from lib.util import dpid_to_string
+from lib.util import dpid_to_string, string_to_dpid
 
 
 class TestUtil(unittest.TestCase):
@@ -31,3 +31,9 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(dpid_to_string(100), '00:00:00:00:00:00:00:64')
         self.assertEqual(dpid_to_string(23154342353),
                          '00:00:00:05:64:1b:39:d1')
+
+    def test_string_to_dpid(self):
+        self.assertEqual(string_to_dpid('00:00:00:00:00:00:00:01'), 1)
+        self.assertEqual(string_to_dpid('000000000000000a'), 10)
+        self.assertEqual(string_to_dpid('00:00:00:05:64:1b:39:d1'),
+                         23154342353)
@@ -21,7 +21,7 @@
 #
 from ryu.base import app_manager
 from ryu.controller import ofp_event
-from ryu.controller.handler import CONFIG_DISPATCHER, MAIN_DISPATCHER
+from ryu.controller.handler import CONFIG_DISPATCHER, DEAD_DISPATCHER
 from ryu.controller.handler import set_ev_cls
 from ryu.ofproto import ofproto_v1_3
 from ryu.lib.packet import packet
@@ -29,16 +29,17 @@ from ryu.lib.packet import ipv4
 from ryu.lib.packet import tcp
 from ryu.lib.packet import in_proto
 from ryu.lib.packet import ethernet
-from ryu.lib import hub
-from ryu.topology import event
-from ryu.topology.api import get_link
 
-import copy
 import time
 
-from lib.topology import Topology
-from lib.measurement_repositories import LinkLatencyRepository
-from lib.packets import TestPacket, ReceivedTestPacket
+import options
+from topology_service import EventLinkAdded, EventLinkRemoved
+from lib.probe_scheduler import ProbeScheduler
+from lib.measurement_repositories import LinkLatencyRepository, \
+    ProbeLossRepository
+from lib.packets import TestPacket, ReceivedTestPacket, ProbeTemplate, \
+    ProbeTemplateCache, ETHERNET_HEADER_SIZE, PROBE_SIZE
+from lib.flows import add_eth_type_flow, add_table_miss_flow, PROBE_PRIORITY
 
 
 class LinkMonitor(app_manager.RyuApp):
@@ -51,19 +52,58 @@ class LinkMonitor(app_manager.RyuApp):
     def __init__(self, *args, **kwargs):
         super(LinkMonitor, self).__init__(*args, **kwargs)
         self.datapaths = {}
-        self.link_latency_repository = LinkLatencyRepository()
-        self.topology = Topology()
-        self.monitor_thread = hub.spawn(self._monitor)
-
-    def _monitor(self):
-        while True:
-            time.sleep(5)
-            for dp in self.datapaths.values():
-                for port in self.topology.get_ports(dp.id):
-                    self.send_test_packet(dp, TestPacket(port), port)
-            self.logger.debug(self.link_latency_repository)
+        self.link_latency_repository = LinkLatencyRepository(
+            self.CONF.history_depth, self.CONF.delay_ewma_alpha)
+        self.probe_loss_repository = ProbeLossRepository(
+            self.CONF.probe_loss_window, self.CONF.probe_timeout)
+        self.link_repository = None
+        self.probe_templates = ProbeTemplateCache()
+        self.probe_scheduler = ProbeScheduler(self.CONF.probe_interval,
+                                              self.CONF.probe_min_interval,
+                                              self.CONF.probe_rate_limit)
+
+    def start(self):
+        super(LinkMonitor, self).start()
+        self.link_repository = app_manager.lookup_service_brick(
+            'TopologyService').link_repository
+        app_manager.lookup_service_brick('PacketInService').register(
+            self._test_packet_handler, self.ETH_TYPE)
+        scheduler = app_manager.lookup_service_brick('PeriodicScheduler')
+        scheduler.add_job('probes', self.CONF.probe_tick,
+                          self._send_due_probes)
+
+    def _send_due_probes(self):
+        for dpid, port in self.probe_scheduler.pop_due():
+            dp = self.datapaths.get(dpid)
+            if dp is not None:
+                seq_num = self.probe_loss_repository.record_sent(
+                    dpid, port, time.monotonic())
+                self.send_test_packet(dp, TestPacket(port, dpid, seq_num),
+                                      port)
+
+    def _schedule_probes(self):
+        for dpid in self.datapaths:
+            for port in self.link_repository.get_ports(dpid):
+                self.probe_scheduler.add((dpid, port))
 
     def send_test_packet(self, datapath, packet_payload, out_port):
+        template = self.probe_templates.get(datapath.id, out_port)
+        if template is None:
+            template = self.create_probe_template(datapath, out_port)
+            self.probe_templates.add(datapath.id, out_port, template)
+        self.logger.debug('sending msg %s to  %016x; out_port %d',
+                          packet_payload, datapath.id, out_port)
+        datapath.send(template.render(packet_payload))
+
+    def create_probe_template(self, datapath, out_port):
+        out = self.build_test_packet_out(
+            datapath, TestPacket(out_port, datapath.id), out_port)
+        datapath.set_xid(out)
+        out.serialize()
+        payload_offset = len(out.buf) - len(out.data) + ETHERNET_HEADER_SIZE
+        return ProbeTemplate(out.buf, payload_offset)
+
+    def build_test_packet_out(self, datapath, packet_payload, out_port):
         ofproto = datapath.ofproto
         parser = datapath.ofproto_parser
 
@@ -72,75 +112,80 @@ class LinkMonitor(app_manager.RyuApp):
             ethernet.ethernet(src=self.SRC_MAC,
                               dst=self.DST_MAC,
                               ethertype=self.ETH_TYPE))
-        pkt.add_protocol(str(packet_payload).encode())
+        pkt.add_protocol(packet_payload.to_bytes())
         pkt.serialize()
 
         actions = [parser.OFPActionOutput(out_port)]
-        out = parser.OFPPacketOut(datapath=datapath,
-                                  buffer_id=ofproto.OFP_NO_BUFFER,
-                                  in_port=ofproto.OFPP_CONTROLLER,
-                                  actions=actions,
-                                  data=pkt.data)
-        self.logger.debug('sending msg %s to  %016x; out_port %d',
-                          packet_payload, datapath.id, out_port)
-        datapath.send_msg(out)
+        return parser.OFPPacketOut(datapath=datapath,
+                                   buffer_id=ofproto.OFP_NO_BUFFER,
+                                   in_port=ofproto.OFPP_CONTROLLER,
+                                   actions=actions,
+                                   data=pkt.data)
 
-    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
-    def _packet_in_handler(self, ev):
-        msg = ev.msg
+    def _test_packet_handler(self, msg):
         datapath = msg.datapath
-        ofproto = datapath.ofproto
-        parser = datapath.ofproto_parser
-
-        pkt = packet.Packet(msg.data)
-        eth_pkt = pkt.get_protocol(ethernet.ethernet)
-        dst = eth_pkt.dst
-        src = eth_pkt.src
-        self.logger.debug("packet in from %016x; src=%s dst=%s", datapath.id,
-                          src, dst)
-        if src == self.SRC_MAC and dst == self.DST_MAC:
-            payload = pkt.protocols[-1]
-            self.logger.debug("test packet received")
-            payload_string = payload.decode()
-            self.logger.debug("payload: %s", payload_string)
-            pkt = TestPacket.from_string(payload_string)
-            dst_dpid = datapath.id
-            src_dpid = self.topology.get_opposite_dpid(dst_dpid, pkt._src_port)
-            rpkt = ReceivedTestPacket(src_dpid, dst_dpid, pkt._send_ts)
-            self.link_latency_repository.parse_test_packet(rpkt)
-
-    @set_ev_cls(event.EventSwitchEnter)
-    def handler_switch_enter(self, ev):
-        for link in copy.copy(get_link(self)):
-            self.topology.register_link(link.src.dpid, link.src.port_no,
-                                        link.dst.dpid, link.dst.port_no)
+        try:
+            pkt = TestPacket.from_bytes(memoryview(msg.data),
+                                        ETHERNET_HEADER_SIZE)
+        except ValueError as e:
+            self.logger.debug('test packet from %016x dropped: %s',
+                              datapath.id, e)
+            return
+        self.logger.debug("test packet from %016x: %s", datapath.id, pkt)
+        if pkt._src_dpid not in self.datapaths:
+            return
+        rpkt = ReceivedTestPacket(pkt._src_dpid, datapath.id, pkt._send_ts,
+                                  pkt._src_port, pkt._seq_num)
+        self.link_latency_repository.parse_test_packet(rpkt)
+        self.probe_loss_repository.parse_test_packet(rpkt)
+        estimator = self.link_latency_repository.get_latency_estimator(
+            rpkt.src_dpid, rpkt.dst_dpid)
+        self.probe_scheduler.set_unstable(
+            (pkt._src_dpid, pkt._src_port),
+            estimator.is_unstable(self.CONF.probe_instability_threshold))
+
+    @set_ev_cls(EventLinkAdded)
+    def handler_link_added(self, ev):
+        link = ev.link
+        for dpid, port in ((link.src_dpid, link.src_port_no),
+                           (link.dst_dpid, link.dst_port_no)):
+            if dpid in self.datapaths:
+                self.probe_scheduler.add((dpid, port))
+
+    @set_ev_cls(EventLinkRemoved)
+    def handler_link_removed(self, ev):
+        link = ev.link
+        if self.link_repository.find_link(link.src_dpid,
+                                          link.dst_dpid) is None:
+            self.link_latency_repository.remove_link(link.src_dpid,
+                                                     link.dst_dpid)
+        for dpid, port in ((link.src_dpid, link.src_port_no),
+                           (link.dst_dpid, link.dst_port_no)):
+            if port not in self.link_repository.get_ports(dpid):
+                self.probe_scheduler.remove((dpid, port))
+                self.probe_templates.remove(dpid, port)
+                self.probe_loss_repository.remove_port(dpid, port)
+
+    @set_ev_cls(ofp_event.EventOFPStateChange, DEAD_DISPATCHER)
+    def _state_change_handler(self, ev):
+        dpid = ev.datapath.id
+        if dpid not in self.datapaths:
+            return
+        self.logger.debug('datapath %016x unregistered', dpid)
+        del self.datapaths[dpid]
+        for port in self.link_repository.get_ports(dpid):
+            self.probe_scheduler.remove((dpid, port))
+        self.probe_templates.remove_datapath(dpid)
+        self.link_latency_repository.remove_datapath(dpid)
+        self.probe_loss_repository.remove_datapath(dpid)
 
     @set_ev_cls(ofp_event.EventOFPSwitchFeatures, CONFIG_DISPATCHER)
     def switch_features_handler(self, ev):
         datapath = ev.msg.datapath
-        ofproto = datapath.ofproto
-        parser = datapath.ofproto_parser
-
-        # install the table-miss flow entry.
-        match = parser.OFPMatch()
-        actions = [
-            parser.OFPActionOutput(ofproto.OFPP_CONTROLLER,
-                                   ofproto.OFPCML_NO_BUFFER)
-        ]
-        self.add_flow(datapath, 0, match, actions)
+        add_table_miss_flow(datapath, self.CONF.table_miss)
+        add_eth_type_flow(datapath, PROBE_PRIORITY, self.ETH_TYPE, PROBE_SIZE)
 
         self.logger.debug('datapath %016x registered', datapath.id)
         self.datapaths[datapath.id] = datapath
-
-    def add_flow(self, datapath, priority, match, actions):
-        ofproto = datapath.ofproto
-        parser = datapath.ofproto_parser
-
-        inst = [
-            parser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)
-        ]
-        mod = parser.OFPFlowMod(datapath=datapath,
-                                priority=priority,
-                                match=match,
-                                instructions=inst)
-        datapath.send_msg(mod)
+        self.probe_templates.remove_datapath(datapath.id)
+        self._schedule_probes()
@@ -21,107 +21,106 @@
 #
 from ryu.base import app_manager
 from ryu.controller import ofp_event
-from ryu.controller.handler import CONFIG_DISPATCHER, MAIN_DISPATCHER
+from ryu.controller.handler import CONFIG_DISPATCHER, DEAD_DISPATCHER
 from ryu.controller.handler import set_ev_cls
 from ryu.ofproto import ofproto_v1_3
-from ryu.lib.packet import packet
-from ryu.lib.packet import ethernet
-from ryu.lib.packet import arp
-from ryu.lib.packet import icmp
 
-
-class IpTableEntry:
-    def __init__(self, adjacent_dpid, mac_address, ip_address):
-        self.adjacent_dpid = adjacent_dpid
-        self.mac_address = mac_address
-        self.ip_address = ip_address
+import options
+from packet_in_service import PacketInService
+from lib.arp import ArpPacket, ArpProxy, ArpReply, ArpUnicast, ARP_SIZE
+from lib.flows import add_eth_type_flow, ARP_PRIORITY, ETH_TYPE_ARP
+from lib.hosts import HostTable
 
 
 class MacDetector(app_manager.RyuApp):
     OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
 
+    _CONTEXTS = {'packet_in_service': PacketInService}
+
     def __init__(self, *args, **kwargs):
         super(MacDetector, self).__init__(*args, **kwargs)
-        self.ip_table = {}
+        self.datapaths = {}
+        self.host_table = HostTable(self.CONF.host_table_capacity,
+                                    self.CONF.host_ttl)
+        self.arp_proxy = ArpProxy(self.host_table, self.CONF.arp_source_rate,
+                                  self.CONF.arp_coalesce_window,
+                                  self.CONF.arp_flood_interval,
+                                  self.CONF.arp_max_floods,
+                                  self.CONF.host_ttl / 2,
+                                  self.CONF.host_table_capacity)
+        self.link_repository = None
+
+    def start(self):
+        super(MacDetector, self).start()
+        topology_service = app_manager.lookup_service_brick('TopologyService')
+        if topology_service is not None:
+            self.link_repository = topology_service.link_repository
+        app_manager.lookup_service_brick('PacketInService').register(
+            self._arp_handler, ETH_TYPE_ARP)
 
     @set_ev_cls(ofp_event.EventOFPSwitchFeatures, CONFIG_DISPATCHER)
     def switch_features_handler(self, ev):
         datapath = ev.msg.datapath
-        ofproto = datapath.ofproto
-        parser = datapath.ofproto_parser
-
-        # install the table-miss flow entry.
-        match = parser.OFPMatch()
-        actions = [
-            parser.OFPActionOutput(ofproto.OFPP_CONTROLLER,
-                                   ofproto.OFPCML_NO_BUFFER)
-        ]
-        self.add_flow(datapath, 0, match, actions)
+        add_eth_type_flow(datapath, ARP_PRIORITY, ETH_TYPE_ARP, ARP_SIZE)
 
         self.logger.debug('datapath %016x registered', datapath.id)
+        self.datapaths[datapath.id] = datapath
+
+    @set_ev_cls(ofp_event.EventOFPStateChange, DEAD_DISPATCHER)
+    def _state_change_handler(self, ev):
+        dpid = ev.datapath.id
+        if dpid not in self.datapaths:
+            return
+        del self.datapaths[dpid]
+        self.host_table.remove_datapath(dpid)
 
-    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
-    def _packet_in_handler(self, ev):
-        msg = ev.msg
+    def _arp_handler(self, msg):
         datapath = msg.datapath
         in_port = msg.match['in_port']
-
-        pkt = packet.Packet(msg.data)
-        eth_pkt = pkt.get_protocol(ethernet.ethernet)
-        icmp_pkt = pkt.get_protocol(icmp.icmp)
-        arp_pkt = pkt.get_protocol(arp.arp)
-        if arp_pkt:
-            self._handle_arp(arp_pkt, eth_pkt, datapath, in_port)
-
-    def _handle_arp(self, arp_pkt, eth_pkt, datapath, in_port):
-        if arp_pkt.opcode != arp.ARP_REQUEST:
+        try:
+            arp_pkt = ArpPacket.from_bytes(msg.data)
+        except ValueError as e:
+            self.logger.debug('ARP packet from %016x dropped: %s',
+                              datapath.id, e)
             return
 
-        dst_mac = arp_pkt.dst_mac
-        src_mac = arp_pkt.src_mac
-        dst_ip = arp_pkt.dst_ip
-        src_ip = arp_pkt.src_ip
-        self.logger.debug(
-            "ARP packet from %016x; src_mac=%s dst_mac=%s, src_ip=%s, dst_ip=%s",
-            datapath.id, src_mac, dst_mac, src_ip, dst_ip)
-
-        if arp_pkt.src_ip not in self.ip_table:
-            self.ip_table[src_ip] = IpTableEntry(datapath.id, src_mac, src_ip)
-
-        if arp_pkt.dst_ip in self.ip_table:
-            host = self.ip_table[arp_pkt.dst_ip]
-            self.reply_arp(datapath, in_port, host, arp_pkt, eth_pkt)
-            return
+        edge = self.link_repository is None or \
+            self.link_repository.get_peer(datapath.id, in_port) is None
+        for action in self.arp_proxy.handle(arp_pkt, datapath.id, in_port,
+                                            edge):
+            if isinstance(action, ArpReply):
+                self.send_packet(datapath, [in_port], action.data)
+            elif isinstance(action, ArpUnicast):
+                host_datapath = self.datapaths.get(action.host.dpid)
+                if host_datapath is not None:
+                    self.send_packet(host_datapath, [action.host.port_no],
+                                     action.data)
+            else:
+                self.flood_packet(action.data, datapath.id, in_port)
+
+    def flood_packet(self, data, in_dpid, in_port):
+        for dpid, datapath in self.datapaths.items():
+            out_ports = [
+                port_no for port_no in self.get_edge_ports(datapath)
+                if dpid != in_dpid or port_no != in_port
+            ]
+            if out_ports:
+                self.send_packet(datapath, out_ports, data)
+
+    def get_edge_ports(self, datapath):
+        link_ports = set(self.link_repository.get_ports(
+            datapath.id)) if self.link_repository is not None else ()
+        return [
+            port_no for port_no in datapath.ports or ()
+            if port_no <= datapath.ofproto.OFPP_MAX and
+            port_no not in link_ports
+        ]
 
-    def build_arp_replay_pkt(self, ethertype, src_mac, dst_mac, src_ip,
-                             dst_ip):
-        pkt = packet.Packet()
-        pkt.add_protocol(
-            ethernet.ethernet(ethertype=ethertype, dst=dst_mac, src=src_mac))
-        pkt.add_protocol(
-            arp.arp(opcode=arp.ARP_REPLY,
-                    src_mac=src_mac,
-                    src_ip=src_ip,
-                    dst_mac=dst_mac,
-                    dst_ip=dst_ip))
-        return pkt
-
-    def reply_arp(self, datapath, in_port, host, arp_pkt, eth_pkt):
-        arp_reply_pkt = self.build_arp_replay_pkt(eth_pkt.ethertype,
-                                                  host.mac_address,
-                                                  arp_pkt.src_mac,
-                                                  host.ip_address,
-                                                  arp_pkt.src_ip)
-
-        self.send_packet(datapath, in_port, arp_reply_pkt)
-
-    def send_packet(self, datapath, out_port, pkt):
+    def send_packet(self, datapath, out_ports, data):
         ofproto = datapath.ofproto
         parser = datapath.ofproto_parser
-        pkt.serialize()
-        data = pkt.data
 
-        actions = [parser.OFPActionOutput(port=out_port)]
+        actions = [parser.OFPActionOutput(port=port) for port in out_ports]
         out = parser.OFPPacketOut(datapath=datapath,
                                   buffer_id=ofproto.OFP_NO_BUFFER,
                                   in_port=ofproto.OFPP_CONTROLLER,
@@ -129,16 +128,3 @@ class MacDetector(app_manager.RyuApp):
                                   data=data)
 
         datapath.send_msg(out)
-
-    def add_flow(self, datapath, priority, match, actions):
-        ofproto = datapath.ofproto
-        parser = datapath.ofproto_parser
-
-        inst = [
-            parser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)
-        ]
-        mod = parser.OFPFlowMod(datapath=datapath,
-                                priority=priority,
-                                match=match,
-                                instructions=inst)
-        datapath.send_msg(mod)
\ No newline at end of file
@@ -22,27 +22,47 @@
 from ryu.base import app_manager
 from ryu.lib import hub
 from ryu.controller.handler import set_ev_cls
-from ryu.topology import event
-from ryu.topology.api import get_link
 from ryu.app.wsgi import ControllerBase, WSGIApplication, route, Response
 
 from datapath_monitor import DatapathMonitor
 from link_monitor import LinkMonitor
+from mac_detector import MacDetector
+from packet_in_service import PacketInService
+from periodic_scheduler import PeriodicScheduler
+from topology_service import TopologyService, EventLinkRemoved
 
-import copy
 import json
+import time
 
-from lib.topology import LinkRepository, Link
-from lib.util import dpid_to_string
+from lib.topology import Link
+from lib.links_view import LinkViewModel, LinkHistoryViewModel, \
+    FlowViewModel, LinksViewCache, KEY_DATAPATH, KEY_DATAPATH_PAIR, KEY_PORT
+from lib.memory import RepositoryMemoryViewModel
+from lib.periodic import PeriodicJobViewModel
+from lib.datapaths_view import DatapathViewModel, CounterResetViewModel
+from lib.hosts_view import HostViewModel, PathHopViewModel, \
+    HostPathViewModel
+from lib.time_units import parse_duration
+from lib.measurement_repositories import LinkBandwidth
+from lib.util import string_to_dpid
 
 network_monitor_instance_name = 'network_monitor'
 
+DPID_PATTERN = r'[0-9a-fA-F]{2}(:?[0-9a-fA-F]{2}){7}'
+IP_PATTERN = r'[0-9]{1,3}(\.[0-9]{1,3}){3}'
+DEFAULT_HISTORY_WINDOW = '60s'
+DEFAULT_TOP_FLOWS = 10
+
 
 class NetworkMonitor(app_manager.RyuApp):
 
     _CONTEXTS = {
         'datapath_monitor': DatapathMonitor,
         'link_monitor': LinkMonitor,
+        'mac_detector': MacDetector,
+        'packet_in_service': PacketInService,
+        'periodic_scheduler': PeriodicScheduler,
+        'topology_service': TopologyService,
         'wsgi': WSGIApplication
     }
 
@@ -53,41 +73,118 @@ class NetworkMonitor(app_manager.RyuApp):
                       {network_monitor_instance_name: self})
         datapath_monitor = kwargs['datapath_monitor']
         link_monitor = kwargs['link_monitor']
-        self.datapath_timing_repository = datapath_monitor.datapath_timing_repository
+        self.periodic_scheduler = kwargs['periodic_scheduler']
+        self.datapath_timing_repository = datapath_monitor.echo_timing_repository
+        self.stats_timing_repository = datapath_monitor.stats_timing_repository
+        self.stats_poller = datapath_monitor.stats_poller
         self.link_latency_repository = link_monitor.link_latency_repository
+        self.probe_loss_repository = link_monitor.probe_loss_repository
         self.bandwidth_port_stats_repository = datapath_monitor.bandwidth_port_stats_repository
         self.plr_port_stats_repository = datapath_monitor.plr_port_stats_repository
-        self.link_repository = LinkRepository()
+        self.flow_stats_repository = datapath_monitor.flow_stats_repository
+        self.port_speed_repository = datapath_monitor.port_speed_repository
+        self.link_repository = kwargs['topology_service'].link_repository
+        self.host_table = kwargs['mac_detector'].host_table
+        self.links_view_cache = LinksViewCache(
+            self.link_repository, [
+                (self.datapath_timing_repository, KEY_DATAPATH),
+                (self.link_latency_repository, KEY_DATAPATH_PAIR),
+                (self.bandwidth_port_stats_repository, KEY_PORT),
+                (self.plr_port_stats_repository, KEY_PORT),
+                (self.probe_loss_repository, KEY_PORT),
+                (self.port_speed_repository, KEY_PORT)
+            ], self.create_link_view)
+        self.repositories = {
+            'echo_timings': self.datapath_timing_repository,
+            'stats_timings': self.stats_timing_repository,
+            'link_latency': self.link_latency_repository,
+            'probe_loss': self.probe_loss_repository,
+            'bandwidth_port_stats': self.bandwidth_port_stats_repository,
+            'plr_port_stats': self.plr_port_stats_repository,
+            'port_speeds': self.port_speed_repository,
+            'flow_stats': self.flow_stats_repository,
+            'links': self.link_repository,
+            'hosts': self.host_table
+        }
+
+    def get_links_snapshot(self):
+        return self.links_view_cache.get_snapshot()
 
     def create_links_view(self):
-        links_view = []
-        for link in self.link_repository.find_bidirectional_links():
-            links_view.append(
-                LinkViewModel(link.src_dpid, link.dst_dpid,
-                              self.compute_delay_ms(link),
-                              self.compute_bandwidth_bits_per_sec(link),
-                              self.compute_plr_percents(link)).__dict__)
-        return links_view
+        return self.get_links_snapshot().views
+
+    def create_link_view(self, link):
+        trackers = self.find_probe_loss_trackers(link)
+        return LinkViewModel(
+            link.src_dpid, link.dst_dpid, self.compute_delay_ms(link),
+            self.compute_bandwidth_bits_per_sec(link),
+            self.compute_plr_percents(link),
+            self.compute_delay_summary_ms(link),
+            self.compute_probe_plr_percents(trackers),
+            sum(tracker.duplicates for tracker in trackers),
+            sum(tracker.reordered for tracker in trackers),
+            self.compute_link_bandwidth(link)).__dict__
+
+    def create_link_history_view(self, link, window_sec):
+        since = time.time() - window_sec
+        return LinkHistoryViewModel(
+            link.src_dpid, link.dst_dpid, window_sec,
+            self.link_latency_repository.get_latency_history(
+                link.src_dpid, link.dst_dpid, since),
+            self.link_latency_repository.get_latency_history(
+                link.dst_dpid, link.src_dpid, since),
+            self.bandwidth_port_stats_repository.get_stats_history(
+                link.src_dpid, link.src_port_no, since),
+            self.bandwidth_port_stats_repository.get_stats_history(
+                link.dst_dpid, link.dst_port_no, since),
+            self.plr_port_stats_repository.get_stats_history(
+                link.src_dpid, link.src_port_no, since),
+            self.plr_port_stats_repository.get_stats_history(
+                link.dst_dpid, link.dst_port_no, since)).__dict__
+
+    def create_top_flows_view(self, link, k):
+        return [
+            FlowViewModel(flow).__dict__
+            for flow in self.flow_stats_repository.get_top_flows(
+                link.src_dpid, link.src_port_no, k)
+        ]
 
     def compute_delay_ms(self, link):
         link_latency_1 = self.link_latency_repository.get_latency_between(
             link.src_dpid, link.dst_dpid).milliseconds()
         link_latency_2 = self.link_latency_repository.get_latency_between(
             link.dst_dpid, link.src_dpid).milliseconds()
+        link_latency = (link_latency_1 + link_latency_2) / 2
+        delay = link_latency - self.compute_response_time_correction_ms(link)
+        return delay
+
+    def compute_delay_summary_ms(self, link):
+        estimator = self.link_latency_repository.get_link_latency_estimator(
+            link.src_dpid, link.dst_dpid)
+        return estimator.summary().shift(
+            -self.compute_response_time_correction_ms(link))
+
+    def compute_response_time_correction_ms(self, link):
         src_datapath_response_time = self.datapath_timing_repository.get_response_time(
             link.src_dpid).milliseconds()
         dst_datapath_response_time = self.datapath_timing_repository.get_response_time(
             link.dst_dpid).milliseconds()
-        link_latency = (link_latency_1 + link_latency_2) / 2
-        delay = link_latency - src_datapath_response_time / 2 - dst_datapath_response_time / 2
-        return delay
+        return src_datapath_response_time / 2 + dst_datapath_response_time / 2
 
     def compute_bandwidth_bits_per_sec(self, link):
         port_bw_1 = self.bandwidth_port_stats_repository.get_stats(
             link.src_dpid, link.src_port_no)
         port_bw_2 = self.bandwidth_port_stats_repository.get_stats(
             link.dst_dpid, link.dst_port_no)
-        return (port_bw_1 + port_bw_2) / 2
+        return (port_bw_1.total() + port_bw_2.total()) / 2
+
+    def compute_link_bandwidth(self, link):
+        return LinkBandwidth(
+            self.bandwidth_port_stats_repository.get_stats(
+                link.src_dpid, link.src_port_no),
+            self.bandwidth_port_stats_repository.get_stats(
+                link.dst_dpid, link.dst_port_no),
+            self.port_speed_repository.get_link_capacity(link))
 
     def compute_plr_percents(self, link):
         port_plr_1 = self.plr_port_stats_repository.get_stats(
@@ -96,21 +193,87 @@ class NetworkMonitor(app_manager.RyuApp):
             link.dst_dpid, link.dst_port_no)
         return (port_plr_1 + port_plr_2) / 2
 
-    @set_ev_cls(event.EventSwitchEnter)
-    def handler_switch_enter(self, ev):
-        for link in copy.copy(get_link(self)):
-            self.link_repository.register_link(link.src.dpid, link.src.port_no,
-                                               link.dst.dpid, link.dst.port_no)
+    def find_probe_loss_trackers(self, link):
+        trackers = [
+            self.probe_loss_repository.get_tracker(link.src_dpid,
+                                                   link.src_port_no),
+            self.probe_loss_repository.get_tracker(link.dst_dpid,
+                                                   link.dst_port_no)
+        ]
+        return [tracker for tracker in trackers if tracker is not None]
+
+    def compute_probe_plr_percents(self, trackers):
+        if not trackers:
+            return 0.0
+        return sum(tracker.plr_percents()
+                   for tracker in trackers) / len(trackers)
+
+    def create_datapaths_view(self):
+        dpids = set(self.datapath_timing_repository.get_dpids()) | set(
+            self.stats_timing_repository.get_dpids())
+        return [
+            DatapathViewModel(
+                dpid, self.datapath_timing_repository.get_timings(dpid),
+                self.stats_timing_repository.get_timings(dpid),
+                self.stats_poller.get_poll(dpid)).__dict__
+            for dpid in sorted(dpids)
+        ]
 
+    def create_counter_resets_view(self):
+        return [
+            CounterResetViewModel(reset).__dict__
+            for reset in self.bandwidth_port_stats_repository.resets
+        ]
 
-class LinkViewModel:
-    def __init__(self, src_dpid, dst_dpid, delay_ms, bandwidth_bit_per_sec,
-                 plr_percents):
-        self.src_dpid = dpid_to_string(src_dpid)
-        self.dst_dpid = dpid_to_string(dst_dpid)
-        self.delay_ms = delay_ms
-        self.bandwidth_bit_per_sec = bandwidth_bit_per_sec
-        self.plr_percents = plr_percents
+    def create_hosts_view(self):
+        return [
+            self.create_host_view(host)
+            for host in self.host_table.get_all()
+        ]
+
+    def create_host_view(self, host):
+        return HostViewModel(
+            host, self.host_table.get_age(host),
+            self.bandwidth_port_stats_repository.get_stats(
+                host.dpid, host.port_no)).__dict__
+
+    def create_host_path_view(self, src_host, dst_host):
+        path = self.link_repository.find_path(src_host.dpid, dst_host.dpid)
+        if path is None:
+            return None
+        hops = [
+            PathHopViewModel(link, self.compute_delay_ms(link),
+                             self.compute_plr_percents(link),
+                             self.compute_link_bandwidth(link))
+            for link in path
+        ]
+        return HostPathViewModel(self.create_host_view(src_host),
+                                 self.create_host_view(dst_host),
+                                 hops).__dict__
+
+    def create_repositories_view(self):
+        return [
+            RepositoryMemoryViewModel(name, repository).__dict__
+            for name, repository in sorted(self.repositories.items())
+        ]
+
+    def create_jobs_view(self):
+        return [
+            PeriodicJobViewModel(job).__dict__
+            for job in self.periodic_scheduler.jobs.values()
+        ]
+
+    @set_ev_cls(EventLinkRemoved)
+    def handler_link_removed(self, ev):
+        link = ev.link
+        for dpid, port_no in ((link.src_dpid, link.src_port_no),
+                              (link.dst_dpid, link.dst_port_no)):
+            if port_no not in self.link_repository.get_ports(dpid):
+                self._purge_port_stats(dpid, port_no)
+
+    def _purge_port_stats(self, dpid, port_no):
+        self.bandwidth_port_stats_repository.remove_port(dpid, port_no)
+        self.plr_port_stats_repository.remove_port(dpid, port_no)
 
 
 class NetworkMonitorController(ControllerBase):
@@ -121,6 +284,98 @@ class NetworkMonitorController(ControllerBase):
 
     @route('networkmonitor', '/networkmonitor/links', methods=['GET'])
     def get_links(self, req, **kwargs):
-        links = self.network_monitor.create_links_view()
-        body = json.dumps(links)
-        return Response(content_type='application/json', body=body)
\ No newline at end of file
+        snapshot = self.network_monitor.get_links_snapshot()
+        if snapshot.etag in req.if_none_match:
+            return Response(status=304, etag=snapshot.etag)
+        return Response(content_type='application/json',
+                        body=snapshot.body,
+                        etag=snapshot.etag)
+
+    @route('networkmonitor',
+           '/networkmonitor/links/{src_dpid}/{dst_dpid}/history',
+           methods=['GET'],
+           requirements={
+               'src_dpid': DPID_PATTERN,
+               'dst_dpid': DPID_PATTERN
+           })
+    def get_link_history(self, req, src_dpid, dst_dpid, **kwargs):
+        try:
+            window_sec = parse_duration(
+                req.GET.get('window', DEFAULT_HISTORY_WINDOW))
+        except ValueError as e:
+            return Response(status=400, body=str(e))
+        link = self.network_monitor.link_repository.find_link(
+            string_to_dpid(src_dpid), string_to_dpid(dst_dpid))
+        if link is None:
+            return Response(status=404)
+        history = self.network_monitor.create_link_history_view(
+            link, window_sec)
+        body = json.dumps(history)
+        return Response(content_type='application/json', body=body)
+
+    @route('networkmonitor',
+           '/networkmonitor/links/{src_dpid}/{dst_dpid}/topflows',
+           methods=['GET'],
+           requirements={
+               'src_dpid': DPID_PATTERN,
+               'dst_dpid': DPID_PATTERN
+           })
+    def get_link_top_flows(self, req, src_dpid, dst_dpid, **kwargs):
+        try:
+            k = int(req.GET.get('k', DEFAULT_TOP_FLOWS))
+        except ValueError:
+            return Response(status=400, body='k must be an integer')
+        if k < 0:
+            return Response(status=400, body='k must not be negative')
+        link = self.network_monitor.link_repository.find_link(
+            string_to_dpid(src_dpid), string_to_dpid(dst_dpid))
+        if link is None:
+            return Response(status=404)
+        body = json.dumps(self.network_monitor.create_top_flows_view(link, k))
+        return Response(content_type='application/json', body=body)
+
+    @route('networkmonitor', '/networkmonitor/datapaths', methods=['GET'])
+    def get_datapaths(self, req, **kwargs):
+        body = json.dumps(self.network_monitor.create_datapaths_view())
+        return Response(content_type='application/json', body=body)
+
+    @route('networkmonitor',
+           '/networkmonitor/counter_resets',
+           methods=['GET'])
+    def get_counter_resets(self, req, **kwargs):
+        body = json.dumps(self.network_monitor.create_counter_resets_view())
+        return Response(content_type='application/json', body=body)
+
+    @route('networkmonitor', '/networkmonitor/hosts', methods=['GET'])
+    def get_hosts(self, req, **kwargs):
+        body = json.dumps(self.network_monitor.create_hosts_view())
+        return Response(content_type='application/json', body=body)
+
+    @route('networkmonitor',
+           '/networkmonitor/hosts/{ip}/path',
+           methods=['GET'],
+           requirements={'ip': IP_PATTERN})
+    def get_host_path(self, req, ip, **kwargs):
+        dst_ip = req.GET.get('to')
+        if dst_ip is None:
+            return Response(status=400, body='to is required')
+        host_table = self.network_monitor.host_table
+        src_host = host_table.get(ip)
+        dst_host = host_table.get(dst_ip)
+        if src_host is None or dst_host is None:
+            return Response(status=404)
+        path = self.network_monitor.create_host_path_view(src_host, dst_host)
+        if path is None:
+            return Response(status=404, body='no path between hosts')
+        body = json.dumps(path)
+        return Response(content_type='application/json', body=body)
+
+    @route('networkmonitor', '/networkmonitor/repositories', methods=['GET'])
+    def get_repositories(self, req, **kwargs):
+        body = json.dumps(self.network_monitor.create_repositories_view())
+        return Response(content_type='application/json', body=body)
+
+    @route('networkmonitor', '/networkmonitor/jobs', methods=['GET'])
+    def get_jobs(self, req, **kwargs):
+        body = json.dumps(self.network_monitor.create_jobs_view())
+        return Response(content_type='application/json', body=body)
@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from ryu import cfg
+
+CONF = cfg.CONF
+OPTS = [
+    cfg.FloatOpt('scheduler-jitter',
+                 default=0.1,
+                 help='random delay of periodic jobs as a share of interval'),
+    cfg.FloatOpt('stats-interval',
+                 default=1.0,
+                 help='interval between port stats requests in seconds'),
+    cfg.BoolOpt('link-port-stats',
+                default=False,
+                help='request port stats of inter-switch link ports only '
+                'and poll all ports at the edge port stats interval'),
+    cfg.FloatOpt('edge-port-stats-interval',
+                 default=10.0,
+                 help='interval between stats requests for all ports in '
+                 'seconds when link port stats are enabled'),
+    cfg.IntOpt('max-port-stats-requests',
+               default=8,
+               help='link ports of a datapath above which link port stats '
+               'fall back to one request for all ports'),
+    cfg.FloatOpt('stats-poll-tick',
+                 default=0.1,
+                 help='resolution of the staggered stats poll schedule'),
+    cfg.IntOpt('stats-max-backoff',
+               default=8,
+               help='max multiple of the stats interval a lagging '
+               'datapath is backed off to'),
+    cfg.FloatOpt('echo-interval',
+                 default=1.0,
+                 help='interval between echo requests in seconds'),
+    cfg.IntOpt('max-in-flight-requests',
+               default=64,
+               help='maximum number of timed requests per datapath'),
+    cfg.FloatOpt('request-timeout',
+                 default=5.0,
+                 help='seconds after which a timed request is dropped'),
+    cfg.StrOpt('table-miss',
+               default='drop',
+               choices=['drop', 'controller', 'normal'],
+               help='action of the table-miss flow; test packets and ARP '
+               'reach the controller through their own flows'),
+    cfg.FloatOpt('probe-tick',
+                 default=0.01,
+                 help='interval between checks for due test packets'),
+    cfg.BoolOpt('flow-stats',
+                default=False,
+                help='collect flow stats for the top flows of every link'),
+    cfg.FloatOpt('flow-stats-interval',
+                 default=10.0,
+                 help='interval between flow stats requests in seconds'),
+    cfg.IntOpt('top-flows-capacity',
+               default=64,
+               help='number of heaviest flows tracked per port'),
+    cfg.IntOpt('host-table-capacity',
+               default=65536,
+               help='maximum number of hosts learned from ARP'),
+    cfg.FloatOpt('host-ttl',
+                 default=300.0,
+                 help='seconds after which a silent host is forgotten'),
+    cfg.FloatOpt('arp-source-rate',
+                 default=10.0,
+                 help='ARP packets per second answered for each sender'),
+    cfg.FloatOpt('arp-coalesce-window',
+                 default=0.5,
+                 help='seconds in which repeated ARP requests are dropped'),
+    cfg.FloatOpt('arp-flood-interval',
+                 default=1.0,
+                 help='shortest interval between floods of ARP requests '
+                 'for the same unknown address'),
+    cfg.FloatOpt('arp-max-floods',
+                 default=20.0,
+                 help='maximum number of ARP request floods per second'),
+    cfg.IntOpt('history-depth',
+               default=3600,
+               help='number of samples kept per link and per port history'),
+    cfg.FloatOpt('delay-ewma-alpha',
+                 default=0.125,
+                 help='smoothing factor of the link delay EWMA'),
+    cfg.FloatOpt('probe-interval',
+                 default=5.0,
+                 help='interval between test packets of a link in seconds'),
+    cfg.FloatOpt('probe-min-interval',
+                 default=1.0,
+                 help='shortest probe interval of an unstable link'),
+    cfg.FloatOpt('probe-rate-limit',
+                 default=1000.0,
+                 help='maximum number of test packets sent per second'),
+    cfg.FloatOpt('probe-instability-threshold',
+                 default=0.5,
+                 help='delay jitter to EWMA ratio of an unstable link'),
+    cfg.IntOpt('probe-loss-window',
+               default=1024,
+               help='number of test packets tracked per link for loss rate'),
+    cfg.FloatOpt('probe-timeout',
+                 default=2.0,
+                 help='seconds after which a test packet is counted lost'),
+]
+
+try:
+    CONF.register_cli_opts(OPTS)
+except cfg.ArgsAlreadyParsedError:
+    # loaded by an app instead of --user-flags, config file only
+    CONF.register_opts(OPTS)
@@ -0,0 +1,54 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from ryu.base import app_manager
+from ryu.lib import hub
+
+import options
+from lib.periodic import PeriodicJob
+
+
+class PeriodicScheduler(app_manager.RyuApp):
+    def __init__(self, *args, **kwargs):
+        super(PeriodicScheduler, self).__init__(*args, **kwargs)
+        self.jobs = {}
+
+    def add_job(self, name, interval, func):
+        if name in self.jobs:
+            raise ValueError('job ' + name + ' is already scheduled')
+        job = PeriodicJob(name, interval, func, self.CONF.scheduler_jitter)
+        self.jobs[name] = job
+        self.threads.append(hub.spawn(self._run_job, job))
+        return job
+
+    def _run_job(self, job):
+        job.start()
+        while True:
+            hub.sleep(job.get_delay())
+            overruns = job.overruns
+            try:
+                job.run()
+            except Exception:
+                self.logger.exception('periodic job %s failed', job.name)
+            if job.overruns != overruns:
+                self.logger.warning(
+                    'periodic job %s took %.3f s, interval is %.3f s',
+                    job.name, job.last_duration, job.interval)
@@ -0,0 +1,71 @@
+#
+# Copyright (c) 2020 by Ilya Tsyganov, Ryazan State Radio Engineering University.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from ryu.base import app_manager
+from ryu.controller import event
+from ryu.controller.handler import set_ev_cls
+from ryu.topology import event as topology_event
+
+from lib.topology import LinkRepository
+
+
+class EventLinkAdded(event.EventBase):
+    def __init__(self, link):
+        super(EventLinkAdded, self).__init__()
+        self.link = link
+
+
+class EventLinkRemoved(event.EventBase):
+    def __init__(self, link):
+        super(EventLinkRemoved, self).__init__()
+        self.link = link
+
+
+class TopologyService(app_manager.RyuApp):
+    _EVENTS = [EventLinkAdded, EventLinkRemoved]
+
+    def __init__(self, *args, **kwargs):
+        super(TopologyService, self).__init__(*args, **kwargs)
+        self.link_repository = LinkRepository()
+
+    @set_ev_cls(topology_event.EventLinkAdd)
+    def _link_add_handler(self, ev):
+        src, dst = ev.link.src, ev.link.dst
+        link = self.link_repository.register_link(src.dpid, src.port_no,
+                                                  dst.dpid, dst.port_no)
+        if link is not None:
+            self.logger.debug('link added: %s', link)
+            self.send_event_to_observers(EventLinkAdded(link))
+
+    @set_ev_cls(topology_event.EventLinkDelete)
+    def _link_delete_handler(self, ev):
+        src, dst = ev.link.src, ev.link.dst
+        link = self.link_repository.unregister_link(src.dpid, src.port_no,
+                                                    dst.dpid, dst.port_no)
+        if link is not None:
+            self.logger.debug('link removed: %s', link)
+            self.send_event_to_observers(EventLinkRemoved(link))
+
+    @set_ev_cls(topology_event.EventSwitchLeave)
+    def _switch_leave_handler(self, ev):
+        for link in self.link_repository.remove_datapath(ev.switch.dp.id):
+            self.logger.debug('link removed: %s', link)
+            self.send_event_to_observers(EventLinkRemoved(link))